@@ -0,0 +1 @@
+"""Benchmarks for pysequitur; see benchmarks/suite.py."""
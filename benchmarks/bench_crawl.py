@@ -0,0 +1,166 @@
+"""Compare the scandir-based crawl with the previous pathlib-based crawl.
+
+Builds a synthetic show tree (shots / layers / frames) of empty files in a
+temporary directory, then crawls it with crawl.recursive_scan and with a copy
+of the previous implementation, which classified each entry with
+Path.is_dir()/is_file() and recursed one frame per level. Also crawls with
+recursive_scan(workers=N); point --root at a network mount to see the effect
+of overlapping round trips, and with processes=True, which spreads sequence
+parsing over N cores. Finally crawls twice through a CrawlCache to
+show a cold and a warm incremental rescan. Reports wall time and stat calls
+for each.
+
+    python benchmarks/bench_crawl.py --files 1000000 --workers 16
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from pysequitur import crawl
+from pysequitur.crawl import DEFAULT_ALLOWED_EXTENSIONS
+from pysequitur.file_sequence import SequenceParser
+from pysequitur.file_types import MOVIE_FILE_TYPES
+
+LAYERS = ("beauty", "diffuse", "specular", "depth", "matte")
+
+
+class StatCounter:
+    """Count os.stat/os.lstat calls made while active."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._stat = os.stat
+        self._lstat = os.lstat
+
+    def __enter__(self) -> StatCounter:
+        def stat(*args, **kwargs):
+            self.calls += 1
+            return self._stat(*args, **kwargs)
+
+        def lstat(*args, **kwargs):
+            self.calls += 1
+            return self._lstat(*args, **kwargs)
+
+        os.stat = stat
+        os.lstat = lstat
+        return self
+
+    def __exit__(self, *exc) -> None:
+        os.stat = self._stat
+        os.lstat = self._lstat
+
+
+def build_tree(root: Path, files: int, frames: int) -> int:
+    """Create shots/<shot>/<layer>/<layer>.####.exr until ``files`` exist.
+
+    Returns the number of directories created.
+    """
+    directories = 0
+    created = 0
+    shot = 0
+    while created < files:
+        shot += 1
+        for layer in LAYERS:
+            directory = root / f"sh{shot:04d}" / layer
+            directory.mkdir(parents=True)
+            directories += 1
+            for frame in range(1001, 1001 + min(frames, files - created)):
+                (directory / f"{layer}.{frame:04d}.exr").touch()
+                created += 1
+            if created >= files:
+                break
+    # Backdate directory mtimes: the crawl cache does not trust listings of
+    # directories modified within the last couple of seconds.
+    past = time.time_ns() - 60 * 10**9
+    for directory, _dirs, _files in os.walk(root):
+        os.utime(directory, ns=(past, past))
+    return directories
+
+
+class LegacyNode:
+    """The crawl as it was before os.scandir: kept here for comparison."""
+
+    def __init__(self, path: Path, allowed_extensions=DEFAULT_ALLOWED_EXTENSIONS):
+        self.path = path
+        normalized = {ext.lower().lstrip(".") for ext in allowed_extensions}
+        movie_exts = normalized.intersection(MOVIE_FILE_TYPES)
+        sequence_exts = normalized.difference(MOVIE_FILE_TYPES)
+        self.dirs: list[Path] = []
+        self.movies: set[Path] = set()
+        candidates: list[str] = []
+        for item in path.iterdir():
+            if item.is_dir():
+                self.dirs.append(item)
+            elif item.is_file():
+                ext = item.suffix.lower().lstrip(".")
+                if ext in movie_exts:
+                    self.movies.add(item)
+                elif ext in sequence_exts:
+                    candidates.append(item.name)
+        self.sequences = []
+        if candidates:
+            self.sequences = SequenceParser.from_file_list(
+                candidates, 1, path, sequence_exts
+            ).sequences
+        self.nodes = [LegacyNode(d, allowed_extensions) for d in self.dirs]
+
+
+def count_sequences(node) -> int:
+    total = 0
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        total += len(current.sequences)
+        stack.extend(current.nodes)
+    return total
+
+
+def timed(label: str, crawl_fn, root: Path) -> None:
+    with StatCounter() as counter:
+        start = time.perf_counter()
+        node = crawl_fn(root)
+        elapsed = time.perf_counter() - start
+    print(
+        f"  {label:13s} {elapsed:8.3f}s  {counter.calls:9d} stat calls  "
+        f"{count_sequences(node)} sequences"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=100_000)
+    parser.add_argument("--frames", type=int, default=250, help="frames per layer")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--root", type=Path, help="where to build the tree")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.root) as tmp:
+        root = Path(tmp) / "show"
+        directories = build_tree(root, args.files, args.frames)
+        print(f"{args.files} files in {directories} directories")
+        timed("pathlib", LegacyNode, root)
+        timed("scandir", crawl.recursive_scan, root)
+        timed(
+            f"{args.workers} workers",
+            lambda path: crawl.recursive_scan(path, workers=args.workers),
+            root,
+        )
+        timed(
+            f"{args.workers} processes",
+            lambda path: crawl.recursive_scan(
+                path, workers=args.workers, processes=True
+            ),
+            root,
+        )
+        with crawl.CrawlCache(Path(tmp) / "crawl.db") as cache:
+            for label in ("cache cold", "cache warm"):
+                timed(label, lambda path: crawl.recursive_scan(path, cache=cache), root)
+
+
+if __name__ == "__main__":
+    main()
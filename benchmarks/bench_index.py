@@ -0,0 +1,90 @@
+"""Time CrawlIndex queries against a large synthetic show.
+
+Builds Results for a show of shots / layers / frames in memory (nothing is
+written to disk except the index), stores them in a CrawlIndex, then times
+a query of each kind. Every tenth layer has a missing frame so Problems
+queries have something to find.
+
+    python benchmarks/bench_index.py --files 10000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from itertools import islice
+from pathlib import Path
+
+from pysequitur.crawl import Results
+from pysequitur.file_sequence import FileSequence, Item, Problems
+from pysequitur.index import CrawlIndex
+
+LAYERS = ("beauty", "diffuse", "specular", "depth", "matte")
+
+
+def synthetic_results(root: Path, files: int, frames: int):
+    """Yield Results for sh####/<layer> directories until ``files`` exist."""
+    created = 0
+    shot = 0
+    while created < files:
+        shot += 1
+        for n, layer in enumerate(LAYERS):
+            directory = root / f"sh{shot:04d}" / layer
+            count = min(frames, files - created)
+            numbers = range(1001, 1001 + count)
+            if (shot * len(LAYERS) + n) % 10 == 0 and count > 2:
+                numbers = [f for f in numbers if f != 1002]
+            items = tuple(
+                Item(layer, f"{f:04d}", "exr", ".", None, directory) for f in numbers
+            )
+            created += count
+            yield Results(directory, [FileSequence(items)], [], [], 2)
+            if created >= files:
+                return
+
+
+def timed(label: str, query) -> None:
+    start = time.perf_counter()
+    result = query()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:32s} {elapsed * 1e3:9.2f}ms  {result}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--frames", type=int, default=100, help="frames per layer")
+    args = parser.parse_args()
+
+    root = Path("/shows/bench")
+    with tempfile.TemporaryDirectory() as tmp:
+        with CrawlIndex(Path(tmp) / "index.db") as idx:
+            start = time.perf_counter()
+            directories = idx.add(synthetic_results(root, args.files, args.frames))
+            print(
+                f"indexed {args.files} files in {directories} directories "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+            shot = root / "sh0040"
+            timed("count(prefix='matte')", lambda: idx.count(prefix="matte"))
+            timed(
+                "count(problems=MISSING_FRAMES)",
+                lambda: idx.count(problems=Problems.MISSING_FRAMES),
+            )
+            timed(
+                "sequences(under=sh0040)",
+                lambda: len(list(idx.sequences(under=shot))),
+            )
+            timed(
+                "first 10 of prefix='depth'",
+                lambda: len(list(islice(idx.sequences(prefix="depth"), 10))),
+            )
+            timed(
+                "count(frames=(1099, 1200))",
+                lambda: idx.count(frames=(1099, 1200), prefix="beauty"),
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare pre-flight conflict scanning with renameat2(RENAME_NOREPLACE).
+
+Creates a sequence of empty files in a temporary directory, renames it with
+the default execute() and with execute(noreplace=True), and reports wall time
+and the number of stat calls each made.
+
+    python benchmarks/bench_noreplace.py --frames 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from pysequitur import Components, SequenceFactory
+from pysequitur.file_sequence import _renameat2
+
+
+class StatCounter:
+    """Count os.stat/os.lstat calls made while active."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self._stat = os.stat
+        self._lstat = os.lstat
+
+    def __enter__(self) -> StatCounter:
+        def stat(*args, **kwargs):
+            self.calls += 1
+            return self._stat(*args, **kwargs)
+
+        def lstat(*args, **kwargs):
+            self.calls += 1
+            return self._lstat(*args, **kwargs)
+
+        os.stat = stat
+        os.lstat = lstat
+        return self
+
+    def __exit__(self, *exc) -> None:
+        os.stat = self._stat
+        os.lstat = self._lstat
+
+
+def run(frames: int, noreplace: bool) -> tuple[float, int]:
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for i in range(frames):
+            (directory / f"plate.{i:06d}.exr").touch()
+        sequence = SequenceFactory.from_directory(directory)[0]
+        _new, plan = sequence.rename(Components(prefix="shot"))
+
+        with StatCounter() as counter:
+            start = time.perf_counter()
+            result = plan.execute(noreplace=noreplace)
+            elapsed = time.perf_counter() - start
+        assert result.success, result.failed[:3]
+        return elapsed, counter.calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=10000)
+    args = parser.parse_args()
+
+    backend = "renameat2" if _renameat2() is not None else "portable fallback"
+    print(f"{args.frames} frames, noreplace backend: {backend}")
+    for label, noreplace in (("pre-flight scan", False), ("noreplace", True)):
+        elapsed, stats = run(args.frames, noreplace)
+        print(f"  {label:16s} {elapsed:8.3f}s  {stats:8d} stat calls")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Compare ShotExtractor with the previous per-call regex shot extraction.
+
+Generates a synthetic list of frame paths (shows / sequences / shots /
+layers / versions / frames), then extracts shot numbers with a copy of the
+previous implementation, which ran re.search / re.findall with freshly
+looked-up patterns over every path, and with ShotExtractor: extract_many,
+single-path and project-wide, and extract_mixed. Every other show uses a
+deeper layout, so the mixed-path grouping has more than one structure to
+find. Checks that both give identical results and reports wall time and
+segment cache statistics.
+
+    python benchmarks/bench_shot_extractor.py --paths 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+
+from pysequitur.shot_extractor import ShotExtractor
+
+LAYERS = ("beauty", "diffuse", "specular", "depth", "matte")
+
+
+def synthetic_paths(count: int, frames: int) -> list[str]:
+    paths: list[str] = []
+    shot = 0
+    while len(paths) < count:
+        shot += 1
+        seq = shot // 20 + 1
+        for layer in LAYERS:
+            directory = (
+                f"/shows/show{shot % 3}/sq{seq:03d}/sh{shot:04d}/"
+                f"render/{layer}/v{shot % 7 + 1:03d}"
+            )
+            if shot % 2:
+                directory = directory.replace("/render/", "/render/2k/")
+            for frame in range(1001, 1001 + frames):
+                paths.append(f"{directory}/{layer}_v{shot % 7 + 1:03d}.{frame}.exr")
+                if len(paths) == count:
+                    return paths
+    return paths
+
+
+def legacy_single(file_path: str) -> tuple[str, str]:
+    file_path = file_path.replace("\\", "/")
+    patterns = [
+        r"(?:^|/)(?:shot|sq|sequence)[-_]?(\d+)",
+        r"(?:^|/)s(\d+)",
+        r"(?:^|/)(\d+)(?:_[^v]|/)",
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, file_path, re.IGNORECASE)
+        if match:
+            return match.group(1).zfill(3), file_path
+    numbers = [
+        m.group()
+        for m in re.finditer(r"\d+", file_path)
+        if not (m.start() > 0 and file_path[m.start() - 1].lower() == "v")
+    ]
+    if numbers:
+        return numbers[0].zfill(3), file_path
+    return "000", file_path
+
+
+def legacy_project(file_paths: list[str]) -> list[tuple[str, str]]:
+    path_parts = [path.replace("\\", "/").split("/") for path in file_paths]
+    min_length = min(len(parts) for parts in path_parts)
+    number_positions = []
+    for i in range(min_length):
+        count = sum(1 for parts in path_parts if re.search(r"\d+", parts[i]))
+        if count:
+            number_positions.append((i, count))
+    number_positions.sort(key=lambda x: x[1], reverse=True)
+
+    results = []
+    for path in file_paths:
+        parts = path.replace("\\", "/").split("/")
+        shot_num = None
+        for pos, _ in number_positions:
+            if pos < len(parts):
+                numbers = re.findall(r"(?<!v)\d+", parts[pos])
+                if numbers:
+                    shot_num = numbers[0]
+                    break
+        if not shot_num:
+            shot_num, _ = legacy_single(path)
+        results.append((shot_num.zfill(3), path))
+    return results
+
+
+def legacy_mixed(file_paths: list[str]) -> list[tuple[str, str]]:
+    def get_path_signature(path: str) -> str:
+        parts = path.replace("\\", "/").split("/")
+        return "_".join(str(bool(re.search(r"\d+", part))) for part in parts)
+
+    path_groups: dict[str, list[str]] = {}
+    for path in file_paths:
+        path_groups.setdefault(get_path_signature(path), []).append(path)
+    results = []
+    for group in path_groups.values():
+        if len(group) > 1:
+            results.extend(legacy_project(group))
+        else:
+            results.extend([legacy_single(path) for path in group])
+    results.sort(key=lambda x: (x[0], x[1]))
+    return results
+
+
+def timed(label: str, function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    print(f"  {label:36s} {time.perf_counter() - start:8.2f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--paths", type=int, default=1_000_000)
+    parser.add_argument("--frames", type=int, default=100, help="frames per layer")
+    args = parser.parse_args()
+
+    paths = synthetic_paths(args.paths, args.frames)
+    print(f"{len(paths)} paths")
+
+    before = timed("previous, single path", lambda: [legacy_single(p) for p in paths])
+    extractor = ShotExtractor()
+    after = timed("ShotExtractor.extract_many", extractor.extract_many, paths)
+    assert after == before, "single-path results differ"
+    print(f"  segment cache: {extractor.cache_info()}")
+
+    before = timed("previous, project paths", legacy_project, paths)
+    extractor = ShotExtractor()
+    after = timed(
+        "ShotExtractor.extract_many(project)",
+        lambda: extractor.extract_many(paths, project=True),
+    )
+    assert after == before, "project results differ"
+
+    before = timed("previous, mixed paths", legacy_mixed, paths)
+    extractor = ShotExtractor()
+    after = timed("ShotExtractor.extract_mixed", extractor.extract_mixed, paths)
+    assert after == before, "mixed results differ"
+    print("results identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Synthetic show trees for benchmarks.
+
+A ShowSpec describes a show: shots, a directory per layer in each shot,
+sequences per directory, frames per sequence, and how untidy it is (missing
+frames, frames with the wrong padding, rogue files and movies). listing()
+produces it in memory as file names per directory; write() creates it on
+disk as empty files. Both are deterministic for a given spec.
+
+    spec = ShowSpec(shots=100, frames=240, gap_density=0.01)
+    for directory, names in listing(spec):
+        ...
+    write(spec, Path("/tmp/show"))
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+LAYERS = ("beauty", "diffuse", "specular", "depth", "matte")
+
+
+@dataclass(frozen=True)
+class ShowSpec:
+    """The shape of a synthetic show tree.
+
+    Directories are ``sh####/<layer>``, each holding
+    ``sequences_per_directory`` sequences named ``<layer>_v###.####.<ext>``.
+    """
+
+    shots: int = 50
+    layers: tuple[str, ...] = LAYERS
+    sequences_per_directory: int = 2
+    frames: int = 100
+    first_frame: int = 1001
+    padding: int = 4
+    # Fraction of each sequence's frames left out
+    gap_density: float = 0.0
+    # Fraction of sequences with one frame written at padding + 1
+    padding_anomalies: float = 0.0
+    rogues_per_directory: int = 0
+    movies_per_directory: int = 0
+    extension: str = "exr"
+    seed: int = 0
+
+    @property
+    def directories(self) -> int:
+        return self.shots * len(self.layers)
+
+
+def _letters(i: int) -> str:
+    """A name suffix without digits, so it is never a frame number."""
+    letters = ""
+    while True:
+        i, r = divmod(i, 26)
+        letters = chr(ord("a") + r) + letters
+        if not i:
+            return letters
+        i -= 1
+
+
+def listing(spec: ShowSpec) -> Iterator[tuple[str, list[str]]]:
+    """Yield (directory relative to the show root, file names) per directory."""
+    rng = random.Random(spec.seed)
+    for shot in range(1, spec.shots + 1):
+        for layer in spec.layers:
+            names = []
+            for version in range(1, spec.sequences_per_directory + 1):
+                prefix = f"{layer}_v{version:03d}"
+                frames = range(spec.first_frame, spec.first_frame + spec.frames)
+                kept = [f for f in frames if rng.random() >= spec.gap_density]
+                anomaly = None
+                if kept and rng.random() < spec.padding_anomalies:
+                    anomaly = rng.choice(kept)
+                for frame in kept:
+                    padding = spec.padding + (frame == anomaly)
+                    names.append(f"{prefix}.{frame:0{padding}d}.{spec.extension}")
+            for i in range(spec.rogues_per_directory):
+                names.append(f"{layer}_reference_{_letters(i)}.{spec.extension}")
+            for i in range(spec.movies_per_directory):
+                names.append(f"{layer}_review_{_letters(i)}.mov")
+            yield f"sh{shot:04d}/{layer}", names
+
+
+def write(spec: ShowSpec, root: Path) -> int:
+    """Create the show under root as empty files; returns the file count.
+
+    Directory mtimes are backdated, since a CrawlCache does not trust the
+    listing of a directory modified in the last couple of seconds.
+    """
+    count = 0
+    for directory, names in listing(spec):
+        path = root / directory
+        path.mkdir(parents=True, exist_ok=True)
+        for name in names:
+            (path / name).touch()
+        count += len(names)
+    past = time.time_ns() - 60 * 10**9
+    for directory, _dirs, _files in os.walk(root):
+        os.utime(directory, ns=(past, past))
+    return count
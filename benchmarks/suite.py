@@ -0,0 +1,258 @@
+"""Benchmark the whole pipeline on a synthetic show and check for regressions.
+
+Generates a show with benchmarks.generator, in memory and as empty files in
+a temporary directory, then times each stage: parsing file names, grouping
+them into sequences, crawling the tree, checking sequences for Problems,
+generating rename plans, analysing conflicts and executing plans (every
+sequence is renamed and renamed back, so the tree is unchanged). Each case
+runs --repeat times and keeps the fastest.
+
+Results are printed and, with --output, written as JSON. With --baseline,
+the time per item of each case is compared with a stored run and the exit
+status is 1 if any case is more than --threshold slower.
+
+    python -m benchmarks.suite --shots 200 --gaps 0.01 --output run.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+
+Baselines are machine specific; save one on the machine that compares.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, fields
+from pathlib import Path
+
+from benchmarks.generator import ShowSpec, listing, write
+from pysequitur import crawl
+from pysequitur.file_sequence import (
+    Components,
+    FileSequence,
+    ItemParser,
+    OperationPlan,
+    Problems,
+    SequenceParser,
+)
+
+SCHEMA = 1
+DEFAULT_THRESHOLD = 0.2
+
+
+class Context:
+    """The show under test and what earlier stages made of it."""
+
+    def __init__(self, spec: ShowSpec, root: Path):
+        self.spec = spec
+        self.root = root
+        self.listings = [(root / d, names) for d, names in listing(spec)]
+        self.files = sum(len(names) for _, names in self.listings)
+        self.sequences: list[FileSequence] = []
+        for directory, names in self.listings:
+            parsed = SequenceParser.from_file_list(names, 2, directory)
+            self.sequences.extend(parsed.sequences)
+        self.renames = [_renamed(seq) for seq in self.sequences]
+        self.plans = [result.plan for result in self.renames]
+        self.operations = sum(len(plan.operations) for plan in self.plans)
+
+
+def _renamed(sequence: FileSequence, suffix: str = "_bench"):
+    return sequence.rename(Components(prefix=sequence.prefix + suffix))
+
+
+def parse(ctx: Context) -> int:
+    for directory, names in ctx.listings:
+        for name in names:
+            ItemParser.item_from_filename(name, directory)
+    return ctx.files
+
+
+def group(ctx: Context) -> int:
+    for directory, names in ctx.listings:
+        SequenceParser.from_file_list(names, 2, directory)
+    return ctx.files
+
+
+def crawl_tree(ctx: Context) -> int:
+    return sum(1 for _ in crawl.iter_scan(ctx.root))
+
+
+def problems(ctx: Context) -> int:
+    for sequence in ctx.sequences:
+        Problems.check_sequence(sequence)
+    return len(ctx.sequences)
+
+
+def plan(ctx: Context) -> int:
+    for sequence in ctx.sequences:
+        _renamed(sequence)
+    return len(ctx.sequences)
+
+
+def conflicts(ctx: Context) -> int:
+    found = 0
+    for p in ctx.plans:
+        found += len(p.conflicts)
+    assert found == 0, "renamed sequences should not conflict"
+    return ctx.operations
+
+
+def execute(ctx: Context) -> int:
+    for p in ctx.plans:
+        p.execute()
+    back: list[OperationPlan] = [
+        result.sequence.rename(Components(prefix=original.prefix)).plan
+        for result, original in zip(ctx.renames, ctx.sequences, strict=True)
+    ]
+    for p in back:
+        p.execute()
+    return 2 * ctx.operations
+
+
+CASES: dict[str, Callable[[Context], int]] = {
+    "parse": parse,
+    "group": group,
+    "crawl": crawl_tree,
+    "problems": problems,
+    "plan": plan,
+    "conflicts": conflicts,
+    "execute": execute,
+}
+
+
+def run(spec: ShowSpec, cases: list[str], repeat: int) -> dict:
+    """Time the named cases; returns the results document."""
+    with tempfile.TemporaryDirectory(prefix="pysequitur-bench-") as tmp:
+        root = Path(tmp) / "show"
+        write(spec, root)
+        ctx = Context(spec, root)
+        timings = {}
+        for name in cases:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                items = CASES[name](ctx)
+                best = min(best, time.perf_counter() - start)
+            timings[name] = {
+                "seconds": best,
+                "items": items,
+                "us_per_item": best / items * 1e6 if items else 0.0,
+            }
+            print(
+                f"  {name:10s} {best:8.3f}s {items:9d} items "
+                f"{timings[name]['us_per_item']:9.2f}us/item"
+            )
+    return {
+        "schema": SCHEMA,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "spec": asdict(spec),
+        "files": ctx.files,
+        "sequences": len(ctx.sequences),
+        "repeat": repeat,
+        "cases": timings,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Cases more than ``threshold`` slower per item than the baseline."""
+    # Round trip the spec so its tuples compare equal to the stored lists
+    if baseline.get("spec") != json.loads(json.dumps(results["spec"])):
+        print("  note: baseline was run on a different show; comparing per item")
+    regressions = []
+    for name, timing in results["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if not base or not base["us_per_item"]:
+            print(f"  {name:10s} no baseline")
+            continue
+        ratio = timing["us_per_item"] / base["us_per_item"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"  {name:10s} {base['us_per_item']:9.2f} -> "
+            f"{timing['us_per_item']:9.2f}us/item ({ratio:5.2f}x){flag}"
+        )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    defaults = ShowSpec()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shots", type=int, default=defaults.shots)
+    parser.add_argument(
+        "--sequences",
+        type=int,
+        default=defaults.sequences_per_directory,
+        help="sequences per directory",
+    )
+    parser.add_argument("--frames", type=int, default=defaults.frames)
+    parser.add_argument(
+        "--gaps", type=float, default=0.0, help="fraction of frames missing"
+    )
+    parser.add_argument(
+        "--padding-anomalies",
+        type=float,
+        default=0.0,
+        help="fraction of sequences with a mis-padded frame",
+    )
+    parser.add_argument("--rogues", type=int, default=0, help="per directory")
+    parser.add_argument("--movies", type=int, default=0, help="per directory")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--cases", nargs="+", choices=list(CASES), default=list(CASES)
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with a stored run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="allowed slowdown per item (0.2 = 20%%)",
+    )
+    parser.add_argument(
+        "--save-baseline", type=Path, help="store this run as a baseline"
+    )
+    args = parser.parse_args(argv)
+
+    spec = ShowSpec(
+        shots=args.shots,
+        sequences_per_directory=args.sequences,
+        frames=args.frames,
+        gap_density=args.gaps,
+        padding_anomalies=args.padding_anomalies,
+        rogues_per_directory=args.rogues,
+        movies_per_directory=args.movies,
+        seed=args.seed,
+    )
+    shown = {
+        f.name: getattr(spec, f.name)
+        for f in fields(spec)
+        if getattr(spec, f.name) != getattr(defaults, f.name)
+    }
+    print(f"{spec.directories} directories", *([shown] if shown else []))
+    results = run(spec, args.cases, args.repeat)
+
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            path.write_text(json.dumps(results, indent=2) + "\n")
+    if args.baseline is None:
+        return 0
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,9 +18,10 @@ Classes:
 __version__ = "0.2.0"
 
 # from .crawl import Node, visualize_tree
-from . import crawl
+from . import crawl, index, watcher
 from .file_sequence import (
     Components,
+    DeleteResult,
     ExecutionResult,
     FileSequence,
     Item,
@@ -33,6 +34,7 @@ from .file_sequence import (
     SequenceResult,
 )
 from .file_types import MOVIE_FILE_TYPES
+from .throttle import RatePolicy, ThroughputReport
 
 # from . import integrations  # Add this line
 
@@ -48,11 +50,16 @@ __all__: list[str] = [
     "ItemParser",
     "SequenceParser",
     "crawl",
+    "index",
+    "watcher",
     "SequenceFactory",
     "SequenceBuilder",
     "SequenceResult",
     "ItemResult",
     "OperationPlan",
     "ExecutionResult",
+    "DeleteResult",
+    "RatePolicy",
+    "ThroughputReport",
     "MOVIE_FILE_TYPES",
 ]
@@ -1,8 +1,42 @@
-from dataclasses import dataclass
+import asyncio
+import bisect
+import dataclasses
+import fnmatch
+import functools
+import heapq
+import itertools
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from operator import attrgetter, itemgetter
 from pathlib import Path
+from typing import Any, NamedTuple, TextIO
 
-from .file_sequence import FileSequence, SequenceParser
+from .file_sequence import (
+    DEFAULT_ASYNC_CONCURRENCY,
+    DEFAULT_STAT_WORKERS,
+    FileSequence,
+    Item,
+    SequenceParser,
+)
 from .file_types import MOVIE_FILE_TYPES
+from .shot_extractor import ShotExtractor
 
 DEFAULT_ALLOWED_EXTENSIONS = {
     "jpg",
@@ -16,6 +50,8 @@ DEFAULT_ALLOWED_EXTENSIONS = {
     "tiff",
 }
 
+IGNORE_FILE_NAME = ".sequitur-ignore"
+
 
 @dataclass
 class Results:
@@ -24,83 +60,1762 @@ class Results:
     movs: list[Path]
     rogues: list[Path]
     depth: int
+    error: OSError | None = None
+    dirs: list[Path] = field(default_factory=list)
+    skipped: int = 0
+    aliases: dict[Path, Path] = field(default_factory=dict)
+    # Bytes of each file listed (frames, movies, rogues) by name, when the
+    # crawl gathered sizes; files that could not be statted are left out
+    sizes: dict[str, int] | None = None
+    # Shot numbers of the directory and of each of sequences, when the crawl
+    # was given a ShotRollups
+    shot: str | None = None
+    sequence_shots: list[str] | None = None
+
+    def sequence_bytes(self, sequence: FileSequence) -> int | None:
+        """Total bytes of one of this directory's sequences, if sizes were
+        gathered."""
+        if self.sizes is None:
+            return None
+        sizes = self.sizes
+        return sum(sizes.get(item.filename, 0) for item in sequence.items)
+
+    @property
+    def total_bytes(self) -> int | None:
+        """Bytes of every file listed in this directory, if sizes were
+        gathered."""
+        return sum(self.sizes.values()) if self.sizes is not None else None
+
+
+@dataclass(frozen=True)
+class PruneRules:
+    """Entries a crawl skips, decided before anything below them is listed.
+
+    Glob patterns in ``exclude`` are matched against entry names; a pattern
+    ending in "/" only matches directories. Regular expressions in
+    ``exclude_regex`` are searched for in an entry's full path. A pruned
+    directory is never listed, so its subtree costs nothing.
+
+    If ``ignore_file`` is set, a directory containing a file of that name
+    has the glob patterns in it (one per line, "#" starts a comment) added
+    to the rules for its own entries and everything below it.
+
+    Example:
+        rules = crawl.PruneRules(exclude=(".git/", "tmp/", "*_autosave*"))
+        root = crawl.recursive_scan(Path("/shows/abc"), prune=rules)
+    """
+
+    exclude: tuple[str, ...] = ()
+    exclude_regex: tuple[str, ...] = ()
+    ignore_file: str | None = IGNORE_FILE_NAME
+    _names: re.Pattern | None = field(init=False, repr=False, compare=False)
+    _dir_names: re.Pattern | None = field(init=False, repr=False, compare=False)
+    _paths: re.Pattern | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "exclude", tuple(self.exclude))
+        object.__setattr__(self, "exclude_regex", tuple(self.exclude_regex))
+        names = [fnmatch.translate(p) for p in self.exclude if not p.endswith("/")]
+        dir_names = [fnmatch.translate(p.rstrip("/")) for p in self.exclude]
+        object.__setattr__(self, "_names", _compile_any(names))
+        object.__setattr__(self, "_dir_names", _compile_any(dir_names))
+        object.__setattr__(self, "_paths", _compile_any(self.exclude_regex))
+
+    def excludes(self, path: Path, is_dir: bool = False) -> bool:
+        """Whether path is pruned by these rules."""
+        names = self._dir_names if is_dir else self._names
+        if names is not None and names.match(path.name):
+            return True
+        return self._paths is not None and self._paths.search(str(path)) is not None
+
+    def extend(self, patterns: tuple[str, ...]) -> "PruneRules":
+        """These rules plus more glob patterns."""
+        return dataclasses.replace(self, exclude=self.exclude + patterns)
+
+
+def _compile_any(patterns: list[str] | tuple[str, ...]) -> re.Pattern | None:
+    """One regex matching any of patterns, or None if there are none."""
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+def _read_ignore_file(path: Path) -> tuple[str, ...]:
+    """The glob patterns in an ignore file; none if it can't be read."""
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        return ()
+    stripped = (line.strip() for line in lines)
+    return tuple(line for line in stripped if line and not line.startswith("#"))
+
+
+def _split_extensions(allowed_extensions: set[str]) -> tuple[set[str], set[str]]:
+    """Normalise extensions and split them into (movie, sequence) sets."""
+    normalized_extensions = {ext.lower().lstrip(".") for ext in allowed_extensions}
+    allowed_movie_exts = normalized_extensions.intersection(MOVIE_FILE_TYPES)
+    allowed_sequence_exts = normalized_extensions.difference(MOVIE_FILE_TYPES)
+    return allowed_movie_exts, allowed_sequence_exts
+
+
+_Identity = tuple[int, int]  # (st_dev, st_ino)
+
+
+def _identity(st: os.stat_result) -> _Identity:
+    return st.st_dev, st.st_ino
+
+
+class _Listing(NamedTuple):
+    """The parsed contents of one directory."""
+
+    dirs: list[Path]
+    movies: set[Path]
+    sequences: list[FileSequence]
+    rogues: list[Path]
+    error: OSError | None
+    skipped: int = 0
+    # Patterns of the directory's ignore file, None if it has none
+    ignored: tuple[str, ...] | None = None
+    # (st_dev, st_ino) of each of dirs (None where unknown), if collected
+    dir_ids: list[_Identity | None] | None = None
+    # Subdirectories not to crawl here -> the directory they lead to
+    aliases: dict[Path, Path] | None = None
+    timing: "_Timing | None" = None
+    # Bytes of each listed file by name, if sizes were gathered
+    sizes: dict[str, int] | None = None
+
+
+class _Timing(NamedTuple):
+    """How long a directory took to list and parse, for CrawlStats."""
+
+    list_seconds: float
+    parse_seconds: float
+    entries: int  # entries in the listing, before any filtering
+    cached: bool = False
+
+
+def _list_directory(
+    path: Path,
+    allowed_movie_exts: set[str],
+    allowed_sequence_exts: set[str],
+    prune: PruneRules | None = None,
+    follow_symlinks: bool = True,
+    sizes: bool = False,
+) -> _Listing:
+    """List and parse a single directory.
+
+    Uses os.scandir, whose entries carry the file type from the directory
+    listing itself, so files are classified without a stat call each.
+    Extension sets must already be normalised (see _split_extensions).
+    A listing error is returned rather than raised, along with whatever was
+    listed before it occurred. Entries excluded by ``prune`` (the rules
+    inherited from the parent directories) or by this directory's ignore
+    file are dropped before any sequence parsing and counted in ``skipped``.
+
+    When following symlinks, the identity of every subdirectory is
+    collected (one stat each, none per file) so the crawl can tell when two
+    paths lead to the same directory. Otherwise symlinked subdirectories
+    are not returned in ``dirs`` but in ``aliases``, with their targets.
+
+    With ``sizes``, each file's size comes from DirEntry.stat(), which is
+    made in the same pass and never repeated for an entry.
+    """
+    ignore_file = prune.ignore_file if prune is not None else None
+    found = _Entries(
+        path,
+        allowed_movie_exts,
+        allowed_sequence_exts,
+        ignore_file,
+        follow_symlinks,
+        sizes,
+    )
+    error = None
+
+    started = time.perf_counter()
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                found.add(entry)
+    except OSError as e:
+        error = e
+    listed = time.perf_counter()
+
+    skipped = 0
+    ignored = None
+    if prune is not None:
+        skipped, ignored = found.prune(prune)
+
+    sequences: list[FileSequence] = []
+    rogues: list[Path] = []
+    # Only process sequences if we found candidate files
+    if found.candidates:
+        results: SequenceParser.ParseResult = SequenceParser.from_file_list(
+            found.candidates, 1, path, allowed_sequence_exts
+        )
+        sequences, rogues = results.sequences, results.rogues
+    timing = _Timing(listed - started, time.perf_counter() - listed, found.count)
+    return _Listing(
+        found.dirs,
+        found.movies,
+        sequences,
+        rogues,
+        error,
+        skipped,
+        ignored,
+        found.dir_ids,
+        found.aliases,
+        timing,
+        found.sizes,
+    )
+
+
+def _entry_stat(entry: os.DirEntry) -> os.stat_result | None:
+    """entry.stat(), or None if the entry can't be statted (e.g. it was
+    removed since the listing, or is a dangling symlink)."""
+    try:
+        return entry.stat()
+    except OSError:
+        return None
+
+
+class _Entries:
+    """The entries of one directory listing, classified as they are read."""
+
+    def __init__(
+        self,
+        path: Path,
+        allowed_movie_exts: set[str],
+        allowed_sequence_exts: set[str],
+        ignore_file: str | None,
+        follow_symlinks: bool,
+        sizes: bool,
+    ):
+        self.path = path
+        self.allowed_movie_exts = allowed_movie_exts
+        self.allowed_sequence_exts = allowed_sequence_exts
+        self.ignore_file = ignore_file
+        self.dirs: list[Path] = []
+        self.dir_ids: list[_Identity | None] | None = [] if follow_symlinks else None
+        self.aliases: dict[Path, Path] = {}
+        self.movies: set[Path] = set()
+        self.candidates: list[str] = []
+        self.sizes: dict[str, int] | None = {} if sizes else None
+        self.has_ignore_file = False
+        self.count = 0  # entries in the listing, before any filtering
+
+    def add(self, entry: os.DirEntry) -> None:
+        self.count += 1
+        if entry.is_dir():
+            self._add_dir(entry)
+        elif entry.is_file():
+            self._add_file(entry)
+
+    def _add_dir(self, entry: os.DirEntry) -> None:
+        if self.dir_ids is None:
+            if entry.is_symlink():
+                target = Path(os.path.realpath(entry.path))
+                self.aliases[self.path / entry.name] = target
+                return
+        else:
+            st = _entry_stat(entry)
+            self.dir_ids.append(_identity(st) if st is not None else None)
+        self.dirs.append(self.path / entry.name)
+
+    def _add_file(self, entry: os.DirEntry) -> None:
+        name = entry.name
+        if name == self.ignore_file:
+            self.has_ignore_file = True
+            return
+        if name[0] == ".":
+            return
+        ext = name.rpartition(".")[2].lower() if "." in name else ""
+        if ext in self.allowed_movie_exts:
+            self.movies.add(self.path / name)
+        elif ext in self.allowed_sequence_exts:
+            self.candidates.append(name)
+        else:
+            return
+        if self.sizes is not None:
+            st = _entry_stat(entry)
+            if st is not None:
+                self.sizes[name] = st.st_size
+
+    def prune(self, prune: PruneRules) -> tuple[int, tuple[str, ...] | None]:
+        """Drop the entries prune (extended by this directory's ignore file)
+        excludes. Returns (entries dropped, ignore file patterns or None)."""
+        ignored = None
+        if self.has_ignore_file and self.ignore_file is not None:
+            ignored = _read_ignore_file(self.path / self.ignore_file)
+            prune = prune.extend(ignored)
+        count = len(self.dirs) + len(self.movies) + len(self.candidates)
+        kept = [
+            i for i, d in enumerate(self.dirs) if not prune.excludes(d, is_dir=True)
+        ]
+        self.dirs = [self.dirs[i] for i in kept]
+        if self.dir_ids is not None:
+            self.dir_ids = [self.dir_ids[i] for i in kept]
+        self.movies = {m for m in self.movies if not prune.excludes(m)}
+        self.candidates = [
+            name for name in self.candidates if not prune.excludes(self.path / name)
+        ]
+        skipped = count - len(self.dirs) - len(self.movies) - len(self.candidates)
+        if self.sizes is not None and skipped:
+            kept_names = {m.name for m in self.movies}.union(self.candidates)
+            self.sizes = {n: b for n, b in self.sizes.items() if n in kept_names}
+        return skipped, ignored
+
+
+def _file_sizes(directory: Path, names: Iterable[str]) -> dict[str, int]:
+    """Bytes of each of the named files in directory, for files that were
+    listed without sizes; files that can't be statted are left out."""
+    sizes = {}
+    for name in names:
+        try:
+            sizes[name] = os.stat(os.path.join(directory, name)).st_size
+        except OSError:
+            pass
+    return sizes
+
+
+def _file_names(
+    sequences: list[FileSequence], movies: Iterable[Path], rogues: list[Path]
+) -> Iterator[str]:
+    """The names of every file listed in a directory."""
+    for sequence in sequences:
+        for item in sequence.items:
+            yield item.filename
+    for path in itertools.chain(movies, rogues):
+        yield path.name
+
+
+class _Visited:
+    """The physical directories a crawl has queued, by (st_dev, st_ino).
+
+    claim() is called with each listing, in the order listings are expanded,
+    and moves any subdirectory that leads to a directory queued already
+    (through a symlink, or a cycle of them) from ``dirs`` to ``aliases``,
+    mapped to the path it was first queued at. Does nothing when symlinks
+    are not followed, since the tree can then hold no duplicates.
+
+    On a single thread listings are expanded in tree order, so the first
+    path to a directory in tree order is the one crawled. A parallel crawl
+    expands them as they finish, so which path wins can vary between runs.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        follow_symlinks: bool,
+        seen: dict[_Identity, Path] | None = None,
+    ):
+        self._seen: dict[_Identity, Path] | None = None
+        if seen is not None:
+            self._seen = seen
+        elif follow_symlinks:
+            self._seen = {}
+            try:
+                self._seen[_identity(os.stat(root))] = root
+            except OSError:
+                pass
+
+    def claim(self, listing: _Listing) -> _Listing:
+        if self._seen is None or not listing.dirs:
+            return listing
+        dir_ids = listing.dir_ids
+        if dir_ids is None:
+            dir_ids = []
+            for d in listing.dirs:
+                try:
+                    dir_ids.append(_identity(os.stat(d)))
+                except OSError:
+                    dir_ids.append(None)
+
+        dirs = []
+        aliases = dict(listing.aliases or {})
+        for d, identity in zip(listing.dirs, dir_ids, strict=True):
+            if identity is None:
+                dirs.append(d)
+                continue
+            first = self._seen.setdefault(identity, d)
+            if first is d:
+                dirs.append(d)
+            else:
+                aliases[d] = first
+        return listing._replace(dirs=dirs, aliases=aliases)
+
+
+def _results(directory: Path, depth: int, listing: _Listing) -> Results:
+    return Results(
+        dir=directory,
+        sequences=listing.sequences,
+        movs=list(listing.movies),
+        rogues=listing.rogues,
+        depth=depth,
+        error=listing.error,
+        dirs=listing.dirs,
+        skipped=listing.skipped,
+        aliases=listing.aliases or {},
+        sizes=listing.sizes,
+    )
+
+
+def _report(
+    directory: Path,
+    depth: int,
+    listing: _Listing,
+    stats: "CrawlStats | None",
+    shots: "ShotRollups | None",
+) -> Results:
+    """The Results of a listing, recorded in stats and tagged by shots."""
+    if stats is not None:
+        stats._record(directory, depth, listing)
+    result = _results(directory, depth, listing)
+    if shots is not None:
+        shots._tag(result)
+    return result
+
+
+def _child_rules(prune: PruneRules | None, listing: _Listing) -> PruneRules | None:
+    """The rules for the subdirectories of a listed directory."""
+    if prune is None or not listing.ignored:
+        return prune
+    return prune.extend(listing.ignored)
+
+
+def _pack(listing: _Listing) -> dict:
+    """A listing as plain data: entry names and item fields, relative to
+    its directory. Compact, JSON-serialisable and cheap to pickle; the
+    error is not included."""
+    return {
+        "skipped": listing.skipped,
+        "ignored": listing.ignored,
+        "timing": listing.timing,
+        "sizes": listing.sizes,
+        "dirs": [d.name for d in listing.dirs],
+        "dir_ids": listing.dir_ids,
+        "aliases": {
+            link.name: str(target) for link, target in (listing.aliases or {}).items()
+        },
+        "movies": [m.name for m in listing.movies],
+        "rogues": [r.name for r in listing.rogues],
+        "sequences": [
+            [
+                [i.prefix, i.frame_string, i.extension, i.delimiter, i.suffix]
+                for i in sequence.items
+            ]
+            for sequence in listing.sequences
+        ],
+    }
+
+
+def _unpack(path: Path, data: dict) -> _Listing:
+    """The listing of path from _pack's data (or its JSON round trip)."""
+    ignored = data.get("ignored")
+    dir_ids = data.get("dir_ids")
+    timing = data.get("timing")
+    return _Listing(
+        dirs=[path / name for name in data["dirs"]],
+        movies={path / name for name in data["movies"]},
+        sequences=[
+            FileSequence(
+                tuple(
+                    Item(prefix, frame_string, extension, delimiter, suffix, path)
+                    for prefix, frame_string, extension, delimiter, suffix in items
+                )
+            )
+            for items in data["sequences"]
+        ],
+        rogues=[path / name for name in data["rogues"]],
+        error=None,
+        skipped=data.get("skipped", 0),
+        ignored=tuple(ignored) if ignored is not None else None,
+        dir_ids=(
+            [tuple(i) if i is not None else None for i in dir_ids]
+            if dir_ids is not None
+            else None
+        ),
+        aliases={
+            path / name: Path(target)
+            for name, target in data.get("aliases", {}).items()
+        },
+        timing=_Timing(*timing) if timing is not None else None,
+        sizes=data.get("sizes"),
+    )
+
+
+def _list_directory_packed(
+    path: Path,
+    allowed_movie_exts: set[str],
+    allowed_sequence_exts: set[str],
+    prune: PruneRules | None,
+    follow_symlinks: bool,
+    sizes: bool = False,
+) -> tuple[dict, OSError | None]:
+    """_list_directory for worker processes: returns (_pack data, error)."""
+    listing = _list_directory(
+        path, allowed_movie_exts, allowed_sequence_exts, prune, follow_symlinks, sizes
+    )
+    return _pack(listing), listing.error
+
+
+@dataclass(frozen=True)
+class DirectoryStats:
+    """Where the time went for one directory of a crawl.
+
+    Attributes:
+        path: The directory.
+        depth: Its depth below the crawl root.
+        list_seconds: Time to list it (or to look it up in a CrawlCache).
+        parse_seconds: Time to prune and parse the listing into sequences
+            (or to rebuild it from the cache).
+        entries: Entries in the directory, before any filtering.
+        sequences: Sequences found.
+        rogues: Rogue files found.
+        error: The listing error, if any, as text.
+        cached: Whether the listing came from a CrawlCache.
+    """
+
+    path: Path
+    depth: int
+    list_seconds: float
+    parse_seconds: float
+    entries: int
+    sequences: int
+    rogues: int
+    error: str | None = None
+    cached: bool = False
+
+    @property
+    def seconds(self) -> float:
+        return self.list_seconds + self.parse_seconds
+
+    def to_dict(self) -> dict:
+        return {
+            **dataclasses.asdict(self),
+            "path": str(self.path),
+            "seconds": self.seconds,
+        }
+
+
+class CrawlStats:
+    """Per-directory instrumentation for a crawl.
+
+    Pass one as ``stats`` to iter_scan, recursive_scan or scan_async and it
+    records a DirectoryStats for every directory crawled, from which it
+    reports the slowest directories, latency percentiles and a histogram,
+    as text or as JSON for tracking crawl health over time. The timings
+    are taken inside the crawl workers, so they exclude time queued.
+
+    Example:
+        stats = crawl.CrawlStats()
+        root = crawl.recursive_scan(Path("/shows/abc"), workers=16, stats=stats)
+        print(stats.report(top=5))
+        Path("crawl.json").write_text(stats.to_json())
+    """
+
+    # Upper bounds (seconds) of the histogram buckets; the last is open
+    HISTOGRAM_BOUNDS = (0.001, 0.01, 0.1, 1.0, 10.0)
+    PERCENTILES = (50, 90, 99, 100)
+
+    def __init__(self) -> None:
+        self.directories: list[DirectoryStats] = []
+        self.elapsed = 0.0  # wall time of the crawls recorded
+
+    def _record(self, directory: Path, depth: int, listing: _Listing) -> None:
+        timing = listing.timing or _Timing(0.0, 0.0, 0)
+        self.directories.append(
+            DirectoryStats(
+                path=directory,
+                depth=depth,
+                list_seconds=timing.list_seconds,
+                parse_seconds=timing.parse_seconds,
+                entries=timing.entries,
+                sequences=len(listing.sequences),
+                rogues=len(listing.rogues),
+                error=str(listing.error) if listing.error is not None else None,
+                cached=timing.cached,
+            )
+        )
+
+    @property
+    def errors(self) -> list[DirectoryStats]:
+        return [d for d in self.directories if d.error is not None]
+
+    def slowest(self, n: int = 10, key: str = "seconds") -> list[DirectoryStats]:
+        """The n directories with the largest ``key`` ("seconds",
+        "list_seconds", "parse_seconds" or "entries"), largest first."""
+        return heapq.nlargest(n, self.directories, key=attrgetter(key))
+
+    def percentiles(self, key: str = "seconds") -> dict[int, float]:
+        """Nearest-rank percentiles (see PERCENTILES) of ``key``."""
+        values = sorted(getattr(d, key) for d in self.directories)
+        if not values:
+            return {}
+        return {
+            p: values[max(math.ceil(p / 100 * len(values)) - 1, 0)]
+            for p in self.PERCENTILES
+        }
+
+    def histogram(self, key: str = "seconds") -> dict[str, int]:
+        """Directory counts per bucket of ``key`` seconds, e.g. "1ms-10ms"."""
+        counts = [0] * (len(self.HISTOGRAM_BOUNDS) + 1)
+        for d in self.directories:
+            counts[bisect.bisect_right(self.HISTOGRAM_BOUNDS, getattr(d, key))] += 1
+        labels = [_duration(b) for b in self.HISTOGRAM_BOUNDS]
+        names = [f"<{labels[0]}"]
+        names += [f"{lo}-{hi}" for lo, hi in itertools.pairwise(labels)]
+        names.append(f">={labels[-1]}")
+        return dict(zip(names, counts, strict=True))
+
+    def to_dict(self, top: int = 10, per_directory: bool = True) -> dict:
+        """A JSON-serialisable summary, with every directory by default."""
+        data = {
+            "elapsed": self.elapsed,
+            "directories": len(self.directories),
+            "entries": sum(d.entries for d in self.directories),
+            "cached": sum(d.cached for d in self.directories),
+            "errors": len(self.errors),
+            "percentiles": {
+                key: self.percentiles(key)
+                for key in ("seconds", "list_seconds", "parse_seconds")
+            },
+            "histogram": self.histogram(),
+            "slowest": [d.to_dict() for d in self.slowest(top)],
+        }
+        if per_directory:
+            data["per_directory"] = [d.to_dict() for d in self.directories]
+        return data
+
+    def to_json(self, top: int = 10, per_directory: bool = True, **kwargs) -> str:
+        """to_dict() as JSON; keyword arguments go to json.dumps."""
+        return json.dumps(self.to_dict(top, per_directory), **kwargs)
+
+    def report(self, top: int = 10) -> str:
+        """A human-readable summary with the ``top`` slowest directories."""
+        directories = self.directories
+        lines = [
+            f"{len(directories)} directories, "
+            f"{sum(d.entries for d in directories)} entries in "
+            f"{self.elapsed:.3f}s ({len(self.errors)} errors, "
+            f"{sum(d.cached for d in directories)} cached)"
+        ]
+        for key, label in (("list_seconds", "list"), ("parse_seconds", "parse")):
+            values = "  ".join(
+                f"p{p} {_duration(v)}" for p, v in self.percentiles(key).items()
+            )
+            lines.append(f"  {label:5s} {values}")
+        histogram = self.histogram()
+        widest = max(histogram.values(), default=0) or 1
+        for name, count in histogram.items():
+            bar = "#" * round(40 * count / widest)
+            lines.append(f"  {name:>12s} {count:8d} {bar}".rstrip())
+        if directories:
+            lines.append(f"slowest {min(top, len(directories))}:")
+        for d in self.slowest(top):
+            note = f"  {d.error}" if d.error else ""
+            lines.append(
+                f"  {_duration(d.seconds):>8s}  list {_duration(d.list_seconds):>8s}"
+                f"  parse {_duration(d.parse_seconds):>8s}  {d.entries:7d} entries"
+                f"  {d.path}{note}"
+            )
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.report()
+
+
+def _duration(seconds: float) -> str:
+    """Seconds as a short human-readable duration, e.g. "1.5ms"."""
+    if seconds >= 1:
+        return f"{seconds:.3g}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3g}ms"
+    return f"{seconds * 1e6:.3g}us"
+
+
+@dataclass
+class ShotRollup:
+    """Totals for one shot number across a crawl."""
+
+    shot: str
+    directories: int = 0
+    sequences: int = 0
+    frames: int = 0  # files in the shot's sequences
+    bytes: int | None = None  # None unless the crawl gathered sizes
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+
+class ShotRollups:
+    """Shot numbers for a crawl, assigned as it runs, and per-shot totals.
+
+    Pass one as ``shots`` to iter_scan, recursive_scan, partial_scan or
+    scan_async and every Results is tagged with the shot number of its
+    directory (``Results.shot``) and of each of its sequences
+    (``Results.sequence_shots``), as extract_shot_from_single_path finds
+    them, and counted into a ShotRollup for its shot. Nothing is held per
+    directory beyond the extractor's caches: a directory whose path decides
+    the shot (e.g. .../shot_020/...) is classified once, and the files
+    below it cost a cache lookup.
+
+    Example:
+        shots = crawl.ShotRollups()
+        for result in crawl.iter_scan(Path("/shows/abc"), sizes=True, shots=shots):
+            ...
+        for rollup in shots:
+            print(rollup.shot, rollup.sequences, rollup.frames, rollup.bytes)
+    """
+
+    def __init__(self, extractor: ShotExtractor | None = None) -> None:
+        self.extractor = extractor if extractor is not None else ShotExtractor()
+        self.rollups: dict[str, ShotRollup] = {}
+
+    def _tag(self, result: Results) -> None:
+        directory = str(result.dir).replace("\\", "/").rstrip("/")
+        shot_in = self.extractor.shot_in
+        result.shot = shot_in(directory)
+        result.sequence_shots = [
+            shot_in(directory, seq.sequence_string) for seq in result.sequences
+        ]
+        self._rollup(result.shot).directories += 1
+        for seq, shot in zip(result.sequences, result.sequence_shots, strict=True):
+            rollup = self._rollup(shot)
+            rollup.sequences += 1
+            rollup.frames += len(seq.items)
+            size = result.sequence_bytes(seq)
+            if size is not None:
+                rollup.bytes = (rollup.bytes or 0) + size
+
+    def _rollup(self, shot: str) -> ShotRollup:
+        rollup = self.rollups.get(shot)
+        if rollup is None:
+            rollup = self.rollups[shot] = ShotRollup(shot)
+        return rollup
+
+    def __getitem__(self, shot: str) -> ShotRollup:
+        return self.rollups[shot]
+
+    def __iter__(self) -> Iterator[ShotRollup]:
+        """The rollups in shot number order."""
+        return iter(sorted(self.rollups.values(), key=attrgetter("shot")))
+
+    def __len__(self) -> int:
+        return len(self.rollups)
+
+    def to_dict(self) -> dict:
+        return {rollup.shot: rollup.to_dict() for rollup in self}
+
+
+class CrawlCache:
+    """A persistent cache of parsed directory listings, stored in SQLite.
+
+    Each directory's parsed sequences, movies, rogues and subdirectories are
+    stored with its device, inode and modification time. Adding, removing or
+    renaming an entry changes a directory's mtime, so on a rescan only
+    directories whose (device, inode, mtime) changed are listed and parsed
+    again; the rest cost a single stat. Listings parsed with different
+    allowed extensions or prune rules are never reused, and a listing is
+    also re-listed when the directory's ignore file has been edited.
+    File sizes are not stored, since rewriting a file in place does not
+    change its directory's mtime: a crawl with ``sizes`` stats the files of
+    a cached directory again, but still skips listing and parsing it.
+
+    Filesystem timestamps are coarse, so a directory modified within
+    ``mtime_slack`` seconds of being listed could change again without its
+    mtime moving. Such listings are stored but not trusted, and are
+    re-listed on the next scan.
+
+    The cache is safe to share between crawl workers. Writes are committed
+    by close() (or on leaving a ``with`` block).
+
+    Example:
+        with crawl.CrawlCache(Path("~/.cache/show.db").expanduser()) as cache:
+            root = crawl.recursive_scan(Path("/shows/abc"), cache=cache)
+    """
+
+    def __init__(self, path: Path | str, mtime_slack: float = 2.0):
+        self.path = Path(path)
+        self.mtime_slack_ns = int(mtime_slack * 1e9)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS directories (
+                path TEXT PRIMARY KEY,
+                device INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                listed_ns INTEGER NOT NULL,
+                extensions TEXT NOT NULL,
+                listing TEXT NOT NULL
+            )"""
+        )
+
+    def __enter__(self) -> "CrawlCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending writes and close the database."""
+        with self._lock:
+            self._db.commit()
+            self._db.close()
+
+    def clear(self) -> None:
+        """Forget every cached directory."""
+        with self._lock:
+            self._db.execute("DELETE FROM directories")
+            self._db.commit()
+
+    def list_directory(
+        self,
+        path: Path,
+        allowed_movie_exts: set[str],
+        allowed_sequence_exts: set[str],
+        prune: PruneRules | None = None,
+        follow_symlinks: bool = True,
+        sizes: bool = False,
+    ) -> _Listing:
+        """_list_directory, answered from the cache when path is unchanged."""
+        started = time.perf_counter()
+        try:
+            st = os.stat(path)
+        except OSError:
+            return _list_directory(
+                path,
+                allowed_movie_exts,
+                allowed_sequence_exts,
+                prune,
+                follow_symlinks,
+                sizes,
+            )
+        # Stored in the extensions column: everything a listing depends on
+        # besides the directory itself
+        extensions = " ".join(sorted(allowed_movie_exts | allowed_sequence_exts))
+        if prune is not None:
+            extensions += "\n" + json.dumps(
+                [prune.exclude, prune.exclude_regex, prune.ignore_file]
+            )
+        if not follow_symlinks:
+            extensions += "\nno-follow"
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT device, inode, mtime_ns, listed_ns, extensions, listing "
+                "FROM directories WHERE path = ?",
+                (str(path),),
+            ).fetchone()
+        if row is not None:
+            device, inode, mtime_ns, listed_ns, cached_extensions, listing = row
+            if (
+                (device, inode, mtime_ns) == (st.st_dev, st.st_ino, st.st_mtime_ns)
+                and cached_extensions == extensions
+                and mtime_ns < listed_ns - self.mtime_slack_ns
+            ):
+                looked_up = time.perf_counter()
+                decoded, ignore_mtime_ns = self._decode(path, listing)
+                if ignore_mtime_ns is None or (
+                    prune is not None
+                    and prune.ignore_file is not None
+                    and self._mtime(path / prune.ignore_file) == ignore_mtime_ns
+                    and ignore_mtime_ns < listed_ns - self.mtime_slack_ns
+                ):
+                    self.hits += 1
+                    entries = decoded.timing.entries if decoded.timing else 0
+                    if sizes:
+                        names = _file_names(
+                            decoded.sequences, decoded.movies, decoded.rogues
+                        )
+                        decoded = decoded._replace(sizes=_file_sizes(path, names))
+                    return decoded._replace(
+                        timing=_Timing(
+                            looked_up - started,
+                            time.perf_counter() - looked_up,
+                            entries,
+                            cached=True,
+                        )
+                    )
+
+        self.misses += 1
+        listed_ns = time.time_ns()
+        result = _list_directory(
+            path,
+            allowed_movie_exts,
+            allowed_sequence_exts,
+            prune,
+            follow_symlinks,
+            sizes,
+        )
+        ignore_mtime_ns = None
+        if result.ignored is not None:
+            assert prune is not None and prune.ignore_file is not None
+            ignore_mtime_ns = self._mtime(path / prune.ignore_file)
+        if result.error is None:
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        str(path),
+                        st.st_dev,
+                        st.st_ino,
+                        st.st_mtime_ns,
+                        listed_ns,
+                        extensions,
+                        self._encode(result, ignore_mtime_ns),
+                    ),
+                )
+        return result
+
+    @staticmethod
+    def _mtime(path: Path) -> int | None:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _encode(listing: _Listing, ignore_mtime_ns: int | None) -> str:
+        return json.dumps(
+            {**_pack(listing), "sizes": None, "ignore_mtime_ns": ignore_mtime_ns}
+        )
+
+    @staticmethod
+    def _decode(path: Path, data: str) -> tuple[_Listing, int | None]:
+        """The listing and the mtime of the ignore file it was pruned with."""
+        listing = json.loads(data)
+        return _unpack(path, listing), listing.get("ignore_mtime_ns")
+
+
+def _walk(
+    path: Path,
+    max_depth: int | None,
+    allowed_movie_exts: set[str],
+    allowed_sequence_exts: set[str],
+    workers: int = 1,
+    cache: CrawlCache | None = None,
+    prune: PruneRules | None = None,
+    follow_symlinks: bool = True,
+    processes: bool = False,
+    sizes: bool = False,
+) -> Iterator[tuple[Path, int, _Listing]]:
+    """Yield ``(directory, depth, listing)`` for every directory under path.
+
+    A directory is always yielded before its subdirectories. With one worker
+    directories are listed on the calling thread, depth-first in tree order.
+    With more, they are listed on a thread pool fed from a shared queue,
+    which keeps ``workers`` round trips in flight on network filesystems,
+    and are yielded in completion order. With ``processes`` the pool is a
+    process pool, so parsing runs on ``workers`` cores; listings come back
+    packed (see _pack) and are rebuilt here. Closing the generator early
+    cancels every directory not yet started. With a cache, unchanged directories
+    are answered from it instead of being listed. Each directory is listed
+    with the prune rules of its parent plus the parent's ignore file. When
+    following symlinks, a directory reached again by another path is
+    reported in its parent's ``aliases`` rather than listed again. With
+    ``sizes``, file sizes are gathered as each directory is listed.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    if processes and cache is not None:
+        raise ValueError("a CrawlCache cannot be shared with worker processes")
+    list_directory = _list_directory if cache is None else cache.list_directory
+    visited = _Visited(path, follow_symlinks)
+    options: dict[str, Any] = {
+        "allowed_movie_exts": allowed_movie_exts,
+        "allowed_sequence_exts": allowed_sequence_exts,
+        "follow_symlinks": follow_symlinks,
+        "sizes": sizes,
+    }
+
+    if workers == 1 and not processes:
+        list_one = functools.partial(list_directory, **options)
+        yield from _walk_serial(path, max_depth, prune, visited, list_one)
+        return
+
+    pool: Executor
+    task: Callable[..., Any]
+    if processes:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        task = functools.partial(_list_directory_packed, **options)
+    else:
+        pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pysequitur-crawl"
+        )
+        task = functools.partial(list_directory, **options)
+    try:
+        yield from _walk_pool(path, max_depth, prune, visited, pool, task, processes)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _walk_serial(
+    path: Path,
+    max_depth: int | None,
+    prune: PruneRules | None,
+    visited: _Visited,
+    list_one: Callable[..., _Listing],
+) -> Iterator[tuple[Path, int, _Listing]]:
+    """_walk on the calling thread, depth-first in tree order."""
+    stack = [(path, 0, prune)]
+    while stack:
+        directory, directory_depth, rules = stack.pop()
+        listing = visited.claim(list_one(directory, prune=rules))
+        yield directory, directory_depth, listing
+        if max_depth is None or directory_depth < max_depth:
+            rules = _child_rules(rules, listing)
+            stack.extend(
+                (d, directory_depth + 1, rules) for d in reversed(listing.dirs)
+            )
+
+
+def _walk_pool(
+    path: Path,
+    max_depth: int | None,
+    prune: PruneRules | None,
+    visited: _Visited,
+    pool: Executor,
+    task: Callable[..., Any],
+    processes: bool,
+) -> Iterator[tuple[Path, int, _Listing]]:
+    """_walk on a pool, in completion order; the caller shuts the pool down.
+
+    ``task`` lists one directory, returning packed data with processes.
+    """
+    in_flight: dict[Future, tuple[Path, int, PruneRules | None]] = {}
+
+    def submit(
+        directory: Path, directory_depth: int, rules: PruneRules | None
+    ) -> None:
+        future = pool.submit(task, directory, prune=rules)
+        in_flight[future] = (directory, directory_depth, rules)
+
+    submit(path, 0, prune)
+    while in_flight:
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            directory, directory_depth, rules = in_flight.pop(future)
+            if processes:
+                data, error = future.result()
+                listing = _unpack(directory, data)._replace(error=error)
+            else:
+                listing = future.result()
+            listing = visited.claim(listing)
+            if max_depth is None or directory_depth < max_depth:
+                rules = _child_rules(rules, listing)
+                for d in listing.dirs:
+                    submit(d, directory_depth + 1, rules)
+            yield directory, directory_depth, listing
 
 
 class Node:
+    """A directory in a crawled tree, with its parsed contents and children.
+
+    The whole subtree is crawled when the root Node is constructed. The crawl
+    uses an explicit stack rather than recursion, so arbitrarily deep trees
+    never hit the interpreter's recursion limit. With ``workers`` > 1
+    directories are listed concurrently. Children keep their listing order
+    whatever order they finish in, so the tree is the same either way,
+    except that when two paths lead to the same physical directory (see
+    below) the one crawled is whichever is listed first, which can vary
+    between parallel runs.
+
+    A directory that could not be listed (fully) has its OSError in
+    ``error``; ``errors`` collects them for the whole subtree. With prune
+    rules, pruned entries are left out of the tree entirely; ``skipped``
+    counts them per directory and ``total_skipped`` for the subtree.
+
+    Symlinked directories are followed by default, but each physical
+    directory is crawled once: a further path to it becomes an entry in
+    ``aliases`` (path -> where it was crawled) instead of a child node,
+    which also stops symlink cycles. With ``follow_symlinks=False``
+    symlinked directories are never descended; ``aliases`` maps them to
+    their targets.
+
+    With ``sizes=True``, ``sizes`` holds the bytes of each file in the
+    directory by name (None otherwise) and ``total_bytes`` sums the subtree.
+    With a ShotRollups, ``shot`` and ``sequence_shots`` hold shot numbers
+    as for Results.
+    """
+
     def __init__(
         self,
         path: Path,
         allowed_extensions: set[str] = DEFAULT_ALLOWED_EXTENSIONS,
         max_depth: int | None = None,
         current_depth: int = 0,
+        workers: int = 1,
+        cache: CrawlCache | None = None,
+        prune: PruneRules | None = None,
+        follow_symlinks: bool = True,
+        processes: bool = False,
+        stats: CrawlStats | None = None,
+        sizes: bool = False,
+        shots: ShotRollups | None = None,
     ):
+        if max_depth is not None:
+            max_depth -= current_depth
+
+        # Nodes whose directory has been queued but not yet listed
+        unlisted: dict[Path, Node] = {path: self}
+        for result in iter_scan(
+            path,
+            max_depth,
+            allowed_extensions,
+            workers,
+            cache,
+            prune,
+            follow_symlinks,
+            processes,
+            stats,
+            sizes,
+            shots,
+        ):
+            node = unlisted.pop(result.dir)
+            node._populate(
+                result.dir,
+                result.dirs,
+                set(result.movs),
+                result.sequences,
+                result.rogues,
+                result.error,
+                result.skipped,
+                result.aliases,
+                result.sizes,
+                result.shot,
+                result.sequence_shots,
+            )
+            # Process subdirectories with depth control
+            if max_depth is None or result.depth < max_depth:
+                node.nodes = [Node.__new__(Node) for _ in node.dirs]
+                unlisted.update(zip(node.dirs, node.nodes, strict=True))
+
+    def _populate(
+        self,
+        path: Path,
+        dirs: list[Path],
+        movies: set[Path],
+        sequences: list[FileSequence],
+        rogues: list[Path],
+        error: OSError | None,
+        skipped: int = 0,
+        aliases: dict[Path, Path] | None = None,
+        sizes: dict[str, int] | None = None,
+        shot: str | None = None,
+        sequence_shots: list[str] | None = None,
+    ) -> None:
         self.path: Path = path
+        self.dirs: list[Path] = dirs
+        self.movies: set[Path] = movies
+        self.sequences: list[FileSequence] = sequences
+        self.rogues: list[Path] = rogues
+        self.error: OSError | None = error
+        self.skipped: int = skipped
+        self.aliases: dict[Path, Path] = aliases if aliases is not None else {}
+        self.sizes: dict[str, int] | None = sizes
+        self.shot: str | None = shot
+        self.sequence_shots: list[str] | None = sequence_shots
+        self.nodes: list[Node] = []
 
-        normalized_extensions = {ext.lower().lstrip(".") for ext in allowed_extensions}
-        allowed_movie_exts = normalized_extensions.intersection(MOVIE_FILE_TYPES)
-        allowed_sequence_exts = normalized_extensions.difference(MOVIE_FILE_TYPES)
+    @property
+    def errors(self) -> list[tuple[Path, OSError]]:
+        """(directory, error) for every directory in this subtree that could
+        not be listed, in tree order."""
+        errors = []
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.error is not None:
+                errors.append((node.path, node.error))
+            stack.extend(reversed(node.nodes))
+        return errors
 
-        self.movies: set[Path] = set()
-        self.dirs: list[Path] = []
+    @property
+    def total_skipped(self) -> int:
+        """Entries pruned anywhere in this subtree."""
+        total = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            total += node.skipped
+            stack.extend(node.nodes)
+        return total
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes of every file in this subtree whose size was gathered."""
+        total = 0
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.sizes is not None:
+                total += sum(node.sizes.values())
+            stack.extend(node.nodes)
+        return total
+
+
+def iter_scan(
+    path: Path,
+    max_depth: int | None = None,
+    allowed_extensions: set[str] = DEFAULT_ALLOWED_EXTENSIONS,
+    workers: int = 1,
+    cache: CrawlCache | None = None,
+    prune: PruneRules | None = None,
+    follow_symlinks: bool = True,
+    processes: bool = False,
+    stats: CrawlStats | None = None,
+    sizes: bool = False,
+    shots: ShotRollups | None = None,
+) -> Iterator[Results]:
+    """Crawl a directory tree, yielding a Results object per directory.
+
+    Each directory is yielded as soon as it has been listed and parsed, so
+    callers can start on a large tree straight away, and only the frontier
+    of directories still to be listed is held in memory. A directory is
+    always yielded before its subdirectories. With one worker the order is
+    the same depth-first tree order as traverse_nodes; with more it follows
+    completion (see recursive_scan). With a CrawlCache, directories that
+    have not changed since the last scan are not listed again. With
+    PruneRules, pruned directories are never listed and each Results
+    counts the entries pruned from its directory in ``skipped``. Each
+    physical directory is yielded once; see Node for symlink handling.
+    With ``processes=True`` the workers are processes, for trees where
+    parsing rather than listing is the bottleneck (see recursive_scan).
+    A CrawlStats passed as ``stats`` records each directory's timings.
+    With ``sizes=True`` each Results carries the size of every file it
+    lists, taken from the same directory listing (see Results.sizes).
+    A ShotRollups passed as ``shots`` tags each Results with shot numbers
+    as it is yielded and totals them per shot.
+
+    Example:
+        for result in crawl.iter_scan(Path("/shows/abc"), workers=16):
+            for seq in result.sequences:
+                print(seq)
+    """
+    allowed_movie_exts, allowed_sequence_exts = _split_extensions(allowed_extensions)
+    started = time.perf_counter()
+    try:
+        for directory, depth, listing in _walk(
+            path,
+            max_depth,
+            allowed_movie_exts,
+            allowed_sequence_exts,
+            workers,
+            cache,
+            prune,
+            follow_symlinks,
+            processes,
+            sizes,
+        ):
+            yield _report(directory, depth, listing, stats, shots)
+    finally:
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - started
+
+
+def recursive_scan(
+    path: Path,
+    max_depth: int | None = None,
+    workers: int = 1,
+    cache: CrawlCache | None = None,
+    prune: PruneRules | None = None,
+    follow_symlinks: bool = True,
+    processes: bool = False,
+    stats: CrawlStats | None = None,
+    sizes: bool = False,
+    shots: ShotRollups | None = None,
+) -> Node:
+    """Crawl a directory tree into a Node tree.
+
+    Args:
+        path: Root directory to crawl
+        max_depth: Maximum depth to descend (None for unlimited)
+        workers: Number of directories listed concurrently. On NFS or SMB,
+            where each listing is a network round trip, 8-16 workers make a
+            large crawl many times faster.
+        cache: Optional CrawlCache; unchanged directories are answered from
+            it instead of being listed and parsed again.
+        prune: Optional PruneRules; matching directories are not descended
+            into and matching files are left out.
+        follow_symlinks: Descend into symlinked directories. Each physical
+            directory is crawled once either way; other paths to it are
+            listed in ``Node.aliases``.
+        processes: List and parse directories in ``workers`` processes
+            instead of threads. Sequence parsing is CPU-bound, so on local
+            or fast storage with millions of frames this spreads it over
+            that many cores. Cannot be combined with a cache.
+        stats: Optional CrawlStats to record per-directory timings in.
+        sizes: Record the size of every file (``Node.sizes``). On most
+            filesystems this is a stat per file, made while the directory
+            is being listed.
+        shots: Optional ShotRollups to tag nodes with shot numbers and
+            total them per shot.
+
+    Returns:
+        The root Node; listing errors are collected in ``Node.errors``.
+    """
+    return Node(
+        path,
+        max_depth=max_depth,
+        workers=workers,
+        cache=cache,
+        prune=prune,
+        follow_symlinks=follow_symlinks,
+        processes=processes,
+        stats=stats,
+        sizes=sizes,
+        shots=shots,
+    )
+
+
+@dataclass(frozen=True)
+class Continuation:
+    """Where a partial_scan stopped; pass it back to partial_scan to resume.
+
+    Holds the unexplored frontier, each directory with its depth and the
+    prune rules it inherited, and the physical directories already queued,
+    so a resumed crawl never lists a directory twice. Picklable, so the
+    rest of a crawl can be handed to another thread or process.
+    """
 
-        sequence_candidates: list[str] = []
+    frontier: tuple[tuple[Path, int, PruneRules | None], ...]
+    visited: dict[_Identity, Path] | None = field(default=None, compare=False)
 
+    def __len__(self) -> int:
+        return len(self.frontier)
+
+
+@dataclass
+class PartialScan:
+    """The directories a partial_scan reached, and how to carry on."""
+
+    results: list[Results]
+    continuation: Continuation | None  # None once the whole tree is crawled
+
+    @property
+    def complete(self) -> bool:
+        return self.continuation is None
+
+
+def partial_scan(
+    path: Path,
+    budget: float | None = 0.2,
+    max_directories: int | None = None,
+    priority: Callable[[Path, int], Any] | None = None,
+    continuation: Continuation | None = None,
+    max_depth: int | None = None,
+    allowed_extensions: set[str] = DEFAULT_ALLOWED_EXTENSIONS,
+    workers: int = 1,
+    cache: CrawlCache | None = None,
+    prune: PruneRules | None = None,
+    follow_symlinks: bool = True,
+    stats: CrawlStats | None = None,
+    sizes: bool = False,
+    shots: ShotRollups | None = None,
+) -> PartialScan:
+    """Crawl as much of a tree as fits in a budget, shallowest first.
+
+    For interactive callers: the top levels of a deep tree come back
+    within the deadline, along with a Continuation for the unexplored
+    frontier, which a later call (e.g. on a background thread) resumes.
+
+    Args:
+        path: Root directory to crawl (ignored when resuming).
+        budget: Seconds to spend, or None for no time limit. A listing
+            already running when the budget runs out is not waited for:
+            its directory goes back into the continuation.
+        max_directories: Stop after listing this many directories.
+        priority: Optional ``priority(directory, depth)`` key; directories
+            with the lowest value are listed first. Defaults to the depth,
+            which crawls breadth-first.
+        continuation: Where a previous partial_scan stopped. The other
+            crawl options should be the same as for that call.
+        workers: Number of directories listed concurrently.
+        max_depth, allowed_extensions, cache, prune, follow_symlinks, stats,
+            sizes, shots: As for iter_scan.
+
+    Returns:
+        A PartialScan with a Results object per directory listed, in
+        listing order, and a continuation unless the crawl is complete.
+
+    Example:
+        scan = crawl.partial_scan(Path("/shows/abc"), budget=0.2)
+        show(scan.results)
+        while not scan.complete:
+            scan = crawl.partial_scan(
+                Path("/shows/abc"), budget=1.0, continuation=scan.continuation
+            )
+            refine(scan.results)
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    started = time.perf_counter()
+    allowed_movie_exts, allowed_sequence_exts = _split_extensions(allowed_extensions)
+    list_directory = _list_directory if cache is None else cache.list_directory
+
+    def list_one(directory: Path, rules: PruneRules | None) -> _Listing:
+        return list_directory(
+            directory,
+            allowed_movie_exts,
+            allowed_sequence_exts,
+            rules,
+            follow_symlinks,
+            sizes,
+        )
+
+    if continuation is None:
+        visited = _Visited(path, follow_symlinks)
+        frontier: tuple[tuple[Path, int, PruneRules | None], ...] = ((path, 0, prune),)
+    else:
+        visited = _Visited(path, follow_symlinks, continuation.visited)
+        frontier = continuation.frontier
+    crawl = _PartialCrawl(
+        visited, frontier, priority, budget, max_directories, max_depth, stats, shots
+    )
+    if workers == 1:
+        crawl.run(list_one)
+    else:
+        crawl.run_pool(list_one, workers)
+
+    if stats is not None:
+        stats.elapsed += time.perf_counter() - started
+    return PartialScan(crawl.results, crawl.continuation())
+
+
+def _depth(directory: Path, depth: int) -> int:
+    return depth
+
+
+class _PartialCrawl:
+    """One partial_scan call: its frontier, its budget and what it listed."""
+
+    def __init__(
+        self,
+        visited: _Visited,
+        frontier: tuple[tuple[Path, int, PruneRules | None], ...],
+        priority: Callable[[Path, int], Any] | None,
+        budget: float | None,
+        max_directories: int | None,
+        max_depth: int | None,
+        stats: CrawlStats | None,
+        shots: ShotRollups | None,
+    ):
+        self.visited = visited
+        self.key = priority if priority is not None else _depth
+        self.order = itertools.count()  # ties keep discovery order
+        self.heap: list[tuple[Any, int, Path, int, PruneRules | None]] = []
+        self.deadline = time.monotonic() + budget if budget is not None else None
+        self.max_directories = max_directories
+        self.max_depth = max_depth
+        self.stats = stats
+        self.shots = shots
+        self.results: list[Results] = []
+        for queued in frontier:
+            self.push(*queued)
+
+    def push(self, directory: Path, depth: int, rules: PruneRules | None) -> None:
+        item = (self.key(directory, depth), next(self.order), directory, depth, rules)
+        heapq.heappush(self.heap, item)
+
+    def pop(self) -> tuple[Path, int, PruneRules | None]:
+        _key, _order, directory, depth, rules = heapq.heappop(self.heap)
+        return directory, depth, rules
+
+    def remaining(self) -> float | None:
+        """Seconds left of the budget, None without a time limit."""
+        return None if self.deadline is None else self.deadline - time.monotonic()
+
+    def spent(self, in_flight: int = 0) -> bool:
+        """Whether the budget allows no further listings to start."""
+        left = self.remaining()
+        if left is not None and left <= 0:
+            return True
+        return (
+            self.max_directories is not None
+            and len(self.results) + in_flight >= self.max_directories
+        )
+
+    def expand(
+        self, directory: Path, depth: int, rules: PruneRules | None, listing: _Listing
+    ) -> None:
+        """Record a listing and queue its subdirectories."""
+        listing = self.visited.claim(listing)
+        self.results.append(_report(directory, depth, listing, self.stats, self.shots))
+        if self.max_depth is None or depth < self.max_depth:
+            rules = _child_rules(rules, listing)
+            for d in listing.dirs:
+                self.push(d, depth + 1, rules)
+
+    def run(self, list_one: Callable[..., _Listing]) -> None:
+        """List directories on this thread until the budget is spent."""
+        while self.heap and not self.spent():
+            directory, depth, rules = self.pop()
+            self.expand(directory, depth, rules, list_one(directory, rules))
+
+    def run_pool(self, list_one: Callable[..., _Listing], workers: int) -> None:
+        """List directories on a pool until the budget is spent.
+
+        Listings still running when time runs out are abandoned, not waited
+        for, and their directories go back on the frontier.
+        """
+        in_flight: dict[Future, tuple[Path, int, PruneRules | None]] = {}
+        pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pysequitur-crawl"
+        )
         try:
-            for item in path.iterdir():
-                if item.is_dir():
-                    self.dirs.append(item)
-                elif item.is_file():
-                    if item.name[0] == ".":
-                        continue
-                    ext = item.suffix.lower().lstrip(".")
-                    if ext in allowed_movie_exts:
-                        self.movies.add(item)
-                    elif ext in allowed_sequence_exts:
-                        sequence_candidates.append(item.name)
-        except (PermissionError, OSError) as e:
-            print(f"Error accessing {path}: {e}")
-
-        # Only process sequences if we found candidate files
-        if sequence_candidates:
-            results: SequenceParser.ParseResult = SequenceParser.from_file_list(
-                sequence_candidates, 1, path, allowed_sequence_exts
+            while True:
+                while (
+                    self.heap
+                    and len(in_flight) < workers
+                    and not self.spent(len(in_flight))
+                ):
+                    directory, depth, rules = self.pop()
+                    future = pool.submit(list_one, directory, rules)
+                    in_flight[future] = (directory, depth, rules)
+                left = self.remaining()
+                if not in_flight or (left is not None and left <= 0):
+                    break
+                done, _ = wait(in_flight, timeout=left, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.expand(*in_flight.pop(future), future.result())
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+        for queued in in_flight.values():
+            self.push(*queued)
+
+    def continuation(self) -> Continuation | None:
+        """Where to resume, or None once the whole tree is crawled."""
+        if not self.heap:
+            return None
+        left_over = tuple(
+            (directory, depth, rules)
+            for *_, directory, depth, rules in sorted(self.heap)
+        )
+        return Continuation(left_over, self.visited._seen)
+
+
+async def scan_async(
+    path: Path,
+    max_depth: int | None = None,
+    allowed_extensions: set[str] = DEFAULT_ALLOWED_EXTENSIONS,
+    concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+    prune: PruneRules | None = None,
+    follow_symlinks: bool = True,
+    stats: CrawlStats | None = None,
+    sizes: bool = False,
+    shots: ShotRollups | None = None,
+) -> AsyncIterator[Results]:
+    """Crawl a directory tree without blocking the event loop.
+
+    Directories are listed and parsed in a thread pool owned by the crawl,
+    at most ``concurrency`` at a time, and a Results object is yielded for
+    each directory as soon as it has been parsed. Yield order therefore
+    follows completion, not tree order. Cancelling the consuming task (or
+    closing the generator early) abandons every directory not yet started.
+    A CrawlStats passed as ``stats`` records each directory's timings,
+    ``sizes=True`` gathers file sizes and a ShotRollups passed as ``shots``
+    tags shot numbers, as for iter_scan.
+
+    Example:
+        async for result in crawl.scan_async(Path("/shows/abc"), concurrency=16):
+            for seq in result.sequences:
+                print(seq)
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    allowed_movie_exts, allowed_sequence_exts = _split_extensions(allowed_extensions)
+
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="pysequitur-crawl"
+    )
+    in_flight: dict[asyncio.Future, tuple[Path, int, PruneRules | None]] = {}
+    pending: deque[tuple[Path, int, PruneRules | None]] = deque([(path, 0, prune)])
+    started = time.perf_counter()
+
+    def fill() -> None:
+        while pending and len(in_flight) < concurrency:
+            directory, depth, rules = pending.popleft()
+            future = loop.run_in_executor(
+                executor,
+                _list_directory,
+                directory,
+                allowed_movie_exts,
+                allowed_sequence_exts,
+                rules,
+                follow_symlinks,
+                sizes,
             )
-            self.sequences: list[FileSequence] = results.sequences
-            self.rogues: list[Path] = results.rogues
-        else:
-            self.sequences = []
-            self.rogues = []
+            in_flight[future] = (directory, depth, rules)
+
+    try:
+        visited = await loop.run_in_executor(
+            executor, _Visited, path, follow_symlinks
+        )
+        fill()
+        while in_flight:
+            done, _ = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                directory, depth, rules = in_flight.pop(future)
+                listing = visited.claim(future.result())
+                if max_depth is None or depth < max_depth:
+                    rules = _child_rules(rules, listing)
+                    pending.extend((d, depth + 1, rules) for d in listing.dirs)
+                fill()
+                yield _report(directory, depth, listing, stats, shots)
+    finally:
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if stats is not None:
+            stats.elapsed += time.perf_counter() - started
 
-        # Process subdirectories with depth control
-        self.nodes: list[Node] = []
-        if max_depth is None or current_depth < max_depth:
-            self.nodes = [
-                Node(d, allowed_extensions, max_depth, current_depth + 1)
-                for d in self.dirs
-            ]
 
+def measure(
+    results: Iterable[Results], workers: int = DEFAULT_STAT_WORKERS
+) -> Iterator[Results]:
+    """Yield each Results with its sizes filled in.
+
+    For results crawled without ``sizes=True`` (or loaded from elsewhere).
+    Directories are statted on a pool of ``workers`` threads, a few at a
+    time, so a streaming crawl stays streaming; results come back in the
+    order they were given. Results that already have sizes pass through.
+
+    Example:
+        for result in crawl.measure(crawl.iter_scan(path), workers=16):
+            print(result.dir, result.total_bytes)
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pysequitur-stat")
+    window: deque[tuple[Results, Future | None]] = deque()
 
-def recursive_scan(path: Path, max_depth: int | None = None) -> Node:
-    return Node(path, max_depth=max_depth)
+    def finish(result: Results, future: Future | None) -> Results:
+        if future is not None:
+            result.sizes = future.result()
+        return result
+
+    try:
+        for result in results:
+            future = None
+            if result.sizes is None:
+                names = list(_file_names(result.sequences, result.movs, result.rogues))
+                future = pool.submit(_file_sizes, result.dir, names)
+            window.append((result, future))
+            if len(window) > 2 * workers:
+                yield finish(*window.popleft())
+        while window:
+            yield finish(*window.popleft())
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def largest_sequences(
+    results: Iterable[Results], n: int = 10
+) -> list[tuple[int, FileSequence]]:
+    """The n largest sequences by bytes on disk, largest first.
+
+    Keeps a heap of n entries rather than sorting every sequence, so it
+    runs over a streaming crawl in constant memory. Results without sizes
+    are skipped; see measure().
+
+    Example:
+        for size, seq in crawl.largest_sequences(crawl.iter_scan(path, sizes=True)):
+            print(size, seq.absolute_file_name)
+    """
+    sized = (
+        (size, sequence)
+        for result in results
+        for sequence in result.sequences
+        if (size := result.sequence_bytes(sequence)) is not None
+    )
+    return heapq.nlargest(n, sized, key=itemgetter(0))
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB", "TiB"):
+        if size < 1024 or unit == "TiB":
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+def _file_rows(
+    sequences: list[FileSequence],
+    movies: Iterable[Path],
+    rogues: list[Path],
+    aliases: dict[Path, Path],
+    sizes: dict[str, int] | None,
+) -> list[str]:
+    """The sequence, movie, rogue and alias rows for a single directory."""
+    movies = sorted(movies)
+    file_items = [f"[SEQ] {seq}" for seq in sequences]
+    file_items += [f"[MOV] {movie.name}" for movie in movies]
+    file_items += [f"[ROG] {rogue}" for rogue in rogues]
+    if sizes is not None:
+        files = [[item.filename for item in seq.items] for seq in sequences]
+        files += [[movie.name] for movie in movies]
+        files += [[rogue.name] for rogue in rogues]
+        file_items = [
+            f"{row} ({_format_bytes(sum(sizes.get(name, 0) for name in names))})"
+            for row, names in zip(file_items, files, strict=True)
+        ]
+    file_items += [
+        f"[LNK] {alias.name}/ -> {target}" for alias, target in aliases.items()
+    ]
+    return file_items
 
 
 def _print_node_files(node: Node, new_prefix: str) -> None:
     """Print the sequence, movie, and rogue rows for a single node."""
-    file_items = [f"[SEQ] {seq}" for seq in node.sequences]
-    file_items += [f"[MOV] {movie.name}" for movie in sorted(node.movies)]
-    file_items += [f"[ROG] {rogue}" for rogue in node.rogues]
+    file_items = _file_rows(
+        node.sequences, node.movies, node.rogues, node.aliases, node.sizes
+    )
 
     for i, item in enumerate(file_items):
         is_last_file = i == len(file_items) - 1
         print(new_prefix + ("└── " if is_last_file else "├── ") + item)
 
 
+def _new_counts() -> dict[str, Any]:
+    return {
+        "dirs": 0,
+        "sequences": 0,
+        "movies": 0,
+        "rogues": 0,
+        "skipped": 0,
+        "bytes": None,
+    }
+
+
+def _summary_lines(counts: dict[str, Any]) -> list[str]:
+    """The closing summary of a rendered tree."""
+    total_files = counts["sequences"] + counts["movies"] + counts["rogues"]
+    lines = [
+        f"{counts['dirs']} directories, {total_files} files",
+        f"  {counts['sequences']} sequences, {counts['movies']} movies, "
+        f"{counts['rogues']} rogues",
+    ]
+    if counts["skipped"]:
+        lines.append(f"  {counts['skipped']} entries pruned")
+    if counts["bytes"] is not None:
+        lines.append(f"  {_format_bytes(counts['bytes'])} on disk")
+    return lines
+
+
 def visualize_tree(
     node: Node, prefix="", is_last=True, max_level=None, level=0, counts=None
 ):
     """
     Visualize the directory tree with sequences, movies, and rogues in a
-    tree-like format. Similar to the 'tree' command output.
+    tree-like format. Similar to the 'tree' command output. If the tree was
+    crawled with ``sizes=True``, each row shows its size on disk.
 
     Args:
         node: The node to visualize
@@ -113,7 +1828,7 @@ def visualize_tree(
 
     is_root = counts is None
     if counts is None:
-        counts = {"dirs": 0, "sequences": 0, "movies": 0, "rogues": 0}
+        counts = _new_counts()
 
     if max_level is not None and level > max_level:
         print(prefix + ("└── " if is_last else "├── ") + "...")
@@ -133,31 +1848,241 @@ def visualize_tree(
     for i, subnode in enumerate(node.nodes):
         is_last_dir = i == dirs_count - 1
         is_last_item = is_last_dir and not (
-            node.sequences or node.movies or node.rogues
+            node.sequences or node.movies or node.rogues or node.aliases
         )
         visualize_tree(subnode, new_prefix, is_last_item, max_level, level + 1, counts)
 
     counts["sequences"] += len(node.sequences)
     counts["movies"] += len(node.movies)
     counts["rogues"] += len(node.rogues)
+    counts["skipped"] += node.skipped
+    if node.sizes is not None:
+        counts["bytes"] = (counts["bytes"] or 0) + sum(node.sizes.values())
 
     _print_node_files(node, new_prefix)
 
     if is_root:
-        total_files = counts["sequences"] + counts["movies"] + counts["rogues"]
-        print(f"\n{counts['dirs']} directories, {total_files} files")
-        print(
-            f"  {counts['sequences']} sequences, {counts['movies']} movies, "
-            f"{counts['rogues']} rogues"
-        )
+        print()
+        for line in _summary_lines(counts):
+            print(line)
+
+    return counts
+
+
+RENDER_MODES = ("text", "jsonl", "summary")
+
+# render_tree flushes its output at most this often
+_RENDER_FLUSH_SECONDS = 0.1
+
+
+class _Rendering(NamedTuple):
+    """A directory render_tree has printed, whose file rows are still due."""
+
+    dir: Path
+    level: int
+    child_prefix: str
+    last_dir: Path | None
+    rows: list[str]
 
+
+def render_tree(
+    results: Iterable[Results],
+    out: TextIO | None = None,
+    mode: str = "text",
+    max_level: int | None = None,
+) -> dict[str, Any]:
+    """Render a crawl as it streams in, without building a Node tree.
+
+    ``results`` can come straight from iter_scan, so output starts with the
+    first directory listed. Memory is bounded by the depth of the tree: only
+    the directories on the path to the current one are held, each with its
+    file rows, which text output prints after the directory's subtree.
+    Lines are written a directory at a time to ``out`` (stdout by default),
+    which is flushed every so often rather than per line.
+
+    Modes:
+        text: The same tree as visualize_tree. The results must be in tree
+            order, as iter_scan yields them with one worker.
+        jsonl: One JSON object per directory, in any order, then one
+            ``{"summary": ...}`` object.
+        summary: Only the closing counts.
+
+    Args:
+        results: Results to render; the first is the root.
+        out: Text file to write to.
+        mode: One of RENDER_MODES.
+        max_level: Maximum depth below the root to render (None for
+            unlimited); deeper directories are not counted either.
+
+    Returns:
+        The counts of directories, sequences, movies, rogues, pruned entries
+        and bytes (None unless sizes were gathered), as visualize_tree.
+
+    Example:
+        with open("tree.txt", "w") as f:
+            crawl.render_tree(crawl.iter_scan(Path("/shows/abc")), out=f)
+    """
+    if mode not in RENDER_MODES:
+        raise ValueError(f"mode must be one of {RENDER_MODES}, not {mode!r}")
+    writer = _TreeWriter(out if out is not None else sys.stdout)
+    counts = _new_counts()
+    stack: list[_Rendering] = []
+    root_depth: int | None = None
+
+    for result in results:
+        if root_depth is None:
+            root_depth = result.depth
+        level = result.depth - root_depth
+        if max_level is not None and level > max_level + 1:
+            continue
+        elided = max_level is not None and level > max_level
+
+        if mode == "text":
+            if not _render_text(result, level, elided, stack, writer):
+                continue
+        elif elided:
+            continue
+        elif mode == "jsonl":
+            writer.write(json.dumps(_result_record(result)) + "\n")
+
+        _count(counts, result, level)
+        writer.tick()
+
+    _render_end(mode, stack, counts, writer)
     return counts
 
 
+class _TreeWriter:
+    """render_tree's output, buffered and flushed every so often."""
+
+    def __init__(self, out: TextIO):
+        self.out = out
+        self.buffer: list[str] = []
+        self.flushed = time.monotonic()
+
+    def write(self, line: str) -> None:
+        self.buffer.append(line)
+
+    def rows(self, rendering: _Rendering) -> None:
+        """The file rows of a directory whose subtree is done."""
+        rows = rendering.rows
+        for i, row in enumerate(rows):
+            connector = "└── " if i == len(rows) - 1 else "├── "
+            self.buffer.append(f"{rendering.child_prefix}{connector}{row}\n")
+
+    def tick(self) -> None:
+        """Flush if _RENDER_FLUSH_SECONDS have passed since the last flush."""
+        if self.buffer and time.monotonic() - self.flushed >= _RENDER_FLUSH_SECONDS:
+            self.close()
+            self.flushed = time.monotonic()
+
+    def close(self) -> None:
+        self.out.write("".join(self.buffer))
+        self.out.flush()
+        self.buffer.clear()
+
+
+def _render_text(
+    result: Results,
+    level: int,
+    elided: bool,
+    stack: list[_Rendering],
+    writer: _TreeWriter,
+) -> bool:
+    """Write a directory's line of a text tree and hold its file rows until
+    its subtree is done. Returns False if max_level elides it to "..."."""
+    while stack and stack[-1].level >= level:
+        writer.rows(stack.pop())
+    if level > 0 and (not stack or stack[-1].dir != result.dir.parent):
+        raise ValueError(
+            "text rendering needs results in tree order "
+            "(iter_scan with one worker)"
+        )
+    if stack:
+        parent = stack[-1]
+        is_last = result.dir == parent.last_dir and not parent.rows
+        connector = "└── " if is_last else "├── "
+        if elided:
+            writer.write(f"{parent.child_prefix}{connector}...\n")
+            return False
+        writer.write(f"{parent.child_prefix}{connector}{result.dir.name}/\n")
+        child_prefix = parent.child_prefix + ("    " if is_last else "│   ")
+    else:
+        writer.write(f"{result.dir}\n")
+        child_prefix = "    "
+    rows = _file_rows(
+        result.sequences,
+        result.movs,
+        result.rogues,
+        result.aliases,
+        result.sizes,
+    )
+    last_dir = result.dirs[-1] if result.dirs else None
+    stack.append(_Rendering(result.dir, level, child_prefix, last_dir, rows))
+    return True
+
+
+def _render_end(
+    mode: str, stack: list[_Rendering], counts: dict[str, Any], writer: _TreeWriter
+) -> None:
+    """Write the file rows still held and the summary, then flush."""
+    while stack:
+        writer.rows(stack.pop())
+    if mode == "text":
+        writer.write("\n")
+    if mode == "jsonl":
+        writer.write(json.dumps({"summary": counts}) + "\n")
+    else:
+        for line in _summary_lines(counts):
+            writer.write(line + "\n")
+    writer.close()
+
+
+def _count(counts: dict[str, Any], result: Results, level: int) -> None:
+    """Add a rendered directory to render_tree's counts."""
+    if level > 0:
+        counts["dirs"] += 1
+    counts["sequences"] += len(result.sequences)
+    counts["movies"] += len(result.movs)
+    counts["rogues"] += len(result.rogues)
+    counts["skipped"] += result.skipped
+    if result.sizes is not None:
+        counts["bytes"] = (counts["bytes"] or 0) + sum(result.sizes.values())
+
+
+def _result_record(result: Results) -> dict[str, Any]:
+    """One directory as a JSON-serialisable dict, for render_tree."""
+    sequences = []
+    for seq in result.sequences:
+        sequences.append(
+            {
+                "pattern": seq.sequence_string,
+                "first_frame": seq.first_frame,
+                "last_frame": seq.last_frame,
+                "files": len(seq.items),
+                "missing": seq.frame_count - len(seq.items),
+                "bytes": result.sequence_bytes(seq),
+            }
+        )
+    return {
+        "dir": str(result.dir),
+        "depth": result.depth,
+        "sequences": sequences,
+        "movies": sorted(movie.name for movie in result.movs),
+        "rogues": [rogue.name for rogue in result.rogues],
+        "aliases": {str(link): str(target) for link, target in result.aliases.items()},
+        "skipped": result.skipped,
+        "error": str(result.error) if result.error is not None else None,
+        "bytes": result.total_bytes,
+    }
+
+
 def traverse_nodes(node: Node, depth: int = 0) -> list[Results]:
     """
     Traverse all nodes in the tree and return a flat list of Results objects.
 
+    Nodes are visited depth-first in tree order using an explicit stack.
+
     Args:
         node: The node to start traversal from
         depth: Current depth in the tree
@@ -166,25 +2091,27 @@ def traverse_nodes(node: Node, depth: int = 0) -> list[Results]:
         List of Results objects for each node
     """
     results = []
-
-    # Create Results object for current node
-    # Convert rogues from strings to Path objects
-    rogues_as_paths = [node.path / rogue for rogue in node.rogues]
-
-    current_result = Results(
-        dir=node.path,
-        sequences=node.sequences,
-        movs=list(node.movies),  # Convert set to list
-        rogues=rogues_as_paths,
-        depth=depth,
-    )
-
-    # Add to results list
-    results.append(current_result)
-
-    # Recursively process child nodes
-    for child_node in node.nodes:
-        child_results = traverse_nodes(child_node, depth + 1)
-        results.extend(child_results)
+    stack = [(node, depth)]
+    while stack:
+        current, current_depth = stack.pop()
+        # Convert rogues from strings to Path objects
+        rogues_as_paths = [current.path / rogue for rogue in current.rogues]
+        results.append(
+            Results(
+                dir=current.path,
+                sequences=current.sequences,
+                movs=list(current.movies),  # Convert set to list
+                rogues=rogues_as_paths,
+                depth=current_depth,
+                error=current.error,
+                dirs=current.dirs,
+                skipped=current.skipped,
+                aliases=current.aliases,
+                sizes=current.sizes,
+                shot=current.shot,
+                sequence_shots=current.sequence_shots,
+            )
+        )
+        stack.extend((child, current_depth + 1) for child in reversed(current.nodes))
 
     return results
@@ -4,16 +4,34 @@
 
 from __future__ import annotations
 
+import asyncio
+import ctypes
 import dataclasses
+import errno
+import hashlib
+import heapq
 import importlib.util
 import logging
+import mmap
 import os
 import re
 import shutil
-from collections import Counter, defaultdict
-from collections.abc import Iterator
+import sys
+import tempfile
+from collections import Counter, defaultdict, deque
+from collections.abc import AsyncGenerator, Callable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import AbstractContextManager, aclosing, nullcontext
 from dataclasses import dataclass
 from enum import Enum, Flag, auto
+from functools import cache
+from itertools import pairwise
 from operator import attrgetter
 from pathlib import Path
 from typing import (
@@ -21,9 +39,25 @@ from typing import (
     TypedDict,
 )
 
+from .throttle import RatePolicy, Throttle, ThroughputReport
+
 logger = logging.getLogger("pysequitur")
 logger.addHandler(logging.NullHandler())
 
+DEFAULT_ASYNC_CONCURRENCY = 8
+DEFAULT_COPY_WORKERS = 4
+DEFAULT_DELETE_WORKERS = 16
+DEFAULT_STAT_WORKERS = 8
+_HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def _file_size(path: Path | str) -> int:
+    """Size of a file in bytes, or 0 if it can't be statted."""
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
 
 def _paths_same_file(a: Path, b: Path) -> bool:
     """True if both paths exist and point at the same file.
@@ -37,6 +71,750 @@ def _paths_same_file(a: Path, b: Path) -> bool:
         return False
 
 
+def _operation_dependencies(operations: tuple[FileOperation, ...]) -> list[list[int]]:
+    """For each operation, the indices of earlier operations it must wait for.
+
+    Plans are order-sensitive: offset_frames renames high frames first and a
+    builder chain renames files produced by earlier steps. Two operations that
+    touch the same path (as source or destination) therefore keep their plan
+    order, while unrelated operations are free to overlap.
+    """
+    last_touch: dict[str, int] = {}
+    dependencies: list[list[int]] = []
+    for index, op in enumerate(operations):
+        keys = [str(op.source)]
+        if op.destination is not None:
+            keys.append(str(op.destination))
+        dependencies.append(sorted({last_touch[k] for k in keys if k in last_touch}))
+        for key in keys:
+            last_touch[key] = index
+    return dependencies
+
+
+class _Ready:
+    """Operations whose dependencies (see _operation_dependencies) have all
+    finished, queued in the order they became ready."""
+
+    def __init__(self, operations: tuple[FileOperation, ...]):
+        dependencies = _operation_dependencies(operations)
+        self._waiting = [len(deps) for deps in dependencies]
+        self._dependents: list[list[int]] = [[] for _ in operations]
+        for index, deps in enumerate(dependencies):
+            for dep in deps:
+                self._dependents[dep].append(index)
+        self.queue = deque(i for i, count in enumerate(self._waiting) if count == 0)
+
+    def release(self, index: int) -> None:
+        """Mark an operation finished, queueing the dependents it held back."""
+        for dependent in self._dependents[index]:
+            self._waiting[dependent] -= 1
+            if self._waiting[dependent] == 0:
+                self.queue.append(dependent)
+
+
+# renameat2(2) flags, see <linux/fs.h>
+_AT_FDCWD = -100
+_RENAME_NOREPLACE = 1
+
+
+@cache
+def _renameat2() -> Any:
+    """The libc renameat2 function, or None where it is unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        function = libc.renameat2  # glibc >= 2.28
+    except (OSError, AttributeError):
+        return None
+    function.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_uint,
+    ]
+    function.restype = ctypes.c_int
+    return function
+
+
+def _rename_noreplace(source: Path, destination: Path) -> None:
+    """Rename source to destination, failing if destination exists.
+
+    On Linux this is a single renameat2(RENAME_NOREPLACE) call, so the
+    kernel detects collisions atomically. Elsewhere, or on filesystems that
+    do not support the flag, it falls back to link + unlink (link refuses to
+    replace an existing file), and finally to an exists check + rename.
+
+    Raises:
+        FileExistsError: If destination already exists.
+    """
+    renameat2 = _renameat2()
+    if renameat2 is not None:
+        result = renameat2(
+            _AT_FDCWD,
+            os.fsencode(source),
+            _AT_FDCWD,
+            os.fsencode(destination),
+            _RENAME_NOREPLACE,
+        )
+        if result == 0:
+            return
+        err = ctypes.get_errno()
+        if err not in (errno.EINVAL, errno.ENOSYS):
+            raise OSError(err, os.strerror(err), str(source), None, str(destination))
+
+    try:
+        os.link(source, destination)
+    except FileExistsError:
+        raise
+    except OSError:
+        # No hard links here (e.g. FAT, some SMB mounts): not atomic.
+        if os.path.lexists(destination):
+            raise FileExistsError(
+                errno.EEXIST, os.strerror(errno.EEXIST), str(destination)
+            ) from None
+        os.rename(source, destination)
+        return
+    os.unlink(source)
+
+
+def _copy_noreplace(source: Path, destination: Path) -> None:
+    """Copy source to destination like shutil.copy2, failing if destination
+    exists. The destination is created with O_EXCL, so the check is atomic.
+    If the copy then fails, the partial destination is removed.
+
+    Raises:
+        FileExistsError: If destination already exists.
+    """
+    with open(source, "rb") as src:
+        dst = open(destination, "xb")
+        try:
+            with dst:
+                shutil.copyfileobj(src, dst)
+            shutil.copystat(source, destination)
+        except BaseException:
+            destination.unlink(missing_ok=True)
+            raise
+
+
+def _move_noreplace(source: Path, destination: Path) -> None:
+    """Move source to destination, across devices if needed, failing if
+    destination exists."""
+    try:
+        _rename_noreplace(source, destination)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        _copy_noreplace(source, destination)
+        os.unlink(source)
+
+
+class _Route(Enum):
+    """How OperationPlan.execute carries out an operation."""
+
+    DEFAULT = auto()  # FileOperation.execute
+    SAME_DEVICE_MOVE = auto()  # a plain rename(2)
+    CROSS_DEVICE_MOVE = auto()  # parallel copy, verify, then unlink
+    VERIFIED_COPY = auto()  # parallel copy, hashed on both sides
+
+
+def _route(
+    op: FileOperation, devices: dict[tuple[Path, Path], bool | None]
+) -> _Route:
+    """Pick the route for an operation, comparing st_dev of the source and
+    destination directories once per directory pair."""
+    if op.operation != OperationType.MOVE or op.destination is None:
+        return _Route.DEFAULT
+    key = (op.source.parent, op.destination.parent)
+    if key not in devices:
+        try:
+            devices[key] = os.stat(key[0]).st_dev == os.stat(key[1]).st_dev
+        except OSError:
+            devices[key] = None  # let shutil.move sort it out
+    same_device = devices[key]
+    if same_device is None:
+        return _Route.DEFAULT
+    return _Route.SAME_DEVICE_MOVE if same_device else _Route.CROSS_DEVICE_MOVE
+
+
+class ChecksumMismatchError(OSError):
+    """Raised when a copied file's checksum differs from its source's."""
+
+    def __init__(self, destination: Path, expected: str, actual: str):
+        super().__init__(errno.EIO, "Checksum mismatch", str(destination))
+        self.expected = expected
+        self.actual = actual
+
+
+def _hash_file(path: Path, algorithm: str) -> str:
+    """Hex digest of a file, hashed through mmap in a single update call.
+
+    hashlib releases the GIL while hashing large buffers, so several files
+    hash in parallel on a thread pool.
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                digest.update(data)
+    return digest.hexdigest()
+
+
+def _copy_hashing(
+    source: Path, destination: Path, noreplace: bool, algorithm: str
+) -> str:
+    """Copy source to destination like shutil.copy2, hashing each chunk on
+    its way through so the source is read only once. Returns the source's
+    hex digest."""
+    digest = hashlib.new(algorithm)
+    buffer = bytearray(_HASH_CHUNK_SIZE)
+    view = memoryview(buffer)
+    with open(source, "rb") as src, open(
+        destination, "xb" if noreplace else "wb"
+    ) as dst:
+        while size := src.readinto(buffer):
+            digest.update(view[:size])
+            dst.write(view[:size])
+    shutil.copystat(source, destination)
+    return digest.hexdigest()
+
+
+def _pooled_copy(
+    source: Path, destination: Path, noreplace: bool, verify: str | None
+) -> None:
+    """Copy stage of a cross-device move or verified copy, run on a worker.
+
+    With ``verify`` (a hashlib algorithm name) the source is hashed while it
+    streams and the destination is re-read and compared. A failed or
+    mismatched copy removes its destination, so the source stays the only
+    good copy.
+    """
+    try:
+        if verify is not None:
+            expected = _copy_hashing(source, destination, noreplace, verify)
+            actual = _hash_file(destination, verify)
+            if actual != expected:
+                raise ChecksumMismatchError(destination, expected, actual)
+        elif noreplace:
+            _copy_noreplace(source, destination)
+        else:
+            shutil.copy2(source, destination)
+    except FileExistsError:
+        raise  # not ours to remove
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+
+def _finish_move(source: Path, destination: Path) -> None:
+    """Delete stage of a cross-device move: unlink the source once the copy
+    is verified."""
+    if source.stat().st_size != destination.stat().st_size:
+        destination.unlink(missing_ok=True)
+        raise OSError(errno.EIO, "Copy verification failed", str(destination))
+    source.unlink()
+
+
+def _device_of(directory: Path) -> int | None:
+    """st_dev of directory, or of its nearest existing parent."""
+    for candidate in (directory, *directory.parents):
+        try:
+            return os.stat(candidate).st_dev
+        except OSError:
+            continue
+    return None
+
+
+def _limit(
+    throttle: Throttle | None,
+    op: FileOperation,
+    route: _Route | None,
+    volumes: dict[Path, int | None],
+) -> AbstractContextManager[None]:
+    """The throttle slot for one operation, or a no-op without a throttle.
+
+    Only copies and cross-device moves spend (and report) bytes; renames and
+    deletes are metadata operations and are limited by the ops rate alone.
+    The volume is that of the directory written to, looked up once per
+    directory.
+    """
+    if throttle is None:
+        return nullcontext()
+    volume = None
+    if throttle.limits_volumes:
+        directory = (op.destination or op.source).parent
+        if directory not in volumes:
+            volumes[directory] = _device_of(directory)
+        volume = volumes[directory]
+    nbytes = 0
+    if op.operation == OperationType.COPY or route == _Route.CROSS_DEVICE_MOVE:
+        try:
+            nbytes = op.source.stat().st_size
+        except OSError:
+            pass  # the operation itself will report the error
+    return throttle.limit(volume, nbytes)
+
+
+def _run_limited(
+    limit: AbstractContextManager[None], func: Callable[..., None], *args: Any
+) -> None:
+    with limit:
+        func(*args)
+
+
+_POOLED_ROUTES = frozenset({_Route.CROSS_DEVICE_MOVE, _Route.VERIFIED_COPY})
+
+
+def _routes(operations: tuple[FileOperation, ...], verify: str | None) -> list[_Route]:
+    """The route of each operation; with ``verify``, copies are pooled too."""
+    devices: dict[tuple[Path, Path], bool | None] = {}
+    routes = [_route(op, devices) for op in operations]
+    if verify is None:
+        return routes
+    return [
+        _Route.VERIFIED_COPY if op.operation == OperationType.COPY else route
+        for op, route in zip(operations, routes, strict=True)
+    ]
+
+
+def _dispatch(op: FileOperation, route: _Route, noreplace: bool, force: bool) -> None:
+    """Run an operation that is not pooled on the calling thread."""
+    if route != _Route.SAME_DEVICE_MOVE:
+        op.execute(noreplace=noreplace)
+        return
+    assert op.destination is not None
+    if noreplace:
+        _rename_noreplace(op.source, op.destination)
+    elif force:
+        os.replace(op.source, op.destination)
+    else:
+        os.rename(op.source, op.destination)
+
+
+class _Execution:
+    """The options of one _execute_operations call and what it has done."""
+
+    def __init__(
+        self,
+        noreplace: bool,
+        throttle: Throttle | None,
+        verify: str | None,
+        force: bool,
+    ):
+        self.noreplace = noreplace
+        self.throttle = throttle
+        self.verify = verify
+        self.force = force
+        self.volumes: dict[Path, int | None] = {}
+        self.executed: list[FileOperation] = []
+        self.failed: list[tuple[FileOperation, Exception]] = []
+
+    def run(self, op: FileOperation, route: _Route) -> None:
+        """Run an operation on this thread and record the outcome."""
+        try:
+            with _limit(self.throttle, op, route, self.volumes):
+                _dispatch(op, route, self.noreplace, self.force)
+            self.executed.append(op)
+        except Exception as e:
+            self.failed.append((op, e))
+
+    def submit(self, pool: Executor, op: FileOperation, route: _Route) -> Future:
+        """Start the pooled copy of a cross-device move or verified copy."""
+        return pool.submit(
+            _run_limited,
+            _limit(self.throttle, op, route, self.volumes),
+            _pooled_copy,
+            op.source,
+            op.destination,
+            self.noreplace,
+            self.verify,
+        )
+
+    def collect(self, future: Future, op: FileOperation, route: _Route) -> None:
+        """Record a finished pooled copy, unlinking a moved file's source."""
+        assert op.destination is not None
+        try:
+            future.result()
+            if route == _Route.CROSS_DEVICE_MOVE:
+                _finish_move(op.source, op.destination)
+            self.executed.append(op)
+        except Exception as e:
+            self.failed.append((op, e))
+
+
+def _execute_operations(
+    operations: tuple[FileOperation, ...],
+    noreplace: bool,
+    workers: int,
+    throttle: Throttle | None = None,
+    verify: str | None = None,
+    force: bool = False,
+) -> tuple[list[FileOperation], list[tuple[FileOperation, Exception]]]:
+    """Run operations, returning (executed, failed).
+
+    Operations run in plan order, except that cross-device moves (and, with
+    ``verify``, copies) are handed to a pool of ``workers`` copy threads.
+    Each finished move is verified and its source unlinked on this thread,
+    so copying and deleting overlap. Operations that touch a path still
+    being copied wait for that copy. With a throttle, every operation (and
+    every pooled copy) first takes a slot from it. With ``force``, a move
+    within a device replaces an existing destination, which a plain rename
+    refuses to do on Windows.
+    """
+    routes = _routes(operations, verify)
+    execution = _Execution(noreplace, throttle, verify, force)
+    if _POOLED_ROUTES.isdisjoint(routes):
+        for op, route in zip(operations, routes, strict=True):
+            execution.run(op, route)
+    else:
+        _execute_pipelined(operations, routes, workers, execution)
+    return execution.executed, execution.failed
+
+
+def _execute_pipelined(
+    operations: tuple[FileOperation, ...],
+    routes: list[_Route],
+    workers: int,
+    execution: _Execution,
+) -> None:
+    """Run operations as their dependencies finish, copying in a pool."""
+    ready = _Ready(operations)
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="pysequitur-copy"
+    ) as pool:
+        copying: dict[Future, int] = {}
+        while ready.queue or copying:
+            while ready.queue:
+                index = ready.queue.popleft()
+                if routes[index] in _POOLED_ROUTES:
+                    future = execution.submit(pool, operations[index], routes[index])
+                    copying[future] = index
+                else:
+                    execution.run(operations[index], routes[index])
+                    ready.release(index)
+            if not copying:
+                continue
+            done, _ = wait(copying, return_when=FIRST_COMPLETED)
+            for future in sorted(done, key=copying.__getitem__):
+                index = copying.pop(future)
+                execution.collect(future, operations[index], routes[index])
+                ready.release(index)
+
+
+def _future_error(future: asyncio.Future) -> Exception | None:
+    """The exception a finished future failed with, if any.
+
+    Only Exceptions are reported per operation; anything else (such as
+    KeyboardInterrupt) is re-raised.
+    """
+    error = future.exception()
+    if error is None or isinstance(error, Exception):
+        return error
+    raise error
+
+
+_DeleteBatch = tuple[
+    list["FileOperation"],
+    list[tuple["FileOperation", Exception]],
+    Path | None,
+    Path | None,
+]
+
+
+def _prune(directory: Path) -> Path | None:
+    """Remove directory if it is empty, returning it if it was removed."""
+    try:
+        os.rmdir(directory)
+    except OSError:
+        return None
+    return directory
+
+
+def _unlink_batch(ops: list[FileOperation], prune_empty: bool) -> _DeleteBatch:
+    """Unlink the files of one directory, then optionally prune it.
+
+    Returns (executed, failed, pruned directory or None, None).
+    """
+    executed: list[FileOperation] = []
+    failed: list[tuple[FileOperation, Exception]] = []
+    for op in ops:
+        try:
+            os.unlink(op.source)
+            executed.append(op)
+        except OSError as e:
+            failed.append((op, e))
+    pruned = _prune(ops[0].source.parent) if prune_empty and not failed else None
+    return executed, failed, pruned, None
+
+
+def _stage_batch(
+    ops: list[FileOperation],
+    staging: Path,
+    trash_device: int,
+    prune_empty: bool,
+) -> _DeleteBatch:
+    """Move the files of one directory into ``staging`` inside the trash.
+
+    If the directory holds nothing but these files and may be pruned, the
+    directory itself is renamed into the trash: one rename however many
+    frames it holds. A file that appears between listing and renaming is
+    detected and the directory is put back. Directories on another device
+    than the trash are unlinked in place instead.
+
+    If the directory cannot be put back, everything it held (including
+    files that were never to be deleted) is left in ``staging``, which is
+    returned as the fourth element so the batch is not purged. Every
+    operation fails with an error naming ``staging``.
+
+    Returns (executed, failed, pruned directory or None, stranded staging
+    directory or None).
+    """
+    directory = ops[0].source.parent
+    if _device_of(directory) != trash_device:
+        return _unlink_batch(ops, prune_empty)
+    if prune_empty:
+        staged = _stage_directory(ops, staging)
+        if staged is not None:
+            return staged
+    return _stage_files(ops, staging, prune_empty)
+
+
+def _stage_directory(ops: list[FileOperation], staging: Path) -> _DeleteBatch | None:
+    """Rename the directory of ops to ``staging`` if it holds only their files.
+
+    Returns None, with the directory where it was, if it holds anything
+    else or cannot be renamed; the files are then staged one by one.
+    """
+    directory = ops[0].source.parent
+    names = {op.source.name for op in ops}
+    try:
+        if set(os.listdir(directory)) != names:
+            return None
+        os.rename(directory, staging)
+    except OSError:
+        return None
+    try:
+        staged = set(os.listdir(staging))
+    except OSError:
+        staged = None
+    if staged == names:
+        return list(ops), [], directory, None
+    try:
+        os.rename(staging, directory)  # something new appeared
+    except OSError as e:
+        error = OSError(
+            e.errno,
+            f"could not restore {directory} from the trash; "
+            f"its files are in {staging}",
+            str(staging),
+        )
+        return [], [(op, error) for op in ops], None, staging
+    return None
+
+
+def _stage_files(
+    ops: list[FileOperation], staging: Path, prune_empty: bool
+) -> _DeleteBatch:
+    """Rename the files of ops into a new ``staging`` directory one by one."""
+    executed: list[FileOperation] = []
+    failed: list[tuple[FileOperation, Exception]] = []
+    try:
+        os.mkdir(staging)
+    except OSError as e:
+        return [], [(op, e) for op in ops], None, None
+    for op in ops:
+        try:
+            os.rename(op.source, staging / op.source.name)
+            executed.append(op)
+        except OSError as e:
+            failed.append((op, e))
+    directory = ops[0].source.parent
+    pruned = _prune(directory) if prune_empty and not failed else None
+    return executed, failed, pruned, None
+
+
+def _purge(batch_dir: Path, stranded: list[Path]) -> None:
+    """Remove a trash batch, keeping any staging directory still in use."""
+    if not stranded:
+        shutil.rmtree(batch_dir)
+        return
+    for staging in batch_dir.iterdir():
+        if staging not in stranded:
+            shutil.rmtree(staging)
+
+
+@dataclass(frozen=True)
+class _Content:
+    """What a path holds at the end of a plan.
+
+    ``origin`` is the path whose original file this content came from;
+    ``original`` is False for a copy of it, and ``moved`` records whether a
+    MOVE (rather than only RENAMEs) carried the original file there.
+    """
+
+    origin: str
+    original: bool = True
+    moved: bool = False
+
+
+@dataclass
+class _Layout:
+    """The net effect of a plan: the final content of every path it touches.
+
+    ``finals`` maps each path to its final content, or None if it ends up
+    absent; ``origins`` maps each path whose original file the plan reads
+    to the index of the first operation that reads it.
+    """
+
+    finals: dict[str, _Content | None] = dataclasses.field(default_factory=dict)
+    origins: dict[str, int] = dataclasses.field(default_factory=dict)
+    paths: dict[str, Path] = dataclasses.field(default_factory=dict)
+
+    def read(self, path: Path, index: int) -> _Content | None:
+        """The current content of path, registering it as an origin if unseen."""
+        key = str(path)
+        if key not in self.finals:
+            self.finals[key] = _Content(key)
+            self.origins[key] = index
+            self.paths[key] = path
+        return self.finals[key]
+
+    def write(self, path: Path, content: _Content | None) -> None:
+        self.finals[str(path)] = content
+        self.paths.setdefault(str(path), path)
+
+
+def _simulate(operations: tuple[FileOperation, ...]) -> _Layout | None:
+    """Follow every file's content through the plan.
+
+    Returns None if the plan reads a path it has already removed or copies
+    a file onto itself; such plans fail part-way and are left as they are.
+    """
+    layout = _Layout()
+    for index, op in enumerate(operations):
+        content = layout.read(op.source, index)
+        if content is None:
+            return None
+        if op.operation == OperationType.DELETE:
+            layout.write(op.source, None)
+            continue
+        if op.destination is None:
+            return None
+        if str(op.destination) == str(op.source):
+            if op.operation == OperationType.COPY:
+                return None
+            continue  # renaming a file onto itself leaves it alone
+        if op.operation == OperationType.COPY:
+            layout.write(op.destination, _Content(content.origin, original=False))
+        elif op.operation in (OperationType.RENAME, OperationType.MOVE):
+            moved = content.moved or op.operation == OperationType.MOVE
+            layout.write(op.source, None)
+            layout.write(op.destination, dataclasses.replace(content, moved=moved))
+        else:
+            raise ValueError(f"Unknown operation: {op.operation}")
+    return layout
+
+
+def _emit(layout: _Layout) -> tuple[list[FileOperation], list[int]]:
+    """One operation per final path, taking it straight from its origin.
+
+    Each origin's file is copied to every path that ends up with a copy of
+    it, then renamed or moved to the path that ends up with the file itself,
+    or deleted if the plan removes it. Returns the operations with, for
+    each, the index of the plan operation that first read its origin.
+    """
+    targets: dict[str, list[str]] = defaultdict(list)
+    for key, content in layout.finals.items():
+        if content is not None:
+            targets[content.origin].append(key)
+
+    operations: list[FileOperation] = []
+    order: list[int] = []
+    for origin, first_index in sorted(layout.origins.items(), key=lambda o: o[1]):
+        source = layout.paths[origin]
+        kept = None
+        for key in targets[origin]:
+            content = layout.finals[key]
+            assert content is not None
+            if key == origin:
+                continue  # the origin path still holds its content
+            if content.original and origin not in targets[origin]:
+                kept = (key, content)
+                continue
+            operations.append(
+                FileOperation(OperationType.COPY, source, layout.paths[key])
+            )
+            order.append(first_index)
+        if kept is not None:
+            key, content = kept
+            kind = OperationType.MOVE if content.moved else OperationType.RENAME
+            operations.append(FileOperation(kind, source, layout.paths[key]))
+            order.append(first_index)
+        elif layout.finals[origin] is None:
+            operations.append(FileOperation(OperationType.DELETE, source, None))
+            order.append(first_index)
+    return operations, order
+
+
+def _dependencies(operations: list[FileOperation]) -> list[set[int]]:
+    """For each operation, the operations that must run after it.
+
+    A path is read before it is written, copies of a file run before the
+    file is renamed or deleted, and writes to one path keep their order.
+    """
+    readers: dict[str, list[int]] = defaultdict(list)
+    writers: dict[str, list[int]] = defaultdict(list)
+    for i, op in enumerate(operations):
+        readers[str(op.source)].append(i)
+        if op.destination is not None:
+            writers[str(op.destination)].append(i)
+
+    successors: list[set[int]] = [set() for _ in operations]
+    for key, reading in readers.items():
+        for r in reading:
+            successors[r].update(w for w in writers.get(key, ()) if w != r)
+        copies = [r for r in reading if operations[r].operation == OperationType.COPY]
+        removers = [r for r in reading if operations[r].operation != OperationType.COPY]
+        for c in copies:
+            successors[c].update(removers)
+    for writing in writers.values():
+        for earlier, later in pairwise(writing):
+            successors[earlier].add(later)
+    return successors
+
+
+def _order_composed(
+    operations: list[FileOperation], order: list[int]
+) -> list[FileOperation] | None:
+    """Order composed operations so no file is overwritten before it is read.
+
+    Within the constraints of _dependencies, operations keep their ``order``
+    key. Returns None on a cycle (e.g. a swap), which cannot be expressed
+    without an intermediate name.
+    """
+    successors = _dependencies(operations)
+    indegree = [0] * len(operations)
+    for targets in successors:
+        for t in targets:
+            indegree[t] += 1
+
+    ready = [(order[i], i) for i, d in enumerate(indegree) if d == 0]
+    heapq.heapify(ready)
+    ordered: list[FileOperation] = []
+    while ready:
+        _, i = heapq.heappop(ready)
+        ordered.append(operations[i])
+        for t in successors[i]:
+            indegree[t] -= 1
+            if indegree[t] == 0:
+                heapq.heappush(ready, (order[t], t))
+
+    if len(ordered) != len(operations):
+        return None
+    return ordered
+
+
 # =============================================================================
 # Operation Infrastructure
 # =============================================================================
@@ -70,22 +848,39 @@ class FileOperation:
         """Check if destination already exists."""
         return self.destination is not None and self.destination.exists()
 
-    def execute(self) -> None:
-        """Actually perform the operation on the filesystem."""
+    def execute(self, *, noreplace: bool = False) -> None:
+        """Actually perform the operation on the filesystem.
+
+        Args:
+            noreplace: If True, fail with FileExistsError rather than replace
+                an existing destination. The check is made atomically by the
+                filesystem (see OperationPlan.execute).
+        """
+        if self.operation == OperationType.DELETE:
+            self.source.unlink()
+            return
+        if self.destination is None:
+            name = self.operation.name.capitalize()
+            raise ValueError(f"{name} requires destination")
+        self._transfer(self.destination, noreplace)
+
+    def _transfer(self, destination: Path, noreplace: bool) -> None:
+        """Rename, move or copy the source to destination."""
         if self.operation == OperationType.RENAME:
-            if self.destination is None:
-                raise ValueError("Rename requires destination")
-            self.source.rename(self.destination)
+            if noreplace:
+                _rename_noreplace(self.source, destination)
+            else:
+                self.source.rename(destination)
         elif self.operation == OperationType.MOVE:
-            if self.destination is None:
-                raise ValueError("Move requires destination")
-            shutil.move(str(self.source), str(self.destination))
+            if noreplace:
+                _move_noreplace(self.source, destination)
+            else:
+                shutil.move(str(self.source), str(destination))
         elif self.operation == OperationType.COPY:
-            if self.destination is None:
-                raise ValueError("Copy requires destination")
-            shutil.copy2(self.source, self.destination)
-        elif self.operation == OperationType.DELETE:
-            self.source.unlink()
+            if noreplace:
+                _copy_noreplace(self.source, destination)
+            else:
+                shutil.copy2(self.source, destination)
         else:
             raise ValueError(f"Unknown operation: {self.operation}")
 
@@ -102,6 +897,7 @@ class ExecutionResult:
 
     executed: tuple[FileOperation, ...]
     failed: tuple[tuple[FileOperation, Exception], ...] = ()  # noqa: E501
+    throughput: ThroughputReport | None = None
 
     @property
     def success(self) -> bool:
@@ -113,6 +909,32 @@ class ExecutionResult:
         """Returns total number of executed operations."""
         return len(self.executed)
 
+    @property
+    def collisions(self) -> list[FileOperation]:
+        """Failed operations whose destination already existed."""
+        return [op for op, e in self.failed if isinstance(e, FileExistsError)]
+
+    @property
+    def mismatches(self) -> list[tuple[FileOperation, ChecksumMismatchError]]:
+        """Copies and moves whose destination failed checksum verification."""
+        return [
+            (op, e) for op, e in self.failed if isinstance(e, ChecksumMismatchError)
+        ]
+
+
+@dataclass(frozen=True)
+class DeleteResult(ExecutionResult):
+    """Result of OperationPlan.bulk_delete.
+
+    Attributes:
+        pruned: Directories removed because the delete left them empty.
+        purge: With a trash directory, the background purge of the staged
+            files; None when files were unlinked in place.
+    """
+
+    pruned: tuple[Path, ...] = ()
+    purge: Future[None] | None = None
+
 
 @dataclass(frozen=True)
 class OperationPlan:
@@ -185,40 +1007,399 @@ class OperationPlan:
         """List of all destination paths in this plan."""
         return [op.destination for op in self.operations if op.destination is not None]
 
-    def execute(self, *, force: bool = False) -> ExecutionResult:
+    def execute(
+        self,
+        *,
+        force: bool = False,
+        noreplace: bool = False,
+        workers: int = DEFAULT_COPY_WORKERS,
+        rate: RatePolicy | None = None,
+        verify: str | None = None,
+    ) -> ExecutionResult:
         """
         Execute all operations in the plan.
 
         Args:
             force: If True, overwrite existing files. If False, raise on conflict.
+            noreplace: If True, skip the pre-flight conflict scan and instead
+                have every rename, move and copy refuse to replace an
+                existing destination at the moment it runs. On Linux renames
+                use renameat2(RENAME_NOREPLACE), so a file created by another
+                process between planning and execution is never overwritten.
+                Collisions are reported in ExecutionResult.collisions rather
+                than raised, and the rest of the plan still runs.
+            workers: Number of copy threads for moves between devices and
+                verified copies.
+            rate: Optional RatePolicy capping bytes/sec, operations/sec and
+                concurrent operations per destination volume, for running
+                large plans on shared storage without starving other users.
+                The measured rate is reported in ExecutionResult.throughput.
+            verify: Optional hashlib algorithm name (e.g. "blake2b" or
+                "sha256"). Every copy and cross-device move hashes the
+                source as it streams to the destination, then re-reads the
+                destination on the copy pool and compares. A mismatched
+                destination is removed (a moved source is kept) and listed
+                in ExecutionResult.mismatches.
+
+        Moves are routed by comparing the devices of the source and
+        destination directories (once per directory pair). A move within a
+        device is a single rename. A move across devices copies in a pool of
+        ``workers`` threads while this thread deletes each source as soon as
+        its copy has been verified, so moving a sequence between volumes
+        runs as fast as a parallel copy. Without ``verify`` a copy is only
+        checked by comparing its size with the source's; with it the copy
+        is hashed as described above. A source whose copy fails or does
+        not verify is left in place.
 
         Returns:
             ExecutionResult with success/failure details.
 
         Raises:
             FileExistsError: If conflicts exist and force=False.
+            ValueError: If both force and noreplace are set, or verify names
+                an unknown hash algorithm.
         """
-        if self.has_conflicts and not force:
-            conflict_paths = [op.destination for op in self.conflicts]
-            raise FileExistsError(f"Conflicts detected: {conflict_paths}")
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if verify is not None:
+            hashlib.new(verify)  # raises ValueError for unknown algorithms
+        self._check_conflicts(force, noreplace)
+
+        throttle = Throttle(rate) if rate is not None else None
+        executed, failed = _execute_operations(
+            self.operations, noreplace, workers, throttle, verify, force
+        )
 
+        return ExecutionResult(
+            executed=tuple(executed),
+            failed=tuple(failed),
+            throughput=throttle.report() if throttle is not None else None,
+        )
+
+    async def execute_async(
+        self,
+        *,
+        force: bool = False,
+        noreplace: bool = False,
+        concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+        rate: RatePolicy | None = None,
+        executor: Executor | None = None,
+    ) -> ExecutionResult:
+        """Execute the plan without blocking the event loop.
+
+        Operations run in a worker pool of ``concurrency`` threads, or in
+        ``executor`` if one is given. Operations that touch the same path
+        keep their plan order; see :meth:`iter_execute_async` for details.
+
+        Args:
+            force: If True, overwrite existing files. If False, raise on conflict.
+            noreplace: Refuse to replace existing destinations as they are
+                written instead of scanning beforehand (see execute).
+            concurrency: Maximum number of operations in flight at once.
+            rate: Optional RatePolicy shared by all workers (see execute).
+            executor: Optional executor to run operations in, e.g. one shared
+                with SequenceFactory.from_directory_async. It is not shut
+                down; at most ``concurrency`` operations are submitted to it
+                at a time.
+
+        Returns:
+            ExecutionResult with success/failure details. ``executed`` is in
+            completion order rather than plan order.
+
+        Raises:
+            FileExistsError: If conflicts exist and force=False.
+        """
+        throttle = Throttle(rate) if rate is not None else None
         executed: list[FileOperation] = []
         failed: list[tuple[FileOperation, Exception]] = []
 
+        async with aclosing(
+            self._iter_execute_async(
+                force, noreplace, concurrency, throttle, executor
+            )
+        ) as results:
+            async for op, error in results:
+                if error is None:
+                    executed.append(op)
+                else:
+                    failed.append((op, error))
+
+        return ExecutionResult(
+            executed=tuple(executed),
+            failed=tuple(failed),
+            throughput=throttle.report() if throttle is not None else None,
+        )
+
+    async def iter_execute_async(
+        self,
+        *,
+        force: bool = False,
+        noreplace: bool = False,
+        concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+        rate: RatePolicy | None = None,
+        executor: Executor | None = None,
+    ) -> AsyncGenerator[tuple[FileOperation, Exception | None], None]:
+        """Execute the plan, yielding ``(operation, error)`` as each one finishes.
+
+        ``error`` is None for operations that succeeded. Filesystem calls run
+        in a thread pool owned by this generator (or in ``executor``; see
+        execute_async), and only ``concurrency`` are submitted at a time, so
+        cancelling the consuming task (or closing the generator early) drops
+        every operation that has not started yet; operations already running
+        are allowed to finish.
+
+        Example:
+            async for op, error in plan.iter_execute_async(concurrency=16):
+                if error is not None:
+                    print(f"{op} failed: {error}")
+        """
+        throttle = Throttle(rate) if rate is not None else None
+        async with aclosing(
+            self._iter_execute_async(
+                force, noreplace, concurrency, throttle, executor
+            )
+        ) as results:
+            async for result in results:
+                yield result
+
+    async def _iter_execute_async(
+        self,
+        force: bool,
+        noreplace: bool,
+        concurrency: int,
+        throttle: Throttle | None,
+        executor: Executor | None = None,
+    ) -> AsyncGenerator[tuple[FileOperation, Exception | None], None]:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if force and noreplace:
+            raise ValueError("force and noreplace are mutually exclusive")
+
+        owned = executor is None
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="pysequitur"
+            )
+        in_flight: dict[asyncio.Future, int] = {}
+        try:
+            if not force and not noreplace:
+                await asyncio.get_running_loop().run_in_executor(
+                    executor, self._check_conflicts, force
+                )
+            async with aclosing(
+                self._run_async(noreplace, concurrency, throttle, executor, in_flight)
+            ) as results:
+                async for result in results:
+                    yield result
+        finally:
+            for future in in_flight:
+                future.cancel()
+            if owned:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run_async(
+        self,
+        noreplace: bool,
+        concurrency: int,
+        throttle: Throttle | None,
+        executor: Executor,
+        in_flight: dict[asyncio.Future, int],
+    ) -> AsyncGenerator[tuple[FileOperation, Exception | None], None]:
+        """Submit ready operations to executor, yielding them as they finish.
+
+        ``in_flight`` is owned by the caller, which cancels whatever is left
+        in it when the generator is closed.
+        """
+        loop = asyncio.get_running_loop()
+        operations = self.operations
+        # Only `concurrency` operations are handed to the pool at a time,
+        # so cancellation never leaves a long queue of work behind.
+        ready = _Ready(operations)
+        devices: dict[tuple[Path, Path], bool | None] = {}
+        volumes: dict[Path, int | None] = {}
+
+        def run(op: FileOperation) -> None:
+            route = _route(op, devices) if throttle is not None else None
+            with _limit(throttle, op, route, volumes):
+                op.execute(noreplace=noreplace)
+
+        def fill() -> None:
+            while ready.queue and len(in_flight) < concurrency:
+                index = ready.queue.popleft()
+                future = loop.run_in_executor(executor, run, operations[index])
+                in_flight[future] = index
+
+        fill()
+        while in_flight:
+            done, _ = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            finished = sorted(
+                ((in_flight.pop(f), _future_error(f)) for f in done),
+                key=lambda result: result[0],
+            )
+            # Release dependents before yielding so the pool stays busy
+            # while the consumer handles these results.
+            for index, _error in finished:
+                ready.release(index)
+            fill()
+            for index, error in finished:
+                yield operations[index], error
+
+    def bulk_delete(
+        self,
+        *,
+        workers: int = DEFAULT_DELETE_WORKERS,
+        prune_empty: bool = False,
+        trash: Path | None = None,
+    ) -> DeleteResult:
+        """Run a plan of DELETE operations in bulk.
+
+        Operations are batched by directory and the batches run on a pool of
+        ``workers`` threads, which keeps many unlinks in flight on network
+        storage where each one is a round trip.
+
+        Args:
+            workers: Number of directories processed at once.
+            prune_empty: Remove each directory the delete leaves empty.
+                Parent directories are never removed.
+            trash: Optional staging directory on the same device as the
+                files. Files are renamed into a fresh batch directory inside
+                it, and a directory holding only doomed files (with
+                prune_empty) is renamed in a single call. The batch is then
+                purged in the background; see DeleteResult.purge.
+                Directories on another device are unlinked in place. A
+                directory that was renamed into the trash but could not be
+                put back is never purged: its operations fail with an error
+                naming the staging directory that holds its files.
+
+        Returns:
+            DeleteResult with success/failure details, the pruned
+            directories and the background purge, if any.
+
+        Raises:
+            ValueError: If the plan contains anything other than deletes.
+
+        Example:
+            result = sequence.delete().bulk_delete(prune_empty=True)
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        if any(op.operation != OperationType.DELETE for op in self.operations):
+            raise ValueError("bulk_delete only runs DELETE operations")
+
+        batches: dict[Path, list[FileOperation]] = defaultdict(list)
         for op in self.operations:
-            try:
-                op.execute()
-                executed.append(op)
-            except Exception as e:
-                failed.append((op, e))
+            batches[op.source.parent].append(op)
+
+        batch_dir = None
+        if trash is not None:
+            trash.mkdir(parents=True, exist_ok=True)
+            batch_dir = Path(tempfile.mkdtemp(prefix="pysequitur-", dir=trash))
+            trash_device = os.stat(batch_dir).st_dev
+
+        executed: list[FileOperation] = []
+        failed: list[tuple[FileOperation, Exception]] = []
+        pruned: list[Path] = []
+        stranded: list[Path] = []
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="pysequitur-delete"
+        ) as pool:
+            if batch_dir is None:
+                futures = [
+                    pool.submit(_unlink_batch, ops, prune_empty)
+                    for ops in batches.values()
+                ]
+            else:
+                futures = [
+                    pool.submit(
+                        _stage_batch,
+                        ops,
+                        batch_dir / str(i),
+                        trash_device,
+                        prune_empty,
+                    )
+                    for i, ops in enumerate(batches.values())
+                ]
+            for future in futures:
+                batch_executed, batch_failed, directory, staging = future.result()
+                executed.extend(batch_executed)
+                failed.extend(batch_failed)
+                if directory is not None:
+                    pruned.append(directory)
+                if staging is not None:
+                    stranded.append(staging)
+
+        purge = None
+        if batch_dir is not None:
+            purger = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="pysequitur-purge"
+            )
+            purge = purger.submit(_purge, batch_dir, stranded)
+            purger.shutdown(wait=False)
+
+        return DeleteResult(
+            executed=tuple(executed),
+            failed=tuple(failed),
+            pruned=tuple(pruned),
+            purge=purge,
+        )
 
-        return ExecutionResult(executed=tuple(executed), failed=tuple(failed))
+    def optimize(self) -> OperationPlan:
+        """Collapse each file's chain of operations into a single operation.
+
+        A builder chain such as ``rename -> offset_frames -> move`` produces
+        one operation per step per frame; the optimised plan instead takes
+        every file straight from its original path to its final one:
+
+          * RENAME/MOVE chains become one RENAME, or one MOVE if any step
+            was a move.
+          * A COPY followed by renames/moves of the copy becomes one COPY
+            to the final name.
+          * A rename/move followed by DELETE becomes a DELETE of the
+            original; a COPY followed by DELETE disappears.
+          * Chains that end where they started are dropped.
+
+        The plan is composed by following each file's content to the paths
+        that hold it at the end, so writing a file back onto a path it has
+        left, or deleting it later, is kept. Paths that are only passed
+        through are never touched, so an unrelated file at an intermediate
+        name survives.
+
+        Operations are ordered so that a path is always read before it is
+        overwritten. If the plan cannot be composed safely (e.g. it swaps
+        two names via a temporary one, or reads a file it already removed),
+        it is returned unchanged.
+
+        Returns:
+            A new, equivalent OperationPlan.
+        """
+        layout = _simulate(self.operations)
+        ordered = _order_composed(*_emit(layout)) if layout is not None else None
+        if ordered is None:
+            logger.debug("Plan cannot be composed, leaving it unoptimised")
+            return self
+        return OperationPlan(operations=tuple(ordered))
 
     @classmethod
     def empty(cls) -> OperationPlan:
         """Return an empty plan (no-op)."""
         return cls(operations=())
 
+    def _check_conflicts(self, force: bool, noreplace: bool = False) -> None:
+        """Raise FileExistsError if the plan has conflicts and force is False.
+
+        With noreplace the scan is skipped: collisions are caught as each
+        operation runs.
+        """
+        if force and noreplace:
+            raise ValueError("force and noreplace are mutually exclusive")
+        if noreplace:
+            return
+        if not force and self.has_conflicts:
+            conflict_paths = [op.destination for op in self.conflicts]
+            raise FileExistsError(f"Conflicts detected: {conflict_paths}")
+
     def __add__(self, other: OperationPlan) -> OperationPlan:
         """Combine two plans into one."""
         return OperationPlan(operations=self.operations + other.operations)
@@ -1057,6 +2238,24 @@ class FileSequence:
         else:
             return SequenceExistence.PARTIAL
 
+    def disk_usage(self, workers: int = DEFAULT_STAT_WORKERS) -> int:
+        """Returns the total size in bytes of the sequence's files.
+
+        Files are statted on up to ``workers`` threads, which keeps many
+        requests in flight on network filesystems. Missing files count as
+        zero. A crawl with ``sizes=True`` already has these sizes (see
+        crawl.Results.sequence_bytes) without a second pass.
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        paths = [item.absolute_path for item in self.items]
+        if workers == 1 or len(paths) < 2:
+            return sum(map(_file_size, paths))
+        with ThreadPoolExecutor(
+            max_workers=min(workers, len(paths)), thread_name_prefix="pysequitur-stat"
+        ) as pool:
+            return sum(pool.map(_file_size, paths))
+
     @property
     def problems(self) -> Problems:
         """Returns a flag containing all detected problems."""
@@ -1337,7 +2536,8 @@ class FileSequence:
 
     def _check_padding(self) -> bool:
         """Checks that all items have the same padding."""
-        if not all(item.padding == self.padding for item in self.items):
+        padding = self.padding
+        if not all(item.padding == padding for item in self.items):
             logger.debug("Inconsistent padding in sequence")
             return False
         return True
@@ -1841,6 +3041,25 @@ class SequenceFactory:
     def from_directory(directory: Path, min_frames: int = 2) -> list[FileSequence]:
         return SequenceParser.from_directory(directory, min_frames).sequences
 
+    @staticmethod
+    async def from_directory_async(
+        directory: Path, min_frames: int = 2, *, executor: Executor | None = None
+    ) -> list[FileSequence]:
+        """Like from_directory, but lists and parses in a worker thread.
+
+        Args:
+            directory: Directory to list.
+            min_frames: Minimum number of frames for a sequence.
+            executor: Optional executor to run in, e.g. one shared with
+                OperationPlan.execute_async so discovery and execution are
+                bounded by the same pool. The event loop's default executor
+                is used otherwise.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            executor, SequenceFactory.from_directory, directory, min_frames
+        )
+
     @staticmethod
     def from_filenames(
         filenames: list[str], min_frames: int = 2, directory: Path | None = None
@@ -1910,68 +3129,186 @@ class SequenceFactory:
         return SequenceFactory.from_sequence_string_absolute(node["file"].getValue())
 
 
+@dataclass(frozen=True)
+class _Transform:
+    """Symbolic description of where each item of a sequence ends up.
+
+    None fields keep each item's own value. ``padding`` is the minimum
+    padding of the new frame strings; None keeps the original frame strings
+    (only possible while ``offset`` is still 0).
+    """
+
+    prefix: str | None = None
+    delimiter: str | None = None
+    suffix: str | None = None
+    extension: str | None = None
+    directory: Path | None = None
+    offset: int = 0
+    padding: int | None = None
+
+    def with_components(self, components: Components) -> _Transform:
+        """Layer a rename on top of this transform (frame_number is ignored)."""
+        return dataclasses.replace(
+            self,
+            prefix=self.prefix if components.prefix is None else components.prefix,
+            delimiter=(
+                self.delimiter
+                if components.delimiter is None
+                else components.delimiter
+            ),
+            suffix=self.suffix if components.suffix is None else components.suffix,
+            extension=(
+                self.extension
+                if components.extension is None
+                else components.extension
+            ),
+            padding=self.padding if components.padding is None else components.padding,
+        )
+
+    def frame_string(self, item: Item) -> str:
+        """The item's frame string after this transform."""
+        if self.padding is None:
+            return item.frame_string
+        frame = item.frame_number + self.offset
+        return f"{frame:0{max(self.padding, len(str(frame)))}d}"
+
+    def apply(self, item: Item) -> Item:
+        """The item as it looks after this transform."""
+        return Item(
+            prefix=item.prefix if self.prefix is None else self.prefix,
+            frame_string=self.frame_string(item),
+            extension=item.extension if self.extension is None else self.extension,
+            delimiter=item.delimiter if self.delimiter is None else self.delimiter,
+            suffix=item.suffix if self.suffix is None else self.suffix,
+            directory=item.directory if self.directory is None else self.directory,
+        )
+
+
 class SequenceBuilder:
     """
     A fluent wrapper for FileSequence that accumulates operations.
 
     Allows chaining multiple operations (rename -> move -> offset)
     into a single atomic Plan without executing them immediately.
+
+    Steps are recorded symbolically rather than run one by one, so a long
+    chain over a large sequence never allocates the intermediate sequences.
+    ``current_sequence`` and ``plan`` are computed on demand; ``build()``
+    and ``execute()`` produce the optimised plan, in which each file is
+    touched only once, directly from the recorded steps.
     """
 
     def __init__(self, sequence: FileSequence):
-        self._current_sequence = sequence
-        self._accumulated_plan = OperationPlan.empty()
+        self._origin = sequence
+        self._steps: list[tuple[str, tuple[Any, ...]]] = []
+        # One fork per copy: the originals, then each copy in turn. The last
+        # fork is the one subsequent steps act on. A fork's operation is
+        # None once it has been cancelled (a copy that was deleted).
+        self._forks: list[tuple[_Transform, OperationType | None]] = [
+            (_Transform(), OperationType.RENAME)
+        ]
+        self._frame_sorted = False
+        # Steps the symbolic model cannot express exactly (and anything after
+        # a delete) switch the builder to running the real FileSequence
+        # operations instead.
+        self._eager_sequence: FileSequence | None = None
 
     @property
     def current_sequence(self) -> FileSequence:
         """The state of the sequence as it would look after operations."""
-        return self._current_sequence
+        if self._eager_sequence is not None:
+            return self._eager_sequence
+        if not self._steps:
+            return self._origin
+        transform = self._forks[-1][0]
+        items = self._origin.items
+        if self._frame_sorted:
+            items = tuple(sorted(items, key=attrgetter("frame_number")))
+        return FileSequence(items=tuple(transform.apply(item) for item in items))
 
     @property
     def plan(self) -> OperationPlan:
-        """The total accumulated plan so far."""
-        return self._accumulated_plan
+        """The total accumulated plan so far, one operation per step per file.
+
+        This replays every recorded step; see build() for the optimised plan.
+        """
+        return OperationPlan(operations=tuple(self._replay()[1]))
 
     def rename(self, new_name: Components) -> SequenceBuilder:
-        """Plan a rename and update internal state."""
-        # We rely on your existing SequenceResult class for the logic
-        result = self._current_sequence.rename(new_name)
-        self._update_state(result)
+        """Plan a rename."""
+        if isinstance(new_name, str):
+            raise ValueError("new_name must be a Components object, not a string")
+        if not self._run_eagerly("rename", new_name):
+            transform, operation = self._forks[-1]
+            renamed = transform.with_components(new_name)
+            self._check(renamed)
+            self._steps.append(("rename", (new_name,)))
+            self._update(renamed, operation)
         return self
 
     def move(
         self, new_directory: Path, create_directory: bool = False
     ) -> SequenceBuilder:
-        """Plan a move and update internal state."""
-        result = self._current_sequence.move(new_directory, create_directory)
-        self._update_state(result)
+        """Plan a move."""
+        if not self._run_eagerly("move", new_directory, create_directory):
+            self._steps.append(("move", (new_directory, create_directory)))
+            self._move(new_directory, create_directory)
         return self
 
     def copy(self,
              new_name: Components | None = None,
              new_directory: Path | None = None,
              create_directory: bool = False) -> SequenceBuilder:
-        """Plan a copy and update internal state."""
-        result = self._current_sequence.copy(new_name, new_directory, create_directory)
-        self._update_state(result)
+        """Plan a copy; subsequent steps act on the copy."""
+        if not self._run_eagerly("copy", new_name, new_directory, create_directory):
+            self._copy(new_name, new_directory, create_directory)
         return self
 
     def offset_frames(self, offset: int, padding: int | None = None) -> SequenceBuilder:
-        """Plan a frame offset and update internal state."""
-        result = self._current_sequence.offset_frames(offset, padding)
-        self._update_state(result)
+        """Plan a frame offset."""
+        if self._run_eagerly("offset_frames", offset, padding):
+            return self
+        if offset == 0:
+            self._steps.append(("offset_frames", (offset, padding)))
+            return self
+
+        transform, operation = self._forks[-1]
+        if self._origin.first_frame + transform.offset + offset < 0:
+            raise ValueError("offset would yield negative frame numbers")
+        new_padding = self._current_padding() if padding is None else padding
+        last_frame = self._origin.last_frame + transform.offset + offset
+        new_padding = max(new_padding, len(str(last_frame)))
+
+        self._frame_sorted = True
+        self._steps.append(("offset_frames", (offset, padding)))
+        self._update(
+            dataclasses.replace(
+                transform, offset=transform.offset + offset, padding=new_padding
+            ),
+            operation,
+        )
         return self
 
     def with_padding(self, padding: int) -> SequenceBuilder:
-        """Plan a padding change and update internal state."""
-        result = self._current_sequence.with_padding(padding)
-        self._update_state(result)
+        """Plan a padding change."""
+        if not self._run_eagerly("with_padding", padding):
+            transform, operation = self._forks[-1]
+            last_frame = self._origin.last_frame + transform.offset
+            self._steps.append(("with_padding", (padding,)))
+            self._update(
+                dataclasses.replace(
+                    transform, padding=max(padding, len(str(last_frame)))
+                ),
+                operation,
+            )
         return self
 
     def folderize(self, folder_name: str) -> SequenceBuilder:
         """Plan moving items into a subfolder."""
-        result = self._current_sequence.folderize(folder_name)
-        self._update_state(result)
+        if not self._run_eagerly("folderize", folder_name):
+            new_directory = self._current_directory() / folder_name
+            self._steps.append(("folderize", (folder_name,)))
+            self._move(new_directory, True)
         return self
 
     def delete(self) -> OperationPlan:
@@ -1983,20 +3320,230 @@ class SequenceBuilder:
         The delete is recorded on the builder, so build()/execute() include
         it. Returns the accumulated plan plus the delete operation.
         """
-        delete_plan = self._current_sequence.delete()
-        self._accumulated_plan = self._accumulated_plan + delete_plan
-        return self._accumulated_plan
+        if not self._run_eagerly("delete"):
+            transform, operation = self._forks[-1]
+            if operation == OperationType.COPY:
+                self._forks[-1] = (transform, None)  # copied, then deleted
+            else:
+                self._forks[-1] = (transform, OperationType.DELETE)
+            self._steps.append(("delete", ()))
+        return self.plan
 
     def build(self) -> SequenceResult:
-        """Return the final proposed state and the total plan."""
-        return SequenceResult(self._current_sequence, self._accumulated_plan)
+        """Return the final proposed state and the optimised total plan.
+
+        The plan takes each file straight from its original path to its
+        final one, exactly as OperationPlan.optimize() would.
+        """
+        if self._eager_sequence is None:
+            plan = self._composed_plan()
+            if plan is not None:
+                return SequenceResult(self.current_sequence, plan)
+        sequence, operations = self._replay()
+        return SequenceResult(sequence, OperationPlan(tuple(operations)).optimize())
 
     def execute(self, force: bool = False) -> ExecutionResult:
-        """Execute all accumulated operations at once."""
-        return self._accumulated_plan.execute(force=force)
-
-    # --- Helper ---
-    def _update_state(self, result: SequenceResult) -> None:
-        """Update the internal sequence and add to the plan."""
-        self._current_sequence = result.sequence
-        self._accumulated_plan += result.plan
+        """Optimise and execute all accumulated operations at once."""
+        return self.build().plan.execute(force=force)
+
+    # --- Helpers ---
+    def _run_eagerly(self, name: str, *args: Any) -> bool:
+        """Run and record a step with the real FileSequence operation, if the
+        builder is in eager mode. Returns True if it did.
+
+        Steps after a delete act on files that no longer exist, so a delete
+        switches the builder to eager mode for anything that follows it.
+        """
+        if self._eager_sequence is None and self._forks[-1][1] not in (
+            OperationType.DELETE,
+            None,
+        ):
+            return False
+        if self._eager_sequence is None:
+            self._switch_to_eager()
+        assert self._eager_sequence is not None
+        if name != "delete":
+            result = getattr(self._eager_sequence, name)(*args)
+            self._eager_sequence = result.sequence
+        self._steps.append((name, args))
+        return True
+
+    def _update(self, transform: _Transform, operation: OperationType | None) -> None:
+        """Replace the last fork, watching for collisions with earlier forks.
+
+        If the last fork passes through a name an earlier copy still holds,
+        the real operations overwrite that copy along the way; composing the
+        chain would hide that, so the builder switches to eager mode.
+        """
+        self._forks[-1] = (transform, operation)
+        names = self._names(transform) if len(self._forks) > 1 else None
+        for frozen, frozen_operation in self._forks[:-1]:
+            if frozen_operation in (None, OperationType.DELETE):
+                continue
+            if self._names(frozen) != names:
+                continue
+            frames = {frozen.frame_string(item) for item in self._origin.items}
+            if any(transform.frame_string(i) in frames for i in self._origin.items):
+                self._switch_to_eager()
+                return
+
+    def _switch_to_eager(self) -> None:
+        self._eager_sequence = self._replay()[0]
+
+    def _replay(self) -> tuple[FileSequence, list[FileOperation]]:
+        """Run every recorded step through the real FileSequence operations."""
+        sequence = self._origin
+        operations: list[FileOperation] = []
+        for name, args in self._steps:
+            if name == "delete":
+                operations.extend(sequence.delete().operations)
+                continue
+            result = getattr(sequence, name)(*args)
+            sequence = result.sequence
+            operations.extend(result.plan.operations)
+        return sequence, operations
+
+    def _move(self, new_directory: Path, create_directory: bool) -> None:
+        if new_directory == self._current_directory():
+            return
+        if create_directory and not new_directory.exists():
+            new_directory.mkdir(parents=True, exist_ok=True)
+        transform, operation = self._forks[-1]
+        if operation == OperationType.RENAME:
+            operation = OperationType.MOVE
+        self._update(dataclasses.replace(transform, directory=new_directory), operation)
+
+    def _copy(
+        self,
+        new_name: Components | None,
+        new_directory: Path | None,
+        create_directory: bool,
+    ) -> None:
+        """Record a copy as a new fork, checking it as FileSequence.copy would."""
+        transform = self._forks[-1][0]
+        for prop in ("prefix", "extension", "delimiter", "suffix", "directory"):
+            if getattr(transform, prop) is None:
+                self._origin._validate_property_consistency(prop_name=prop)
+        if isinstance(new_name, str):
+            raise TypeError("new_name must be a Components object, not a string")
+        if isinstance(new_directory, str):
+            raise TypeError("new_directory must be a Path object, not a string")
+
+        copied = transform
+        if new_name is not None:
+            copied = copied.with_components(new_name)
+        if new_directory is not None:
+            copied = dataclasses.replace(copied, directory=new_directory)
+        self._check(copied)
+        if new_directory is not None and create_directory:
+            new_directory.mkdir(parents=True, exist_ok=True)
+
+        self._steps.append(("copy", (new_name, new_directory, create_directory)))
+        placed = self._not_onto_itself(transform, copied)
+        if placed is None:
+            self._switch_to_eager()
+            return
+        self._forks.append((placed, OperationType.COPY))
+        self._update(placed, OperationType.COPY)
+
+    def _not_onto_itself(
+        self, transform: _Transform, copied: _Transform
+    ) -> _Transform | None:
+        """The copy's transform once files copied onto themselves are renamed.
+
+        Such files get a "_copy" prefix, as in Item.copy. Only some of them
+        doing so leaves a sequence with mixed prefixes, which the symbolic
+        model cannot describe; that returns None.
+        """
+        onto_itself = self._names(transform) == self._names(copied) and {
+            transform.frame_string(item) == copied.frame_string(item)
+            for item in self._origin.items
+        }
+        if onto_itself == {True}:
+            prefix = self._names(transform)[0]
+            return dataclasses.replace(copied, prefix=prefix + "_copy")
+        if onto_itself == {True, False}:
+            return None
+        return copied
+
+    def _check(self, transform: _Transform) -> None:
+        """Build one item of the new state, so a bad name (e.g. a suffix with
+        digits) is reported by the step that introduced it, as it is when
+        the steps run for real."""
+        if self._origin.items:
+            transform.apply(self._origin.items[0])
+
+    def _current_directory(self) -> Path:
+        directory = self._forks[-1][0].directory
+        return self._origin.directory if directory is None else directory
+
+    def _current_padding(self) -> int:
+        """FileSequence.padding of the current state, without building it."""
+        transform = self._forks[-1][0]
+        if transform.padding is None:
+            return self._origin.padding
+        last_frame = self._origin.last_frame + transform.offset
+        if transform.padding >= len(str(last_frame)):
+            return transform.padding  # every frame string is exactly this wide
+        items = self._origin.items
+        if self._frame_sorted:
+            items = tuple(sorted(items, key=attrgetter("frame_number")))
+        counts = Counter(len(transform.frame_string(item)) for item in items)
+        return counts.most_common(1)[0][0]
+
+    def _layout(self) -> _Layout | None:
+        """The final content of every path the forks touch.
+
+        The first fork carries the original files (or deletes them); every
+        other fork holds copies. Returns None if two forks end on the same
+        path, since the overwrite depends on the order the steps ran in.
+        """
+        layout = _Layout()
+        items = self._origin.items
+        for index, item in enumerate(items):
+            layout.read(item.absolute_path, index)
+            layout.write(item.absolute_path, None)
+
+        written: set[str] = set()
+        for transform, operation in self._forks:
+            if operation == OperationType.DELETE:
+                continue
+            for item in items:
+                target = transform.apply(item).absolute_path
+                if str(target) in written:
+                    return None
+                if operation is None:
+                    continue  # a copy that was deleted again
+                written.add(str(target))
+                content = _Content(
+                    str(item.absolute_path),
+                    original=operation != OperationType.COPY,
+                    moved=operation == OperationType.MOVE,
+                )
+                layout.write(target, content)
+        return layout
+
+    def _names(self, transform: _Transform) -> tuple[Any, ...]:
+        """The uniform (prefix, delimiter, suffix, extension, directory)."""
+        origin = self._origin
+        return (
+            origin.prefix if transform.prefix is None else transform.prefix,
+            origin.delimiter if transform.delimiter is None else transform.delimiter,
+            origin.suffix if transform.suffix is None else transform.suffix,
+            origin.extension if transform.extension is None else transform.extension,
+            origin.directory if transform.directory is None else transform.directory,
+        )
+
+    def _composed_plan(self) -> OperationPlan | None:
+        """One operation per final path, composed like OperationPlan.optimize.
+
+        Returns None if the forks cannot be composed directly or the
+        operations cannot be ordered without an intermediate name.
+        """
+        layout = self._layout()
+        if layout is None:
+            return None
+        ordered = _order_composed(*_emit(layout))
+        if ordered is None:
+            return None
+        return OperationPlan(operations=tuple(ordered))
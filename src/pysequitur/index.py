@@ -0,0 +1,436 @@
+# Copyright (c) 2024 Alex Harding (alexharding.ooo)
+# This file is part of PySequitur which is released under MIT license.
+# See file LICENSE for full license details.
+"""A persistent, queryable index of crawled sequences, stored in SQLite.
+
+A CrawlIndex holds what a crawl found: directories, sequences (as their
+components plus compact frame ranges), movies and rogues, optionally with
+sizes. Questions like "every sequence with prefix X", "every sequence with
+gaps" or "what is under shot 040" are then answered from indexed tables
+instead of by crawling again.
+
+Example:
+    with index.CrawlIndex(Path("/shows/abc/.sequitur.db")) as idx:
+        idx.scan(Path("/shows/abc"), workers=16)
+        for seq in idx.sequences(under=Path("/shows/abc/sh040")):
+            print(seq)
+        gappy = idx.count(problems=Problems.MISSING_FRAMES)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from itertools import pairwise
+from pathlib import Path
+from typing import Any
+
+from . import crawl
+from .file_sequence import FileSequence, Item, Problems
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    error TEXT,
+    scanned_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sequences (
+    id INTEGER PRIMARY KEY,
+    directory_id INTEGER NOT NULL,
+    prefix TEXT NOT NULL,
+    delimiter TEXT,
+    suffix TEXT,
+    extension TEXT NOT NULL,
+    padding INTEGER NOT NULL,
+    first_frame INTEGER NOT NULL,
+    last_frame INTEGER NOT NULL,
+    files INTEGER NOT NULL,
+    problems INTEGER NOT NULL,
+    bytes INTEGER,
+    -- Frame runs such as "1001-1100,1102", or a JSON list of frame strings
+    -- when the frame strings can't be rebuilt from the numbers and padding
+    frames TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sequences_directory ON sequences (directory_id);
+CREATE INDEX IF NOT EXISTS sequences_prefix ON sequences (prefix);
+CREATE INDEX IF NOT EXISTS sequences_extension
+    ON sequences (extension COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS sequences_problems ON sequences (problems);
+CREATE INDEX IF NOT EXISTS sequences_frames ON sequences (first_frame, last_frame);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    directory_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,  -- "movie" or "rogue"
+    name TEXT NOT NULL,
+    bytes INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_directory ON files (directory_id, kind);
+"""
+
+
+class CrawlIndex:
+    """Crawl results persisted in an indexed SQLite database.
+
+    Each directory's contents are replaced whenever its Results are added,
+    so re-indexing a subtree keeps the index current. Queries filter by
+    prefix, extension, directory subtree, frame range and Problems flags,
+    using indexes for each, and rebuild FileSequence objects lazily, one
+    row at a time.
+
+    Not thread-safe; use one CrawlIndex per thread. Writes are committed
+    by add(), scan() and remove().
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self) -> CrawlIndex:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
+
+    # -------------------------------------------------------------------------
+    # Writing
+    # -------------------------------------------------------------------------
+
+    def add(self, results: Iterable[crawl.Results], sizes: bool = False) -> int:
+        """Store (or replace) the contents of each crawled directory.
+
+        Args:
+            results: Results from crawl.iter_scan, traverse_nodes, etc.
+            sizes: Also record the size of every file. Sizes the crawl
+                gathered (``sizes=True``) are used as they are; otherwise
+                each file is statted.
+
+        Returns:
+            The number of directories stored.
+        """
+        return self._add(results, sizes, time.time_ns())
+
+    def scan(self, path: Path, sizes: bool = False, **crawl_options: Any) -> int:
+        """Crawl path and make the index match it.
+
+        Directories under path that the crawl no longer reaches (deleted,
+        pruned or beyond max_depth) are removed from the index.
+
+        Args:
+            path: Root directory to crawl.
+            sizes: Also record the size of every file, gathered by the
+                crawl as it lists each directory.
+            **crawl_options: Passed to crawl.iter_scan (workers, cache,
+                prune, ...).
+
+        Returns:
+            The number of directories stored.
+        """
+        scanned_ns = time.time_ns()
+        results = crawl.iter_scan(path, sizes=sizes, **crawl_options)
+        count = self._add(results, sizes, scanned_ns)
+        where, params = _subtree(Path(path))
+        self._delete(f"{where} AND scanned_ns < ?", [*params, scanned_ns])
+        self._db.commit()
+        return count
+
+    def remove(self, path: Path) -> None:
+        """Forget a directory and everything below it."""
+        where, params = _subtree(Path(path))
+        self._delete(where, params)
+        self._db.commit()
+
+    def _add(
+        self, results: Iterable[crawl.Results], sizes: bool, scanned_ns: int
+    ) -> int:
+        count = 0
+        db = self._db
+        for result in results:
+            directory = str(result.dir)
+            error = str(result.error) if result.error is not None else None
+            row = db.execute(
+                "SELECT id FROM directories WHERE path = ?", (directory,)
+            ).fetchone()
+            if row is None:
+                inserted = db.execute(
+                    "INSERT INTO directories (path, error, scanned_ns) "
+                    "VALUES (?, ?, ?)",
+                    (directory, error, scanned_ns),
+                ).lastrowid
+                assert inserted is not None  # always set by a successful INSERT
+                directory_id = inserted
+            else:
+                directory_id = row[0]
+                db.execute(
+                    "UPDATE directories SET error = ?, scanned_ns = ? WHERE id = ?",
+                    (error, scanned_ns, directory_id),
+                )
+                db.execute(
+                    "DELETE FROM sequences WHERE directory_id = ?", (directory_id,)
+                )
+                db.execute("DELETE FROM files WHERE directory_id = ?", (directory_id,))
+
+            db.executemany(
+                "INSERT INTO sequences (directory_id, prefix, delimiter, suffix, "
+                "extension, padding, first_frame, last_frame, files, problems, "
+                "bytes, frames) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    _sequence_row(directory_id, sequence, sizes, result)
+                    for sequence in result.sequences
+                ),
+            )
+            files = [("movie", path) for path in result.movs]
+            files += [("rogue", path) for path in result.rogues]
+            db.executemany(
+                "INSERT INTO files (directory_id, kind, name, bytes) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        directory_id,
+                        kind,
+                        path.name,
+                        _size(path, result) if sizes else None,
+                    )
+                    for kind, path in files
+                ],
+            )
+            count += 1
+        db.commit()
+        return count
+
+    def _delete(self, where: str, params: list[Any]) -> None:
+        ids = f"SELECT id FROM directories WHERE {where}"
+        self._db.execute(f"DELETE FROM sequences WHERE directory_id IN ({ids})", params)
+        self._db.execute(f"DELETE FROM files WHERE directory_id IN ({ids})", params)
+        self._db.execute(f"DELETE FROM directories WHERE {where}", params)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def sequences(
+        self,
+        prefix: str | None = None,
+        extension: str | None = None,
+        under: Path | None = None,
+        frames: tuple[int, int] | None = None,
+        problems: Problems | None = None,
+    ) -> Iterator[FileSequence]:
+        """Yield the indexed sequences matching every filter given.
+
+        Args:
+            prefix: Exact prefix, or a glob pattern if it contains * ? or [.
+            extension: Extension, case-insensitive.
+            under: Only sequences in this directory or below it.
+            frames: (first, last): only sequences whose frame range overlaps
+                this inclusive range.
+            problems: Only sequences with any of these Problems flags, or
+                with no problems for Problems.NONE.
+
+        Sequences are rebuilt as they are iterated, so stopping early costs
+        nothing for the rest of the matches.
+        """
+        where, params = _filters(prefix, extension, under, frames, problems)
+        cursor = self._db.execute(
+            "SELECT d.path, s.prefix, s.delimiter, s.suffix, s.extension, "
+            "s.padding, s.frames FROM sequences s "
+            f"JOIN directories d ON d.id = s.directory_id WHERE {where} "
+            "ORDER BY d.path, s.prefix",
+            params,
+        )
+        for path, prefix_, delimiter, suffix, extension_, padding, frames_ in cursor:
+            directory = Path(path)
+            items = (
+                Item(prefix_, frame, extension_, delimiter, suffix, directory)
+                for frame in _decode_frames(frames_, padding)
+            )
+            yield FileSequence(tuple(items))
+
+    def count(self, **filters: Any) -> int:
+        """Number of sequences matching the filters of sequences()."""
+        where, params = _filters(**filters)
+        return self._db.execute(
+            "SELECT COUNT(*) FROM sequences s "
+            f"JOIN directories d ON d.id = s.directory_id WHERE {where}",
+            params,
+        ).fetchone()[0]
+
+    def total_bytes(self, **filters: Any) -> int:
+        """Combined size of the sequences matching the filters of
+        sequences(); sequences indexed without sizes count as 0."""
+        where, params = _filters(**filters)
+        return self._db.execute(
+            "SELECT COALESCE(SUM(s.bytes), 0) FROM sequences s "
+            f"JOIN directories d ON d.id = s.directory_id WHERE {where}",
+            params,
+        ).fetchone()[0]
+
+    def directories(self, under: Path | None = None) -> Iterator[Path]:
+        """Indexed directories, in path order."""
+        where, params = _subtree(under) if under is not None else ("1", [])
+        cursor = self._db.execute(
+            f"SELECT path FROM directories WHERE {where} ORDER BY path", params
+        )
+        return (Path(path) for (path,) in cursor)
+
+    def errors(self, under: Path | None = None) -> Iterator[tuple[Path, str]]:
+        """(directory, error) for directories that could not be listed."""
+        where, params = _subtree(under) if under is not None else ("1", [])
+        cursor = self._db.execute(
+            "SELECT path, error FROM directories "
+            f"WHERE error IS NOT NULL AND {where} ORDER BY path",
+            params,
+        )
+        return ((Path(path), error) for path, error in cursor)
+
+    def movies(self, under: Path | None = None) -> Iterator[Path]:
+        """Indexed movie files."""
+        return self._files("movie", under)
+
+    def rogues(self, under: Path | None = None) -> Iterator[Path]:
+        """Indexed rogue files (sequence-like files that formed no sequence)."""
+        return self._files("rogue", under)
+
+    def _files(self, kind: str, under: Path | None) -> Iterator[Path]:
+        where, params = _subtree(under, "d.path") if under is not None else ("1", [])
+        cursor = self._db.execute(
+            "SELECT d.path, f.name FROM files f "
+            "JOIN directories d ON d.id = f.directory_id "
+            f"WHERE f.kind = ? AND {where} ORDER BY d.path, f.name",
+            [kind, *params],
+        )
+        return (Path(path) / name for path, name in cursor)
+
+
+def _subtree(path: Path, column: str = "path") -> tuple[str, list[Any]]:
+    """SQL matching path and everything below it, as an index range scan."""
+    root = str(path).rstrip(os.sep) or os.sep
+    below = root if root.endswith(os.sep) else root + os.sep
+    # Every path below root sorts between root + sep and root + (sep + 1)
+    after = below[:-1] + chr(ord(os.sep) + 1)
+    return (
+        f"({column} = ? OR ({column} >= ? AND {column} < ?))",
+        [root, below, after],
+    )
+
+
+def _filters(
+    prefix: str | None = None,
+    extension: str | None = None,
+    under: Path | None = None,
+    frames: tuple[int, int] | None = None,
+    problems: Problems | None = None,
+) -> tuple[str, list[Any]]:
+    clauses = ["1"]
+    params: list[Any] = []
+    if prefix is not None:
+        operator = "GLOB" if any(c in prefix for c in "*?[") else "="
+        clauses.append(f"s.prefix {operator} ?")
+        params.append(prefix)
+    if extension is not None:
+        clauses.append("s.extension = ? COLLATE NOCASE")
+        params.append(extension.lstrip("."))
+    if under is not None:
+        where, subtree_params = _subtree(under, "d.path")
+        clauses.append(where)
+        params += subtree_params
+    if frames is not None:
+        first, last = frames
+        clauses.append("s.first_frame <= ? AND s.last_frame >= ?")
+        params += [last, first]
+    if problems is not None:
+        # Expand "any of these bits" into the values having one, so the
+        # lookup can use the problems index
+        values = _problem_values(problems)
+        clauses.append(f"s.problems IN ({', '.join('?' * len(values))})")
+        params += values
+    return " AND ".join(clauses), params
+
+
+def _problem_values(problems: Problems) -> list[int]:
+    if problems == Problems.NONE:
+        return [0]
+    every = 0
+    for flag in Problems:
+        every |= flag.value
+    return [v for v in range(every + 1) if v & problems.value]
+
+
+def _size(path: Path, result: crawl.Results) -> int | None:
+    """The size of a file, from the crawl if it gathered sizes."""
+    if result.sizes is not None:
+        return result.sizes.get(path.name)
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def _sequence_row(
+    directory_id: int, sequence: FileSequence, sizes: bool, result: crawl.Results
+) -> tuple[Any, ...]:
+    items = sequence.items
+    numbers = [item.frame_number for item in items]
+    padding = sequence.padding
+    size = None
+    if sizes:
+        size = result.sequence_bytes(sequence)
+        if size is None:
+            size = sequence.disk_usage(workers=1)
+    return (
+        directory_id,
+        sequence.prefix,
+        sequence.delimiter,
+        sequence.suffix,
+        sequence.extension,
+        padding,
+        min(numbers),
+        max(numbers),
+        len(items),
+        Problems.check_sequence(sequence).value,
+        size,
+        _encode_frames(items, numbers, padding),
+    )
+
+
+def _encode_frames(items: tuple[Item, ...], numbers: list[int], padding: int) -> str:
+    """Frame runs ("1001-1100,1102"), if the items are in ascending frame
+    order and every frame string is its number at the sequence's padding;
+    otherwise a JSON list of the frame strings."""
+    regular = all(
+        item.frame_string == f"{number:0{padding}d}"
+        for item, number in zip(items, numbers, strict=True)
+    ) and all(a < b for a, b in pairwise(numbers))
+    if not regular:
+        return json.dumps([item.frame_string for item in items])
+
+    runs = []
+    start = previous = numbers[0]
+    for number in numbers[1:]:
+        if number != previous + 1:
+            runs.append((start, previous))
+            start = number
+        previous = number
+    runs.append((start, previous))
+    return ",".join(f"{a}-{b}" if a != b else f"{a}" for a, b in runs)
+
+
+def _decode_frames(frames: str, padding: int) -> Iterator[str]:
+    if frames.startswith("["):
+        yield from json.loads(frames)
+        return
+    for run in frames.split(","):
+        # Frames may be negative: split on the "-" between the two numbers
+        first, sep, last = run[1:].partition("-")
+        start = int(run[0] + first)
+        end = int(last) if sep else start
+        for number in range(start, end + 1):
+            yield f"{number:0{padding}d}"
@@ -1,4 +1,374 @@
 import re
+from collections import Counter
+from collections.abc import Callable, Iterable
+from functools import lru_cache
+from typing import NamedTuple
+
+# Shot number patterns in order of preference, each matched at the start of
+# a path segment. Matches never span a "/" (beyond the one that may follow a
+# segment), so a path can be analysed one segment at a time.
+SHOT_PATTERNS = (
+    r"(?:shot|sq|sequence)[-_]?(\d+)",  # shot_020, sequence_020
+    r"s(\d+)",  # s020
+    r"(\d+)(?:_[^v]|/)",  # 020_comp, 020/
+)
+
+DEFAULT_SEGMENT_CACHE_SIZE = 65536
+
+_NAMED, _PREFIXED, _LEADING = (
+    re.compile(pattern, re.IGNORECASE) for pattern in SHOT_PATTERNS
+)
+_DIGITS = re.compile(r"\d+")
+_UNVERSIONED = re.compile(r"(?<!v)\d+")
+
+
+class _Segment(NamedTuple):
+    """What the shot patterns find in one path segment."""
+
+    named: str | None  # shot_020
+    prefixed: str | None  # s020
+    leading: str | None  # 020_comp or 020/, when more of the path follows
+    leading_last: str | None  # 020_comp, as the last segment of a path
+    number: str | None  # the first number not preceded by a "v"
+    has_number: bool
+    unversioned: str | None  # first match of (?<!v)\d+ (project paths)
+
+
+class _Found(NamedTuple):
+    """The first match of each kind in a run of segments."""
+
+    named: str | None
+    prefixed: str | None
+    leading: str | None
+    number: str | None
+
+
+_NOTHING_FOUND = _Found(None, None, None, None)
+
+
+def _analyse_segment(segment: str) -> _Segment:
+    named = _NAMED.match(segment)
+    prefixed = _PREFIXED.match(segment)
+    leading = _LEADING.match(segment + "/")
+    leading_last = _LEADING.match(segment)
+    number = None
+    for m in _DIGITS.finditer(segment):
+        if not (m.start() > 0 and segment[m.start() - 1].lower() == "v"):
+            number = m.group()
+            break
+    unversioned = _UNVERSIONED.search(segment)
+    return _Segment(
+        named.group(1) if named else None,
+        prefixed.group(1) if prefixed else None,
+        leading.group(1) if leading else None,
+        leading_last.group(1) if leading_last else None,
+        number,
+        _DIGITS.search(segment) is not None,
+        unversioned.group() if unversioned else None,
+    )
+
+
+class _TrieNode:
+    """A directory in a _PathTrie, with the analysis of its whole path."""
+
+    __slots__ = ("children", "signature", "file_signatures", "unversioned")
+
+    def __init__(
+        self,
+        signature: int,
+        file_signatures: tuple[int, int],
+        unversioned: str | None,
+    ):
+        self.children: dict[str, _TrieNode] = {}
+        # Identifies which of the path's segments contain a number
+        self.signature = signature
+        # The signatures of a file in the directory, by whether its name
+        # contains a number
+        self.file_signatures = file_signatures
+        # The first (?<!v)\d+ match in any of the path's segments
+        self.unversioned = unversioned
+
+
+class _PathTrie:
+    """Directories by path segment, for extracting from many paths at once.
+
+    Each node's signature and first unversioned number are derived from its
+    parent's when the node is created, so paths under a common prefix share
+    the work for it, and each distinct directory string is resolved to its
+    node once.
+    """
+
+    def __init__(self, segment: Callable[[str], _Segment]):
+        self._segment = segment
+        # (parent signature, has number) -> signature
+        self._signatures: dict[tuple[int, bool], int] = {}
+        # No segments: the directory of a bare file name
+        self.root = self._new_node(0, None)
+        self._nodes: dict[str | None, _TrieNode] = {None: self.root}
+
+    def node(self, directory: str | None) -> _TrieNode:
+        """The node for a directory (None for a path without one)."""
+        found = self._nodes.get(directory)
+        if found is not None:
+            return found
+        node = self.root
+        assert directory is not None
+        for part in directory.split("/"):
+            child = node.children.get(part)
+            if child is None:
+                info = self._segment(part)
+                child = self._new_node(
+                    self.signature(node.signature, info.has_number),
+                    node.unversioned or info.unversioned,
+                )
+                node.children[part] = child
+            node = child
+        self._nodes[directory] = node
+        return node
+
+    def _new_node(self, signature: int, unversioned: str | None) -> _TrieNode:
+        file_signatures = (
+            self.signature(signature, False),
+            self.signature(signature, True),
+        )
+        return _TrieNode(signature, file_signatures, unversioned)
+
+    def signature(self, parent: int, has_number: bool) -> int:
+        """The signature of a path of parent's segments plus one more."""
+        key = (parent, has_number)
+        return self._signatures.setdefault(key, len(self._signatures) + 1)
+
+
+class ShotExtractor:
+    """Extracts shot numbers from paths, with the patterns compiled once and
+    the analysis of each path segment cached.
+
+    Gives the same results as extract_shot_from_single_path and
+    extract_shots_from_project_paths, which use a shared instance. Show,
+    sequence and shot folders repeat across every file below them, so on a
+    crawl almost every segment (and every directory) is a cache hit.
+    Instances are safe to share between threads.
+
+    Example:
+        extractor = ShotExtractor()
+        for shot, path in extractor.extract_many(paths):
+            print(shot, path)
+    """
+
+    def __init__(self, cache_size: int | None = DEFAULT_SEGMENT_CACHE_SIZE):
+        """
+        Args:
+            cache_size: Segments (and directories) whose analysis is kept,
+                least recently used first out; None for no limit.
+        """
+        self._segment = lru_cache(maxsize=cache_size)(_analyse_segment)
+        self._directory = lru_cache(maxsize=cache_size)(self._analyse_directory)
+
+    def cache_info(self):
+        """lru_cache statistics for the per-segment cache."""
+        return self._segment.cache_info()
+
+    def extract(self, file_path: str) -> tuple[str, str]:
+        """As extract_shot_from_single_path."""
+        file_path = file_path.replace("\\", "/")
+        directory, slash, name = file_path.rpartition("/")
+        found = self._directory(directory) if slash else _NOTHING_FOUND
+        return self._shot(found, name), file_path
+
+    def shot_in(self, directory: str, name: str = "") -> str:
+        """The shot number of a file in a directory, as extract() finds it
+        for directory + "/" + name; with no name, the directory's own.
+
+        ``directory`` must use "/" separators. Its analysis is cached, so
+        for the files of a directory that decides the shot by itself (e.g.
+        .../shot_020/...) only a cache lookup is made.
+        """
+        return self._shot(self._directory(directory), name)
+
+    def _shot(self, found: _Found, name: str) -> str:
+        if found.named is not None:
+            # Nothing in the file name can take precedence
+            return found.named.zfill(3)
+        last = self._segment(name)
+        for shot_num in (
+            last.named,
+            found.prefixed,
+            last.prefixed,
+            found.leading,
+            last.leading_last,
+            found.number,
+            last.number,
+        ):
+            if shot_num is not None:
+                return shot_num.zfill(3)
+        return "000"
+
+    def extract_many(
+        self, file_paths: Iterable[str], project: bool = False
+    ) -> list[tuple[str, str]]:
+        """Extract shot numbers from many paths.
+
+        Args:
+            file_paths: Paths to extract from.
+            project: Treat the paths as one project, as
+                extract_shots_from_project_paths; otherwise each path is
+                handled as by extract_shot_from_single_path.
+
+        Returns:
+            List of tuples (padded shot number, original path)
+        """
+        if project:
+            return self._extract_project(list(file_paths))
+        return [self.extract(path) for path in file_paths]
+
+    def extract_mixed(self, file_paths: Iterable[str]) -> list[tuple[str, str]]:
+        """As extract_shots_from_mixed_paths.
+
+        Paths are grouped by which of their segments contain a number. Every
+        path in a group has the same segments with numbers, so ranking the
+        group's number positions (as extract_shots_from_project_paths does)
+        always picks the first segment with an unversioned number. Each
+        directory's signature and first number come from a _PathTrie, so
+        per path only the file name is analysed.
+        """
+        file_paths = list(file_paths)
+        trie = _PathTrie(self._segment)
+        segment = self._segment
+        keys = []
+        last_directory: object = ...
+        node = trie.root
+        for path in file_paths:
+            directory, slash, name = path.replace("\\", "/").rpartition("/")
+            if slash and directory != last_directory:
+                # Files of a directory tend to come together
+                node = trie.node(directory)
+                last_directory = directory
+            elif not slash:
+                node = trie.root
+                last_directory = ...
+            info = segment(name)
+            keys.append((node.file_signatures[info.has_number], node, info))
+        group_sizes = Counter(signature for signature, _, _ in keys)
+
+        results = []
+        for path, (signature, node, info) in zip(file_paths, keys, strict=True):
+            if group_sizes[signature] == 1:
+                # Use single path method for unique structures
+                results.append(self.extract(path))
+                continue
+            shot_num = node.unversioned or info.unversioned
+            if shot_num is None:
+                shot_num, _ = self.extract(path)
+            results.append((shot_num.zfill(3), path))
+
+        # Sort by shot number, then by original path
+        results.sort()
+        return results
+
+    def _rank_number_positions(
+        self, path_parts: list[list[str]]
+    ) -> list[tuple[int, int]]:
+        """Rank path-segment positions by how often they contain a number,
+        most frequent first."""
+        min_length = min(len(parts) for parts in path_parts)
+        segment = self._segment
+
+        number_positions = []
+        for i in range(min_length):
+            count = sum(1 for parts in path_parts if segment(parts[i]).has_number)
+            if count:
+                number_positions.append((i, count))
+
+        number_positions.sort(key=lambda x: x[1], reverse=True)
+        return number_positions
+
+    def _extract_project(self, file_paths: list[str]) -> list[tuple[str, str]]:
+        """extract_shots_from_project_paths, working a directory at a time:
+        the files in a directory share its segments, so each directory's
+        segments are looked up once per batch rather than once per file."""
+        if not file_paths:
+            return []
+        segment = self._segment
+        # Directory (None for a bare file name) -> (index, file name) of its files
+        groups: dict[str | None, list[tuple[int, str]]] = {}
+        for index, path in enumerate(file_paths):
+            head, slash, name = path.replace("\\", "/").rpartition("/")
+            groups.setdefault(head if slash else None, []).append((index, name))
+        parts_of = {
+            directory: directory.split("/") if directory is not None else []
+            for directory in groups
+        }
+
+        number_positions = self._rank_directory_positions(groups, parts_of)
+
+        results: list[tuple[str, str]] = [("", "")] * len(file_paths)
+        for directory, files in groups.items():
+            candidates = self._candidates(parts_of[directory], number_positions)
+            for index, name in files:
+                path = file_paths[index]
+                shot_num = None
+                # First try positions where numbers commonly appear
+                for candidate in candidates:
+                    shot_num = candidate or segment(name).unversioned
+                    if shot_num is not None:
+                        break
+                # If no shot number found, fall back to single path method
+                if shot_num is None:
+                    shot_num, _ = self.extract(path)
+                results[index] = (shot_num.zfill(3), path)
+        return results
+
+    def _rank_directory_positions(
+        self,
+        groups: dict[str | None, list[tuple[int, str]]],
+        parts_of: dict[str | None, list[str]],
+    ) -> list[tuple[int, int]]:
+        """As _rank_number_positions, counting each directory's files at once;
+        the position after a directory's segments is its files' names."""
+        segment = self._segment
+        min_length = min(len(parts) for parts in parts_of.values()) + 1
+        counts = [0] * min_length
+        for directory, files in groups.items():
+            parts = parts_of[directory]
+            for i in range(min_length):
+                if i < len(parts):
+                    counts[i] += len(files) if segment(parts[i]).has_number else 0
+                else:
+                    counts[i] += sum(1 for _, n in files if segment(n).has_number)
+        number_positions = [(i, count) for i, count in enumerate(counts) if count]
+        number_positions.sort(key=lambda x: x[1], reverse=True)
+        return number_positions
+
+    def _candidates(
+        self, parts: list[str], number_positions: list[tuple[int, int]]
+    ) -> list[str | None]:
+        """A directory's numbers to try in order; None stands for the file
+        name. Stops at the first unversioned number among its segments."""
+        candidates: list[str | None] = []
+        for pos, _ in number_positions:
+            if pos == len(parts):
+                candidates.append(None)
+            elif pos < len(parts):
+                shot_num = self._segment(parts[pos]).unversioned
+                if shot_num is not None:
+                    candidates.append(shot_num)
+                    break
+        return candidates
+
+    def _analyse_directory(self, directory: str) -> _Found:
+        """The first match of each kind among a directory's segments, all of
+        which are followed by more of the path."""
+        named = prefixed = leading = number = None
+        for part in directory.split("/"):
+            found = self._segment(part)
+            named = named or found.named
+            prefixed = prefixed or found.prefixed
+            leading = leading or found.leading
+            number = number or found.number
+        return _Found(named, prefixed, leading, number)
+
+
+_extractor = ShotExtractor()
 
 
 def extract_shot_from_single_path(file_path: str) -> tuple[str, str]:
@@ -12,51 +382,13 @@ def extract_shot_from_single_path(file_path: str) -> tuple[str, str]:
     Returns:
         Tuple of (padded shot number, original path)
     """
-    # Convert backslashes to forward slashes for consistency
-    file_path = file_path.replace("\\", "/")
-
-    # Common patterns for shot numbers, avoiding version numbers
-    patterns = [
-        r"(?:^|/)(?:shot|sq|sequence)[-_]?(\d+)",  # shot_020, sequence_020
-        r"(?:^|/)s(\d+)",  # s020
-        r"(?:^|/)(\d+)(?:_[^v]|/)",  # 020_comp, 020/
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, file_path, re.IGNORECASE)
-        if match:
-            shot_num = match.group(1)
-            # Pad to at least 3 digits
-            return shot_num.zfill(3), file_path
-
-    # If no clear shot number found, look for any whole number that is not a
-    # version (a run of digits immediately preceded by 'v', e.g. v25).
-    numbers = [
-        m.group()
-        for m in re.finditer(r"\d+", file_path)
-        if not (m.start() > 0 and file_path[m.start() - 1].lower() == "v")
-    ]
-    if numbers:
-        # Take the first number that's not clearly a version
-        return numbers[0].zfill(3), file_path
-
-    # If no shot number found, return placeholder
-    return "000", file_path
+    return _extractor.extract(file_path)
 
 
 def _rank_number_positions(path_parts: list[list[str]]) -> list[tuple[int, int]]:
     """Rank path-segment positions by how often they contain a number,
     most frequent first."""
-    min_length = min(len(parts) for parts in path_parts)
-
-    number_positions = []
-    for i in range(min_length):
-        count = sum(1 for parts in path_parts if re.search(r"\d+", parts[i]))
-        if count:
-            number_positions.append((i, count))
-
-    number_positions.sort(key=lambda x: x[1], reverse=True)
-    return number_positions
+    return _extractor._rank_number_positions(path_parts)
 
 
 def extract_shots_from_project_paths(file_paths: list[str]) -> list[tuple[str, str]]:
@@ -70,33 +402,7 @@ def extract_shots_from_project_paths(file_paths: list[str]) -> list[tuple[str, s
     Returns:
         List of tuples (padded shot number, original path)
     """
-    if not file_paths:
-        return []
-
-    # Find common path structure
-    path_parts = [path.replace("\\", "/").split("/") for path in file_paths]
-    number_positions = _rank_number_positions(path_parts)
-
-    results = []
-    for path in file_paths:
-        parts = path.replace("\\", "/").split("/")
-        shot_num = None
-
-        # First try positions where numbers commonly appear
-        for pos, _ in number_positions:
-            if pos < len(parts):
-                numbers = re.findall(r"(?<!v)\d+", parts[pos])
-                if numbers:
-                    shot_num = numbers[0]
-                    break
-
-        # If no shot number found, fall back to single path method
-        if not shot_num:
-            shot_num, _ = extract_shot_from_single_path(path)
-
-        results.append((shot_num.zfill(3), path))
-
-    return results
+    return _extractor.extract_many(file_paths, project=True)
 
 
 def extract_shots_from_mixed_paths(file_paths: list[str]) -> list[tuple[str, str]]:
@@ -110,34 +416,7 @@ def extract_shots_from_mixed_paths(file_paths: list[str]) -> list[tuple[str, str
     Returns:
         List of tuples (padded shot number, original path)
     """
-    if not file_paths:
-        return []
-
-    # Group paths by common structure
-    def get_path_signature(path: str) -> str:
-        # Create a signature based on the path structure
-        parts = path.replace("\\", "/").split("/")
-        return "_".join(str(bool(re.search(r"\d+", part))) for part in parts)
-
-    # Group paths by signature
-    path_groups: dict[str, list[str]] = {}
-    for path in file_paths:
-        sig = get_path_signature(path)
-        path_groups.setdefault(sig, []).append(path)
-
-    results = []
-    for group in path_groups.values():
-        if len(group) > 1:
-            # Use project paths method for groups
-            results.extend(extract_shots_from_project_paths(group))
-        else:
-            # Use single path method for unique structures
-            results.extend([extract_shot_from_single_path(path) for path in group])
-
-    # Sort by shot number, then by original path
-    results.sort(key=lambda x: (x[0], x[1]))
-
-    return results
+    return _extractor.extract_mixed(file_paths)
 
 
 # Example usage:
@@ -0,0 +1,203 @@
+# Copyright (c) 2024 Alex Harding (alexharding.ooo)
+# This file is part of PySequitur which is released under MIT license.
+# See file LICENSE for full license details.
+"""Rate limiting for plan execution on shared storage.
+
+A RatePolicy caps bytes per second, operations per second and concurrent
+operations per destination volume. OperationPlan.execute enforces it with
+token buckets that are shared by every worker thread, so the same limits hold
+for serial, parallel and async execution.
+
+Example:
+    policy = RatePolicy(max_bytes_per_second=200e6, max_concurrent_per_volume=4)
+    result = plan.execute(rate=policy)
+    print(result.throughput)
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RatePolicy:
+    """Limits applied while a plan executes. None means unlimited.
+
+    Attributes:
+        max_bytes_per_second: Data copied per second, across all workers.
+        max_ops_per_second: File operations started per second.
+        max_concurrent_per_volume: Operations in flight at once on any one
+            volume (the destination's, or the source's for deletes).
+        burst_seconds: How many seconds' worth of tokens may accumulate
+            while idle, i.e. how bursty the start of a batch may be.
+    """
+
+    max_bytes_per_second: float | None = None
+    max_ops_per_second: float | None = None
+    max_concurrent_per_volume: int | None = None
+    burst_seconds: float = 1.0
+
+    def __post_init__(self) -> None:
+        for name in ("max_bytes_per_second", "max_ops_per_second"):
+            value = getattr(self, name)
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be positive")
+        if (
+            self.max_concurrent_per_volume is not None
+            and self.max_concurrent_per_volume < 1
+        ):
+            raise ValueError("max_concurrent_per_volume must be at least 1")
+        if self.burst_seconds <= 0:
+            raise ValueError("burst_seconds must be positive")
+
+
+class TokenBucket:
+    """A thread-safe token bucket.
+
+    Tokens refill at ``rate`` per second up to ``capacity``. acquire() takes
+    tokens immediately, letting the balance go negative, and then sleeps
+    until the debt has been repaid. Requests larger than the capacity (a
+    single large file) are therefore allowed but delay whoever comes next.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1) -> float:
+        """Take ``amount`` tokens, sleeping as needed. Returns seconds waited."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+
+@dataclass(frozen=True)
+class ThroughputReport:
+    """Measured throughput of an execution, alongside the limits applied."""
+
+    operations: int
+    bytes: int
+    elapsed: float
+    throttled_seconds: float
+    policy: RatePolicy
+
+    @property
+    def ops_per_second(self) -> float:
+        return self.operations / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self) -> str:
+        def against(value: float, limit: float | None, unit: str) -> str:
+            text = f"{value:.1f} {unit}"
+            if limit is not None:
+                text += f" of {limit:.1f} {unit} limit ({value / limit:.0%})"
+            return text
+
+        policy = self.policy
+        return (
+            f"{self.operations} operations, {self.bytes} bytes "
+            f"in {self.elapsed:.2f}s: "
+            f"{against(self.ops_per_second, policy.max_ops_per_second, 'ops/s')}, "
+            f"{against(self.bytes_per_second, policy.max_bytes_per_second, 'B/s')}; "
+            f"throttled for {self.throttled_seconds:.2f}s"
+        )
+
+
+class Throttle:
+    """Runtime state enforcing a RatePolicy across worker threads."""
+
+    def __init__(self, policy: RatePolicy):
+        self.policy = policy
+        self._bytes = (
+            TokenBucket(
+                policy.max_bytes_per_second,
+                policy.max_bytes_per_second * policy.burst_seconds,
+            )
+            if policy.max_bytes_per_second is not None
+            else None
+        )
+        self._ops = (
+            TokenBucket(
+                policy.max_ops_per_second,
+                max(1.0, policy.max_ops_per_second * policy.burst_seconds),
+            )
+            if policy.max_ops_per_second is not None
+            else None
+        )
+        self._volumes: dict[Hashable, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._operations = 0
+        self._bytes_done = 0
+        self._throttled = 0.0
+        self._started = time.monotonic()
+
+    @property
+    def limits_volumes(self) -> bool:
+        """True if callers need to name the volume of each operation."""
+        return self.policy.max_concurrent_per_volume is not None
+
+    @contextmanager
+    def limit(self, volume: Hashable = None, nbytes: int = 0) -> Iterator[None]:
+        """Hold a slot on ``volume`` and spend tokens for one operation."""
+        semaphore = self._semaphore(volume)
+        if semaphore is not None:
+            semaphore.acquire()
+        try:
+            waited = 0.0
+            if self._ops is not None:
+                waited += self._ops.acquire(1)
+            if self._bytes is not None and nbytes:
+                waited += self._bytes.acquire(nbytes)
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+        with self._lock:
+            self._operations += 1
+            self._bytes_done += nbytes
+            self._throttled += waited
+
+    def report(self) -> ThroughputReport:
+        with self._lock:
+            return ThroughputReport(
+                operations=self._operations,
+                bytes=self._bytes_done,
+                elapsed=time.monotonic() - self._started,
+                throttled_seconds=self._throttled,
+                policy=self.policy,
+            )
+
+    def _semaphore(self, volume: Hashable) -> threading.BoundedSemaphore | None:
+        limit = self.policy.max_concurrent_per_volume
+        if limit is None:
+            return None
+        with self._lock:
+            if volume not in self._volumes:
+                self._volumes[volume] = threading.BoundedSemaphore(limit)
+            return self._volumes[volume]
@@ -0,0 +1,596 @@
+# Copyright (c) 2024 Alex Harding (alexharding.ooo)
+# This file is part of PySequitur which is released under MIT license.
+# See file LICENSE for full license details.
+"""Live sequence index for watched directory trees.
+
+A SequenceIndex holds the frames of every sequence under a tree and turns
+individual file additions and removals into SequenceEvents (sequence created,
+frames added, gap filled, frames removed, sequence removed). A watcher keeps
+an index up to date: InotifyWatcher applies Linux inotify events as they
+arrive, and PollingWatcher re-lists only directories whose mtime changed.
+
+Example:
+    with watcher.watch(Path("/renders/sh010")) as w:
+        for event in w:
+            print(event.type.name, event.sequence, event.frames)
+"""
+
+from __future__ import annotations
+
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from enum import Enum, auto
+from functools import cache
+from operator import attrgetter
+from pathlib import Path
+from typing import Any
+
+from .crawl import DEFAULT_ALLOWED_EXTENSIONS, _split_extensions
+from .file_sequence import FileSequence, Item, ItemParser
+
+# (prefix, delimiter, suffix, extension): the files of one sequence
+_Key = tuple[str, str | None, str | None, str]
+
+
+class EventType(Enum):
+    """Kinds of change reported by a SequenceIndex."""
+
+    SEQUENCE_CREATED = auto()  # a group of files reached min_frames
+    FRAMES_ADDED = auto()
+    GAP_FILLED = auto()  # frames added between the first and last frame
+    FRAMES_REMOVED = auto()
+    SEQUENCE_REMOVED = auto()  # a sequence fell below min_frames
+
+
+@dataclass(frozen=True)
+class SequenceEvent:
+    """A change to a sequence in a SequenceIndex.
+
+    Attributes:
+        type: What happened.
+        sequence: The sequence after the change, or as it was before being
+            removed for SEQUENCE_REMOVED.
+        frames: The frames concerned: all frames for SEQUENCE_CREATED and
+            SEQUENCE_REMOVED, otherwise the frames added, filled or removed.
+    """
+
+    type: EventType
+    sequence: FileSequence
+    frames: tuple[int, ...]
+
+    @property
+    def directory(self) -> Path:
+        return self.sequence.directory
+
+
+@dataclass
+class _Group:
+    """The files of one (possible) sequence and their distinct frames."""
+
+    items: dict[str, Item] = field(default_factory=dict)
+    frames: Counter[int] = field(default_factory=Counter)
+    first: int | None = None
+    last: int | None = None
+
+    def add_frame(self, frame: int) -> bool:
+        """Count a file of frame; True if the frame is new."""
+        self.frames[frame] += 1
+        if self.frames[frame] > 1:
+            return False
+        if self.first is None or frame < self.first:
+            self.first = frame
+        if self.last is None or frame > self.last:
+            self.last = frame
+        return True
+
+    def discard_frame(self, frame: int) -> bool:
+        """Uncount a file of frame; True if no file of the frame is left."""
+        self.frames[frame] -= 1
+        if self.frames[frame]:
+            return False
+        del self.frames[frame]
+        if frame in (self.first, self.last):
+            # Rare (trimming a sequence), so a full scan is fine here
+            self.first = min(self.frames, default=None)
+            self.last = max(self.frames, default=None)
+        return True
+
+    def remove(self, names: Iterable[str]) -> tuple[dict[str, Item], set[int]]:
+        """Drop files by name; returns (removed items, frames now gone)."""
+        removed: dict[str, Item] = {}
+        gone: set[int] = set()
+        for name in names:
+            item = self.items.pop(name, None)
+            if item is None:
+                continue
+            removed[name] = item
+            if self.discard_frame(item.frame_number):
+                gone.add(item.frame_number)
+        return removed, gone
+
+    def add(self, items: dict[str, Item]) -> tuple[list[str], set[int]]:
+        """Add files not already known; returns (names added, new frames)."""
+        added: list[str] = []
+        new: set[int] = set()
+        for name, item in items.items():
+            if name in self.items:
+                continue
+            self.items[name] = item
+            added.append(name)
+            if self.add_frame(item.frame_number):
+                new.add(item.frame_number)
+        return added, new
+
+    def sequence(self, items: Iterable[Item] | None = None) -> FileSequence:
+        if items is None:
+            items = self.items.values()
+        return FileSequence(tuple(sorted(items, key=attrgetter("frame_number"))))
+
+
+class SequenceIndex:
+    """An in-memory index of the sequences in a set of directories.
+
+    Files are grouped by (prefix, delimiter, suffix, extension) per
+    directory; a group with at least ``min_frames`` files is a sequence.
+    Every mutation returns the SequenceEvents it caused.
+    """
+
+    def __init__(
+        self,
+        min_frames: int = 2,
+        allowed_extensions: set[str] = DEFAULT_ALLOWED_EXTENSIONS,
+    ):
+        self.min_frames = min_frames
+        _movie_exts, self._extensions = _split_extensions(allowed_extensions)
+        self._groups: dict[Path, dict[_Key, _Group]] = {}
+
+    def sequences(self, directory: Path | None = None) -> list[FileSequence]:
+        """Current sequences, in one directory or in all of them."""
+        directories = [directory] if directory is not None else list(self._groups)
+        return [
+            group.sequence()
+            for d in directories
+            for group in self._groups.get(d, {}).values()
+            if len(group.items) >= self.min_frames
+        ]
+
+    def add(self, path: Path) -> list[SequenceEvent]:
+        """Record that a file exists."""
+        item = self._parse(path.name, path.parent)
+        if item is None:
+            return []
+        return self._apply(path.parent, _key(item), {path.name: item}, ())
+
+    def remove(self, path: Path) -> list[SequenceEvent]:
+        """Record that a file no longer exists."""
+        item = self._parse(path.name, path.parent)
+        if item is None:
+            return []
+        return self._apply(path.parent, _key(item), {}, (path.name,))
+
+    def sync(self, directory: Path, names: Iterable[str]) -> list[SequenceEvent]:
+        """Replace what is known about directory with a full listing of it."""
+        listed: dict[_Key, dict[str, Item]] = {}
+        for name in names:
+            item = self._parse(name, directory)
+            if item is not None:
+                listed.setdefault(_key(item), {})[name] = item
+
+        known = self._groups.get(directory, {})
+        events = []
+        for key in set(known) | set(listed):
+            additions = listed.get(key, {})
+            known_names = known[key].items if key in known else {}
+            removals = [n for n in known_names if n not in additions]
+            events += self._apply(directory, key, additions, removals)
+        return events
+
+    def remove_directory(self, directory: Path) -> list[SequenceEvent]:
+        """Forget directory and everything below it."""
+        events = []
+        below = [d for d in self._groups if d == directory or directory in d.parents]
+        for d in below:
+            for key, group in list(self._groups.get(d, {}).items()):
+                events += self._apply(d, key, {}, list(group.items))
+        return events
+
+    def _parse(self, name: str, directory: Path) -> Item | None:
+        if name.startswith("."):
+            return None
+        item = ItemParser.item_from_filename(name, directory)
+        if item is None or item.extension.lower() not in self._extensions:
+            return None
+        return item
+
+    def _apply(
+        self,
+        directory: Path,
+        key: _Key,
+        additions: dict[str, Item],
+        removals: Iterable[str],
+    ) -> list[SequenceEvent]:
+        """Add and remove files of one group, returning the events caused."""
+        groups = self._groups.setdefault(directory, {})
+        group = groups.setdefault(key, _Group())
+        before_count = len(group.items)
+        before_first, before_last = group.first, group.last
+
+        removed, removed_frames = group.remove(removals)
+        added, added_frames = group.add(additions)
+
+        if not group.items:
+            del groups[key]
+            if not groups:
+                del self._groups[directory]
+
+        was_sequence = before_count >= self.min_frames
+        is_sequence = len(group.items) >= self.min_frames
+        if is_sequence and not was_sequence:
+            return [
+                SequenceEvent(
+                    EventType.SEQUENCE_CREATED,
+                    group.sequence(),
+                    tuple(sorted(group.frames)),
+                )
+            ]
+        if was_sequence and not is_sequence:
+            before = {n: i for n, i in group.items.items() if n not in added}
+            before.update(removed)
+            return [
+                SequenceEvent(
+                    EventType.SEQUENCE_REMOVED,
+                    group.sequence(before.values()),
+                    tuple(sorted({i.frame_number for i in before.values()})),
+                )
+            ]
+        if not is_sequence:
+            return []
+        return _frame_events(
+            group, added_frames, removed_frames, before_first, before_last
+        )
+
+
+def _frame_events(
+    group: _Group,
+    added_frames: set[int],
+    removed_frames: set[int],
+    before_first: int | None,
+    before_last: int | None,
+) -> list[SequenceEvent]:
+    """Events for frames added to and removed from a sequence that stays one."""
+    events = []
+    new_frames = sorted(added_frames - removed_frames)
+    gone_frames = sorted(removed_frames - added_frames)
+    if new_frames or gone_frames:
+        sequence = group.sequence()
+    if new_frames:
+        events.append(
+            SequenceEvent(EventType.FRAMES_ADDED, sequence, tuple(new_frames))
+        )
+        assert before_first is not None and before_last is not None
+        filled = tuple(f for f in new_frames if before_first < f < before_last)
+        if filled:
+            events.append(SequenceEvent(EventType.GAP_FILLED, sequence, filled))
+    if gone_frames:
+        events.append(
+            SequenceEvent(EventType.FRAMES_REMOVED, sequence, tuple(gone_frames))
+        )
+    return events
+
+
+def _key(item: Item) -> _Key:
+    return (item.prefix, item.delimiter, item.suffix, item.extension)
+
+
+def _list(directory: Path) -> tuple[list[Path], list[str]]:
+    """(subdirectories, file names) of directory; empty if it can't be listed."""
+    dirs: list[Path] = []
+    names: list[str] = []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(directory / entry.name)
+                else:
+                    names.append(entry.name)
+    except OSError:
+        pass
+    return dirs, names
+
+
+class _Watcher(ABC):
+    """Shared interface of the watchers: poll() for a batch of events, or
+    iterate for an endless stream of them."""
+
+    root: Path
+    index: SequenceIndex
+
+    @abstractmethod
+    def poll(self, timeout: float | None = None) -> list[SequenceEvent]:
+        """Wait up to ``timeout`` seconds for changes and return their events."""
+
+    def close(self) -> None:  # noqa: B027 - optional hook, not abstract
+        """Release the watcher's resources; watchers without any keep this."""
+
+    def __iter__(self) -> Iterator[SequenceEvent]:
+        while True:
+            yield from self.poll()
+
+    def __enter__(self) -> _Watcher:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class PollingWatcher(_Watcher):
+    """Keeps an index current by re-listing directories whose mtime changed.
+
+    Each check costs one stat per directory; only changed directories are
+    listed. Directories modified within ``mtime_slack`` seconds of a check
+    are re-listed on the next check as well, since coarse timestamps could
+    hide a second change.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        index: SequenceIndex | None = None,
+        interval: float = 2.0,
+        mtime_slack: float = 2.0,
+    ):
+        self.root = Path(root)
+        self.index = index if index is not None else SequenceIndex()
+        self.interval = interval
+        self.mtime_slack_ns = int(mtime_slack * 1e9)
+        # directory -> (mtime_ns, or None to re-list next time; subdirectories)
+        self._dirs: dict[Path, tuple[int | None, set[Path]]] = {}
+        self._sync(self.root)
+        self._next_check = time.monotonic() + interval
+
+    def poll(self, timeout: float | None = None) -> list[SequenceEvent]:
+        """Wait for the next check (at most ``timeout`` seconds) and run it."""
+        delay = self._next_check - time.monotonic()
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            return []
+        if delay > 0:
+            time.sleep(delay)
+        self._next_check = time.monotonic() + self.interval
+        return self.check()
+
+    def check(self) -> list[SequenceEvent]:
+        """Check every known directory now."""
+        events = []
+        for directory in list(self._dirs):
+            if directory not in self._dirs:
+                continue  # forgotten along with its parent
+            mtime, _subdirs = self._dirs[directory]
+            try:
+                changed = os.stat(directory).st_mtime_ns != mtime
+            except OSError:
+                events += self._forget(directory)
+                continue
+            if changed:
+                events += self._sync(directory)
+        return events
+
+    def _sync(self, directory: Path) -> list[SequenceEvent]:
+        """Re-list directory, and list any new subdirectories in full."""
+        events = []
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                stat_mtime = os.stat(current).st_mtime_ns
+            except OSError:
+                events += self._forget(current)
+                continue
+            mtime: int | None = stat_mtime
+            if time.time_ns() - stat_mtime < self.mtime_slack_ns:
+                mtime = None
+            dirs, names = _list(current)
+            _old_mtime, old_dirs = self._dirs.get(current, (None, set()))
+            self._dirs[current] = (mtime, set(dirs))
+            events += self.index.sync(current, names)
+            for gone in old_dirs.difference(dirs):
+                events += self._forget(gone)
+            stack.extend(d for d in dirs if d not in self._dirs)
+        return events
+
+    def _forget(self, directory: Path) -> list[SequenceEvent]:
+        stack = [directory]
+        while stack:
+            _mtime, subdirs = self._dirs.pop(stack.pop(), (None, set()))
+            stack.extend(subdirs)
+        return self.index.remove_directory(directory)
+
+
+# inotify(7) constants
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_CREATE | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+@cache
+def _inotify() -> Any:
+    """libc (with inotify_init1/add_watch/rm_watch), or None if unavailable."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+    except (OSError, AttributeError):
+        return None
+    return libc
+
+
+class InotifyWatcher(_Watcher):
+    """Keeps an index current from Linux inotify events.
+
+    Every directory in the tree is watched. Files are applied to the index
+    as additions when closed after writing or moved in, not when created, so
+    a frame is not reported while it is still being written; deletions and
+    moves out are applied as removals. New subdirectories are watched and
+    listed as they appear. If the kernel's event queue overflows, the tree is walked and
+    listed again from the root.
+
+    Raises:
+        OSError: If inotify is unavailable (not Linux, or out of instances).
+    """
+
+    def __init__(self, root: Path, index: SequenceIndex | None = None):
+        self.root = Path(root)
+        self.index = index if index is not None else SequenceIndex()
+        self._libc = _inotify()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._fd = self._libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._paths: dict[int, Path] = {}
+        self._watches: dict[Path, int] = {}
+        self._watch_tree(self.root)
+
+    def close(self) -> None:  # noqa: B027 - optional hook, not abstract
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def poll(self, timeout: float | None = None) -> list[SequenceEvent]:
+        """Wait up to ``timeout`` seconds (forever if None) for changes."""
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return []
+        try:
+            data = os.read(self._fd, 256 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            events += self._handle(wd, mask, name)
+        return events
+
+    def _handle(self, wd: int, mask: int, name: str) -> list[SequenceEvent]:
+        if mask & _IN_Q_OVERFLOW:
+            return self._resync()
+        directory = self._paths.get(wd)
+        if directory is None:
+            return []
+        if mask & _IN_IGNORED:
+            del self._paths[wd]
+            if self._watches.get(directory) == wd:
+                del self._watches[directory]
+            return []
+
+        path = directory / name
+        if mask & _IN_ISDIR:
+            if mask & (_IN_CREATE | _IN_MOVED_TO):
+                return self._watch_tree(path)
+            if mask & (_IN_DELETE | _IN_MOVED_FROM):
+                return self._forget(path)
+            return []
+        # A file is only complete once closed after writing (or moved in);
+        # IN_CREATE alone would report frames before their data is there
+        if mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+            return self.index.add(path)
+        if mask & (_IN_DELETE | _IN_MOVED_FROM):
+            return self.index.remove(path)
+        return []
+
+    def _watch_tree(self, directory: Path) -> list[SequenceEvent]:
+        """Watch directory and everything below it, then list it. Watching
+        first means a file created meanwhile is seen at least once."""
+        events = []
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(current), _WATCH_MASK
+            )
+            if wd < 0:
+                continue  # gone already, or unreadable
+            self._paths[wd] = current
+            self._watches[current] = wd
+            dirs, names = _list(current)
+            events += self.index.sync(current, names)
+            stack.extend(dirs)
+        return events
+
+    def _resync(self) -> list[SequenceEvent]:
+        """Walk the whole tree again after the kernel dropped events.
+
+        Directories created meanwhile are watched and listed along with the
+        rest; watched directories that no longer exist are forgotten.
+        """
+        watched = list(self._watches)
+        events = self._watch_tree(self.root)
+        for directory in watched:
+            if directory in self._watches and not directory.is_dir():
+                events += self._forget(directory)
+        return events
+
+    def _forget(self, directory: Path) -> list[SequenceEvent]:
+        for watched in list(self._watches):
+            if watched == directory or directory in watched.parents:
+                wd = self._watches.pop(watched)
+                self._paths.pop(wd, None)
+                self._libc.inotify_rm_watch(self._fd, wd)
+        return self.index.remove_directory(directory)
+
+
+def watch(
+    root: Path,
+    index: SequenceIndex | None = None,
+    interval: float = 2.0,
+    polling: bool = False,
+) -> InotifyWatcher | PollingWatcher:
+    """Watch a tree with inotify where available, else by polling mtimes.
+
+    Args:
+        root: Directory tree to watch.
+        index: Index to keep up to date (a new one by default). It is
+            populated from the tree before this returns, without events.
+        interval: Seconds between checks when polling.
+        polling: Always poll, e.g. for network filesystems, where inotify
+            does not see changes made by other hosts.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root, index)
+        except OSError:
+            pass
+    return PollingWatcher(root, index, interval)
@@ -0,0 +1,17 @@
+import pytest
+
+from pysequitur import file_sequence
+
+
+@pytest.fixture
+def cross_device(monkeypatch):
+    """Make every move look like it crosses devices."""
+    real_route = file_sequence._route
+
+    def route(op, devices):
+        result = real_route(op, devices)
+        if result == file_sequence._Route.SAME_DEVICE_MOVE:
+            return file_sequence._Route.CROSS_DEVICE_MOVE
+        return result
+
+    monkeypatch.setattr(file_sequence, "_route", route)
@@ -0,0 +1,173 @@
+"""Tests for OperationPlan.bulk_delete."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from pysequitur import DeleteResult, OperationPlan, SequenceFactory
+from pysequitur.file_sequence import FileOperation, OperationType
+
+
+def _make_sequence(directory, prefix="plate", frames=range(1, 6)):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in frames:
+        (directory / f"{prefix}.{i:04d}.exr").write_text(str(i))
+    return SequenceFactory.from_directory(directory)[0]
+
+
+def _delete_plan(*sequences):
+    plan = OperationPlan(operations=())
+    for sequence in sequences:
+        plan = plan + sequence.delete()
+    return plan
+
+
+def test_bulk_delete_unlinks_every_file(tmp_path):
+    plan = _delete_plan(
+        _make_sequence(tmp_path / "a"), _make_sequence(tmp_path / "b")
+    )
+
+    result = plan.bulk_delete(workers=2)
+
+    assert isinstance(result, DeleteResult)
+    assert result.success
+    assert result.count == 10
+    assert list((tmp_path / "a").iterdir()) == []
+    assert result.pruned == ()
+    assert result.purge is None
+
+
+def test_bulk_delete_prunes_empty_directories_only(tmp_path):
+    keep = tmp_path / "keep"
+    plan = _delete_plan(_make_sequence(tmp_path / "gone"), _make_sequence(keep))
+    (keep / "notes.txt").write_text("keep me")
+
+    result = plan.bulk_delete(prune_empty=True)
+
+    assert result.pruned == (tmp_path / "gone",)
+    assert not (tmp_path / "gone").exists()
+    assert [p.name for p in keep.iterdir()] == ["notes.txt"]
+    assert tmp_path.exists()
+
+
+def test_bulk_delete_reports_failures(tmp_path):
+    plan = _delete_plan(_make_sequence(tmp_path / "a"))
+    (tmp_path / "a" / "plate.0003.exr").unlink()
+
+    result = plan.bulk_delete(prune_empty=True)
+
+    assert [op.source.name for op, _ in result.failed] == ["plate.0003.exr"]
+    assert result.count == 4
+    assert result.pruned == ()
+
+
+def test_bulk_delete_rejects_other_operations(tmp_path):
+    source = tmp_path / "a.0001.exr"
+    plan = OperationPlan(
+        operations=(FileOperation(OperationType.RENAME, source, tmp_path / "b"),)
+    )
+
+    with pytest.raises(ValueError):
+        plan.bulk_delete()
+
+
+def test_trash_renames_whole_directory(tmp_path, monkeypatch):
+    trash = tmp_path / "trash"
+    plan = _delete_plan(_make_sequence(tmp_path / "shot" / "plates"))
+
+    renames = []
+    real_rename = os.rename
+
+    def rename(src, dst, *args, **kwargs):
+        renames.append(src)
+        return real_rename(src, dst, *args, **kwargs)
+
+    monkeypatch.setattr(os, "rename", rename)
+    result = plan.bulk_delete(prune_empty=True, trash=trash)
+    result.purge.result(timeout=10)
+
+    assert result.success
+    assert result.count == 5
+    assert renames == [tmp_path / "shot" / "plates"]
+    assert result.pruned == (tmp_path / "shot" / "plates",)
+    assert (tmp_path / "shot").exists()
+    assert list(trash.iterdir()) == []
+
+
+def test_trash_renames_files_when_directory_is_shared(tmp_path):
+    trash = tmp_path / "trash"
+    shared = tmp_path / "shared"
+    plan = _delete_plan(_make_sequence(shared))
+    (shared / "other.txt").write_text("stay")
+
+    result = plan.bulk_delete(prune_empty=True, trash=trash)
+    result.purge.result(timeout=10)
+
+    assert result.count == 5
+    assert result.pruned == ()
+    assert [p.name for p in shared.iterdir()] == ["other.txt"]
+    assert list(trash.iterdir()) == []
+
+
+def test_trash_on_other_device_unlinks_in_place(tmp_path):
+    shm = "/dev/shm"
+    if not os.path.isdir(shm) or os.stat(shm).st_dev == os.stat(tmp_path).st_dev:
+        pytest.skip("needs a second device")
+    trash = tmp_path / "trash"
+    directory = Path(shm) / f"pysequitur-bulk-{os.getpid()}"
+    plan = _delete_plan(_make_sequence(directory))
+
+    result = plan.bulk_delete(prune_empty=True, trash=trash)
+    result.purge.result(timeout=10)
+
+    assert result.success
+    assert not directory.exists()
+
+
+def test_trash_keeps_a_directory_that_cannot_be_restored(tmp_path, monkeypatch):
+    trash = tmp_path / "trash"
+    plates = tmp_path / "shot" / "plates"
+    plan = _delete_plan(_make_sequence(plates))
+    real_rename = os.rename
+
+    def rename(src, dst, *args, **kwargs):
+        if Path(src) == plates:
+            # A file nobody asked to delete appears just before the rename
+            (plates / "new.exr").write_text("keep me")
+            return real_rename(src, dst, *args, **kwargs)
+        raise PermissionError("restore refused")
+
+    monkeypatch.setattr(os, "rename", rename)
+    result = plan.bulk_delete(prune_empty=True, trash=trash)
+    result.purge.result(timeout=10)
+
+    assert result.count == 0
+    assert len(result.failed) == 5
+    [batch] = trash.iterdir()
+    [staging] = batch.iterdir()
+    assert all(str(staging) in str(error) for _, error in result.failed)
+    assert "new.exr" in {p.name for p in staging.iterdir()}
+    assert len(list(staging.iterdir())) == 6
+
+
+def test_trash_reports_unusable_staging_directory(tmp_path, monkeypatch):
+    trash = tmp_path / "trash"
+    shared = tmp_path / "shared"
+    plan = _delete_plan(_make_sequence(shared))
+    (shared / "other.txt").write_text("stay")
+
+    real_mkdir = os.mkdir
+
+    def mkdir(path, *args, **kwargs):
+        if Path(path).parent.parent == trash:
+            raise PermissionError("no staging")
+        return real_mkdir(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "mkdir", mkdir)
+    result = plan.bulk_delete(prune_empty=True, trash=trash)
+    result.purge.result(timeout=10)
+
+    assert result.count == 0
+    assert len(result.failed) == 5
+    assert len(list(shared.iterdir())) == 6
@@ -0,0 +1,133 @@
+"""Tests for the asyncio execution and discovery API."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pysequitur import Components, SequenceFactory
+
+
+def _make_sequence(directory, prefix="render", frames=range(1, 6)):
+    for i in frames:
+        (directory / f"{prefix}_{i:04d}.exr").touch()
+    return SequenceFactory.from_directory(directory)[0]
+
+
+def test_execute_async_renames_all_files(tmp_path):
+    seq = _make_sequence(tmp_path)
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    result = asyncio.run(plan.execute_async(concurrency=4))
+
+    assert result.success
+    assert result.count == 5
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        f"shot_{i:04d}.exr" for i in range(1, 6)
+    ]
+
+
+def test_execute_async_preserves_order_of_dependent_operations(tmp_path):
+    """offset_frames(1) on a contiguous sequence is a chain of renames that
+    each vacate the next one's destination; they must not overlap."""
+    seq = _make_sequence(tmp_path, frames=range(1, 21))
+    for item in seq:
+        item.path.write_text(str(item.frame_number))
+
+    _new, plan = seq.offset_frames(1)
+    result = asyncio.run(plan.execute_async(concurrency=8))
+
+    assert result.success
+    for i in range(2, 22):
+        assert (tmp_path / f"render_{i:04d}.exr").read_text() == str(i - 1)
+    assert not (tmp_path / "render_0001.exr").exists()
+
+
+def test_execute_async_raises_on_conflict(tmp_path):
+    seq = _make_sequence(tmp_path)
+    (tmp_path / "shot_0001.exr").touch()
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    with pytest.raises(FileExistsError):
+        asyncio.run(plan.execute_async())
+
+
+def test_iter_execute_async_streams_failures(tmp_path):
+    seq = _make_sequence(tmp_path)
+    plan = seq.delete()
+    (tmp_path / "render_0003.exr").unlink()
+
+    async def collect():
+        return [item async for item in plan.iter_execute_async(concurrency=2)]
+
+    results = asyncio.run(collect())
+
+    assert len(results) == 5
+    errors = [(op.source.name, err) for op, err in results if err is not None]
+    assert len(errors) == 1
+    assert errors[0][0] == "render_0003.exr"
+    assert isinstance(errors[0][1], FileNotFoundError)
+
+
+def test_execute_async_rejects_zero_concurrency(tmp_path):
+    seq = _make_sequence(tmp_path)
+
+    with pytest.raises(ValueError):
+        asyncio.run(seq.delete().execute_async(concurrency=0))
+
+
+def test_iter_execute_async_can_be_closed_early(tmp_path):
+    seq = _make_sequence(tmp_path, frames=range(1, 51))
+    plan = seq.delete()
+
+    async def first_only():
+        stream = plan.iter_execute_async(concurrency=1)
+        async for _ in stream:
+            break
+        await stream.aclose()
+
+    asyncio.run(first_only())
+
+    # At least one file deleted, and not every queued operation ran.
+    remaining = list(tmp_path.iterdir())
+    assert 0 < len(remaining) < 50
+
+
+def test_from_directory_async_matches_sync(tmp_path):
+    _make_sequence(tmp_path)
+    _make_sequence(tmp_path, prefix="plate")
+
+    sync = SequenceFactory.from_directory(tmp_path)
+    result = asyncio.run(SequenceFactory.from_directory_async(tmp_path))
+
+    assert sorted(map(str, result)) == sorted(map(str, sync))
+
+
+def test_discovery_and_execution_share_an_executor(tmp_path):
+    _make_sequence(tmp_path)
+    threads = set()
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            def run():
+                threads.add(threading.current_thread().name)
+                return fn(*args, **kwargs)
+
+            return super().submit(run)
+
+    async def discover_and_rename(executor):
+        [seq] = await SequenceFactory.from_directory_async(
+            tmp_path, executor=executor
+        )
+        _new, plan = seq.rename(Components(prefix="shot"))
+        return await plan.execute_async(concurrency=2, executor=executor)
+
+    with RecordingExecutor(max_workers=2, thread_name_prefix="shared") as executor:
+        result = asyncio.run(discover_and_rename(executor))
+        # Still usable: execute_async leaves a caller's executor running
+        assert executor.submit(lambda: 1).result() == 1
+
+    assert result.success
+    assert result.count == 5
+    assert threads and all(name.startswith("shared") for name in threads)
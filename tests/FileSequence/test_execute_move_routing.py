@@ -0,0 +1,145 @@
+"""Tests for same-device and cross-device MOVE execution."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from pysequitur import Components, OperationPlan, SequenceFactory
+from pysequitur.file_sequence import FileOperation, OperationType
+
+
+def _make_sequence(directory, prefix="plate", frames=range(1, 9)):
+    for i in frames:
+        (directory / f"{prefix}.{i:04d}.exr").write_bytes(bytes(i) * 1000)
+    return SequenceFactory.from_directory(directory)[0]
+
+
+def test_same_device_move_is_a_plain_rename(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src)
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("shutil.move used")
+
+    monkeypatch.setattr(shutil, "move", fail)
+    result = seq.move(dst).plan.execute()
+
+    assert result.success
+    assert len(list(dst.iterdir())) == 8
+
+
+def test_devices_are_compared_once_per_directory_pair(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    plan = _make_sequence(src).move(dst).plan
+
+    calls = []
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        calls.append(Path(path))
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat)
+    plan.execute(force=True)
+
+    assert sorted(calls) == [dst, src]
+
+
+def test_cross_device_move_copies_then_deletes(tmp_path, cross_device):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src)
+
+    result = seq.move(dst).plan.execute(workers=3)
+
+    assert result.success
+    assert result.count == 8
+    assert not any(src.iterdir())
+    for i in range(1, 9):
+        assert (dst / f"plate.{i:04d}.exr").read_bytes() == bytes(i) * 1000
+
+
+def test_cross_device_move_waits_for_dependent_operations(tmp_path, cross_device):
+    """A rename of the moved file must run after its move has finished."""
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src)
+    moved, move_plan = seq.move(dst)
+    _final, rename_plan = moved.rename(Components(prefix="shot"))
+
+    result = (move_plan + rename_plan).execute(workers=4)
+
+    assert result.success
+    assert sorted(p.name for p in dst.iterdir()) == [
+        f"shot.{i:04d}.exr" for i in range(1, 9)
+    ]
+
+
+def test_failed_copy_keeps_source(tmp_path, cross_device, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src, frames=range(1, 4))
+
+    def truncating_copy(source, destination):
+        Path(destination).write_bytes(Path(source).read_bytes()[:10])
+
+    monkeypatch.setattr(shutil, "copy2", truncating_copy)
+    result = seq.move(dst).plan.execute()
+
+    assert len(result.failed) == 3
+    assert len(list(src.iterdir())) == 3
+    assert not any(dst.iterdir())
+
+
+def test_real_cross_device_move(tmp_path):
+    shm = Path("/dev/shm")
+    if not shm.is_dir() or os.stat(shm).st_dev == os.stat(tmp_path).st_dev:
+        pytest.skip("no second device available")
+    seq = _make_sequence(tmp_path, frames=range(1, 4))
+
+    with tempfile.TemporaryDirectory(dir=shm) as other:
+        result = seq.move(Path(other)).plan.execute()
+        assert result.success
+        assert len(os.listdir(other)) == 3
+    assert not any(tmp_path.iterdir())
+
+
+def test_workers_must_be_positive():
+    plan = OperationPlan(
+        (FileOperation(OperationType.DELETE, Path("/nonexistent/a.1.exr"), None),)
+    )
+
+    with pytest.raises(ValueError):
+        plan.execute(workers=0)
+
+
+def test_forced_same_device_move_replaces_existing_files(tmp_path, monkeypatch):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src)
+    (dst / "plate.0001.exr").write_text("old")
+    real_rename = os.rename
+
+    def rename(source, destination, *args, **kwargs):
+        # As on Windows, rename refuses to replace an existing file
+        if os.path.exists(destination):
+            raise FileExistsError(destination)
+        return real_rename(source, destination, *args, **kwargs)
+
+    monkeypatch.setattr(os, "rename", rename)
+    result = seq.move(dst).plan.execute(force=True)
+
+    assert result.success
+    assert (dst / "plate.0001.exr").read_bytes() == bytes(1) * 1000
+    assert not any(src.iterdir())
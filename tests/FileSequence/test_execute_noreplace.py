@@ -0,0 +1,144 @@
+"""Tests for OperationPlan.execute(noreplace=True)."""
+
+import os
+import sys
+
+import pytest
+
+from pysequitur import Components, SequenceFactory, file_sequence
+
+
+def _make_sequence(directory, prefix="render", frames=range(1, 4)):
+    for i in frames:
+        (directory / f"{prefix}_{i:04d}.exr").write_text(str(i))
+    return SequenceFactory.from_directory(directory)[0]
+
+
+@pytest.fixture(params=["renameat2", "link", "rename"])
+def rename_backend(request, monkeypatch):
+    """Run each test through renameat2 and through both portable fallbacks."""
+    if request.param == "renameat2":
+        if file_sequence._renameat2() is None:
+            pytest.skip("renameat2 not available")
+    else:
+        monkeypatch.setattr(file_sequence, "_renameat2", lambda: None)
+    if request.param == "rename":
+        def no_link(*_args):
+            raise OSError("hard links not supported")
+
+        monkeypatch.setattr(os, "link", no_link)
+    return request.param
+
+
+def test_noreplace_renames(tmp_path, rename_backend):
+    seq = _make_sequence(tmp_path)
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    result = plan.execute(noreplace=True)
+
+    assert result.success
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "shot_0001.exr",
+        "shot_0002.exr",
+        "shot_0003.exr",
+    ]
+
+
+def test_noreplace_refuses_file_created_after_planning(tmp_path, rename_backend):
+    seq = _make_sequence(tmp_path)
+    _new, plan = seq.rename(Components(prefix="shot"))
+    (tmp_path / "shot_0002.exr").write_text("other job")
+
+    result = plan.execute(noreplace=True)
+
+    assert [op.destination.name for op in result.collisions] == ["shot_0002.exr"]
+    assert result.count == 2
+    assert (tmp_path / "shot_0002.exr").read_text() == "other job"
+    assert (tmp_path / "render_0002.exr").exists()
+
+
+def test_noreplace_handles_internal_shuffle(tmp_path, rename_backend):
+    seq = _make_sequence(tmp_path, frames=range(1, 6))
+    _new, plan = seq.offset_frames(1)
+
+    result = plan.execute(noreplace=True)
+
+    assert result.success
+    for i in range(2, 7):
+        assert (tmp_path / f"render_{i:04d}.exr").read_text() == str(i - 1)
+
+
+def test_noreplace_copy_and_move(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src)
+    (dst / "render_0003.exr").write_text("keep")
+
+    copy_result = seq.copy(new_directory=dst).plan.execute(noreplace=True)
+    assert [op.destination.name for op in copy_result.collisions] == [
+        "render_0003.exr"
+    ]
+    assert (dst / "render_0001.exr").read_text() == "1"
+    assert (dst / "render_0003.exr").read_text() == "keep"
+
+    moved = tmp_path / "moved"
+    moved.mkdir()
+    move_result = seq.move(moved).plan.execute(noreplace=True)
+    assert move_result.success
+    assert not any(src.iterdir())
+
+
+def test_noreplace_copy_failure_removes_partial_file(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src)
+
+    def copyfileobj(fsrc, fdst, *args, **kwargs):
+        fdst.write(fsrc.read(1))
+        raise OSError("disk full")
+
+    monkeypatch.setattr(file_sequence.shutil, "copyfileobj", copyfileobj)
+    result = seq.copy(new_directory=dst).plan.execute(noreplace=True)
+
+    assert len(result.failed) == 3
+    assert not any(dst.iterdir())
+    assert len(list(src.iterdir())) == 3
+
+
+def test_noreplace_skips_preflight_scan(tmp_path, monkeypatch):
+    seq = _make_sequence(tmp_path)
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    def fail(_self):
+        raise AssertionError("conflict scan ran")
+
+    monkeypatch.setattr(type(plan), "conflicts", property(fail))
+
+    assert plan.execute(noreplace=True).success
+
+
+def test_force_and_noreplace_are_exclusive(tmp_path):
+    plan = _make_sequence(tmp_path).delete()
+
+    with pytest.raises(ValueError):
+        plan.execute(force=True, noreplace=True)
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Linux only")
+def test_renameat2_is_used_on_linux(tmp_path, monkeypatch):
+    if file_sequence._renameat2() is None:
+        pytest.skip("renameat2 not available")
+    seq = _make_sequence(tmp_path)
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    def fail(*_args):
+        raise AssertionError("fallback used")
+
+    monkeypatch.setattr(os, "link", fail)
+    monkeypatch.setattr(os, "rename", fail)
+
+    assert plan.execute(noreplace=True).success
@@ -0,0 +1,161 @@
+"""Tests for rate-limited plan execution (OperationPlan.execute(rate=...))."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pysequitur import Components, RatePolicy, SequenceFactory
+from pysequitur.throttle import Throttle, TokenBucket
+
+
+def _make_sequence(directory, prefix="render", frames=range(1, 5), size=1):
+    for i in frames:
+        (directory / f"{prefix}_{i:04d}.exr").write_bytes(b"x" * size)
+    return SequenceFactory.from_directory(directory)[0]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_waits():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == 0
+    assert bucket.acquire() == pytest.approx(0.1)
+    assert bucket.acquire() == pytest.approx(0.1)
+
+
+def test_token_bucket_refills_while_idle():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=10, capacity=2, clock=clock, sleep=clock.sleep)
+    bucket.acquire(2)
+
+    clock.now += 10  # refill is capped at capacity
+
+    assert bucket.acquire(2) == 0
+    assert bucket.acquire(1) == pytest.approx(0.1)
+
+
+def test_token_bucket_oversized_request_borrows():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=100, capacity=10, clock=clock, sleep=clock.sleep)
+
+    assert bucket.acquire(60) == pytest.approx(0.5)
+    assert bucket.acquire(10) == pytest.approx(0.1)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"max_bytes_per_second": 0},
+        {"max_ops_per_second": -1},
+        {"max_concurrent_per_volume": 0},
+        {"burst_seconds": 0},
+    ],
+)
+def test_rate_policy_rejects_invalid_limits(kwargs):
+    with pytest.raises(ValueError):
+        RatePolicy(**kwargs)
+
+
+def test_throttle_caps_concurrency_per_volume():
+    throttle = Throttle(RatePolicy(max_concurrent_per_volume=2))
+    active = {"a": 0, "b": 0}
+    peak = {"a": 0, "b": 0}
+    lock = threading.Lock()
+
+    def work(volume):
+        with throttle.limit(volume):
+            with lock:
+                active[volume] += 1
+                peak[volume] = max(peak[volume], active[volume])
+            time.sleep(0.02)
+            with lock:
+                active[volume] -= 1
+
+    threads = [threading.Thread(target=work, args=(v,)) for v in "ab" * 6]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak == {"a": 2, "b": 2}
+    assert throttle.report().operations == 12
+
+
+def test_execute_without_rate_has_no_report(tmp_path):
+    seq = _make_sequence(tmp_path)
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    assert plan.execute().throughput is None
+
+
+def test_execute_limits_ops_per_second(tmp_path):
+    seq = _make_sequence(tmp_path, frames=range(1, 12))
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    start = time.monotonic()
+    result = plan.execute(rate=RatePolicy(max_ops_per_second=50, burst_seconds=0.02))
+    elapsed = time.monotonic() - start
+
+    assert result.success
+    assert elapsed >= 0.19  # one free op, then 10 more at 50/s
+    assert result.throughput.operations == 11
+    assert result.throughput.ops_per_second <= 50 * 1.1
+
+
+def test_execute_limits_bytes_per_second_for_copies(tmp_path):
+    seq = _make_sequence(tmp_path, size=10_000)
+    destination = tmp_path / "copies"
+    destination.mkdir()
+    _new, plan = seq.copy(new_directory=destination)
+    policy = RatePolicy(max_bytes_per_second=100_000, burst_seconds=0.01)
+
+    start = time.monotonic()
+    result = plan.execute(rate=policy)
+    elapsed = time.monotonic() - start
+
+    assert result.success
+    assert elapsed >= 0.35  # 40 kB at 100 kB/s, less a 1 kB burst
+    assert result.throughput.bytes == 40_000
+    assert result.throughput.bytes_per_second <= 100_000 * 1.1
+    assert "of 100000.0 B/s limit" in str(result.throughput)
+
+
+def test_renames_do_not_spend_bytes(tmp_path):
+    seq = _make_sequence(tmp_path, size=10_000)
+    _new, plan = seq.rename(Components(prefix="shot"))
+
+    result = plan.execute(rate=RatePolicy(max_bytes_per_second=1))
+
+    assert result.success
+    assert result.throughput.bytes == 0
+
+
+def test_execute_async_reports_throughput(tmp_path):
+    seq = _make_sequence(tmp_path, size=100)
+    destination = tmp_path / "copies"
+    destination.mkdir()
+    _new, plan = seq.copy(new_directory=destination)
+    policy = RatePolicy(max_ops_per_second=1000, max_concurrent_per_volume=2)
+
+    result = asyncio.run(plan.execute_async(concurrency=8, rate=policy))
+
+    assert result.success
+    assert result.throughput.operations == 4
+    assert result.throughput.bytes == 400
+    assert len(list(destination.iterdir())) == 4
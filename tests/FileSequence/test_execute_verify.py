@@ -0,0 +1,122 @@
+"""Tests for checksum-verified execution (OperationPlan.execute(verify=...))."""
+
+import hashlib
+
+import pytest
+
+from pysequitur import SequenceFactory, file_sequence
+from pysequitur.file_sequence import ChecksumMismatchError
+
+
+def _make_sequence(directory, prefix="plate", frames=range(1, 5)):
+    for i in frames:
+        (directory / f"{prefix}.{i:04d}.exr").write_bytes(bytes([i]) * 5000)
+    return SequenceFactory.from_directory(directory)[0]
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    src, dst = tmp_path / "src", tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    return src, dst
+
+
+@pytest.fixture
+def corrupt(monkeypatch):
+    """Make the destination of frame 2 hash differently from its source."""
+    real_hash = file_sequence._hash_file
+
+    def hash_file(path, algorithm):
+        digest = real_hash(path, algorithm)
+        return "corrupt" if path.name.endswith("0002.exr") else digest
+
+    monkeypatch.setattr(file_sequence, "_hash_file", hash_file)
+
+
+@pytest.mark.parametrize("algorithm", ["blake2b", "sha256"])
+def test_verified_copy(dirs, algorithm):
+    src, dst = dirs
+    plan = _make_sequence(src).copy(new_directory=dst).plan
+
+    result = plan.execute(verify=algorithm)
+
+    assert result.success
+    assert result.mismatches == []
+    for path in src.iterdir():
+        assert (dst / path.name).read_bytes() == path.read_bytes()
+
+
+def test_unknown_algorithm_is_rejected(dirs):
+    src, dst = dirs
+    plan = _make_sequence(src).copy(new_directory=dst).plan
+
+    with pytest.raises(ValueError):
+        plan.execute(verify="not-a-hash")
+    assert list(dst.iterdir()) == []
+
+
+def test_copy_mismatch_is_reported_and_removed(dirs, corrupt):
+    src, dst = dirs
+    plan = _make_sequence(src).copy(new_directory=dst).plan
+
+    result = plan.execute(verify="blake2b")
+
+    [(op, error)] = result.mismatches
+    assert op.destination.name == "plate.0002.exr"
+    assert isinstance(error, ChecksumMismatchError)
+    assert error.actual == "corrupt"
+    assert result.count == 3
+    assert not (dst / "plate.0002.exr").exists()
+    assert (src / "plate.0002.exr").exists()
+
+
+def test_cross_device_move_mismatch_keeps_source(dirs, cross_device, corrupt):
+    src, dst = dirs
+    plan = _make_sequence(src).move(dst).plan
+
+    result = plan.execute(verify="sha256")
+
+    assert [op.source.name for op, _ in result.mismatches] == ["plate.0002.exr"]
+    assert sorted(p.name for p in src.iterdir()) == ["plate.0002.exr"]
+    assert sorted(p.name for p in dst.iterdir()) == [
+        "plate.0001.exr",
+        "plate.0003.exr",
+        "plate.0004.exr",
+    ]
+
+
+def test_copy_hashes_source_while_streaming(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_sequence, "_HASH_CHUNK_SIZE", 7)
+    source, destination = tmp_path / "a.bin", tmp_path / "b.bin"
+    data = bytes(range(256)) * 3
+    source.write_bytes(data)
+
+    digest = file_sequence._copy_hashing(source, destination, False, "blake2b")
+
+    assert digest == hashlib.blake2b(data).hexdigest()
+    assert destination.read_bytes() == data
+    assert file_sequence._hash_file(destination, "blake2b") == digest
+
+
+def test_empty_files_verify(tmp_path):
+    source = tmp_path / "empty.0001.exr"
+    source.touch()
+    (tmp_path / "empty.0002.exr").touch()
+    dst = tmp_path / "dst"
+    dst.mkdir()
+    plan = SequenceFactory.from_directory(tmp_path)[0].copy(new_directory=dst).plan
+
+    assert plan.execute(verify="blake2b").success
+
+
+def test_verify_with_noreplace_keeps_existing_destination(dirs):
+    src, dst = dirs
+    plan = _make_sequence(src).copy(new_directory=dst).plan
+    (dst / "plate.0003.exr").write_text("other job")
+
+    result = plan.execute(noreplace=True, verify="blake2b")
+
+    assert [op.destination.name for op in result.collisions] == ["plate.0003.exr"]
+    assert (dst / "plate.0003.exr").read_text() == "other job"
+    assert result.count == 3
@@ -0,0 +1,267 @@
+"""Tests for OperationPlan.optimize() and its use in SequenceBuilder."""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from pysequitur import Components, OperationPlan, SequenceBuilder, SequenceFactory
+from pysequitur.file_sequence import FileOperation, OperationType
+
+
+def _make_sequence(directory, prefix="plate", frames=range(1001, 1004)):
+    for i in frames:
+        (directory / f"{prefix}.{i:04d}.exr").write_text(str(i))
+    return SequenceFactory.from_directory(directory)[0]
+
+
+def _op(kind, source, destination=None):
+    return FileOperation(
+        kind, Path(source), Path(destination) if destination else None
+    )
+
+
+def test_rename_offset_move_collapses_to_one_move_per_file(tmp_path):
+    src = tmp_path / "src"
+    dst = tmp_path / "dst"
+    src.mkdir()
+    dst.mkdir()
+    seq = _make_sequence(src)
+
+    builder = (
+        SequenceBuilder(seq)
+        .rename(Components(prefix="shot"))
+        .offset_frames(1000)
+        .move(dst)
+    )
+    result = builder.build()
+
+    assert len(builder.plan.operations) == 9
+    assert len(result.plan.operations) == 3
+    assert all(op.operation == OperationType.MOVE for op in result.plan.operations)
+    assert sorted(
+        (op.source.name, op.destination.name) for op in result.plan.operations
+    ) == [
+        ("plate.1001.exr", "shot.2001.exr"),
+        ("plate.1002.exr", "shot.2002.exr"),
+        ("plate.1003.exr", "shot.2003.exr"),
+    ]
+
+    builder.execute()
+    assert sorted(p.name for p in dst.iterdir()) == [
+        "shot.2001.exr",
+        "shot.2002.exr",
+        "shot.2003.exr",
+    ]
+    assert (dst / "shot.2001.exr").read_text() == "1001"
+    assert not any(src.iterdir())
+
+
+def test_overlapping_offsets_are_ordered_safely(tmp_path):
+    seq = _make_sequence(tmp_path, frames=range(1, 6))
+
+    builder = SequenceBuilder(seq).offset_frames(1).offset_frames(1)
+    plan = builder.build().plan
+
+    assert len(plan.operations) == 5
+    assert not plan.has_conflicts
+    builder.execute()
+    for i in range(3, 8):
+        assert (tmp_path / f"plate.{i:04d}.exr").read_text() == str(i - 2)
+
+
+def test_copy_then_rename_folds_into_copy(tmp_path):
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    seq = _make_sequence(tmp_path)
+
+    plan = (
+        SequenceBuilder(seq)
+        .copy(new_directory=archive)
+        .rename(Components(prefix="backup"))
+        .build()
+        .plan
+    )
+
+    assert [op.operation for op in plan.operations] == [OperationType.COPY] * 3
+    assert {op.destination for op in plan.operations} == {
+        archive / f"backup.{i:04d}.exr" for i in range(1001, 1004)
+    }
+
+
+def test_rename_back_to_original_is_dropped():
+    plan = OperationPlan(
+        (
+            _op(OperationType.RENAME, "/a/x.1.exr", "/a/y.1.exr"),
+            _op(OperationType.RENAME, "/a/y.1.exr", "/a/x.1.exr"),
+        )
+    )
+
+    assert plan.optimize().operations == ()
+
+
+def test_rename_then_delete_deletes_original():
+    plan = OperationPlan(
+        (
+            _op(OperationType.RENAME, "/a/x.1.exr", "/a/y.1.exr"),
+            _op(OperationType.DELETE, "/a/y.1.exr"),
+        )
+    )
+
+    assert plan.optimize().operations == (_op(OperationType.DELETE, "/a/x.1.exr"),)
+
+
+def test_copy_then_delete_cancels_out():
+    plan = OperationPlan(
+        (
+            _op(OperationType.COPY, "/a/x.1.exr", "/b/x.1.exr"),
+            _op(OperationType.DELETE, "/b/x.1.exr"),
+        )
+    )
+
+    assert plan.optimize().operations == ()
+
+
+def test_copy_runs_before_source_is_moved():
+    plan = OperationPlan(
+        (
+            _op(OperationType.RENAME, "/a/x.1.exr", "/a/y.1.exr"),
+            _op(OperationType.COPY, "/a/y.1.exr", "/b/y.1.exr"),
+        )
+    )
+
+    ops = plan.optimize().operations
+
+    assert ops == (
+        _op(OperationType.COPY, "/a/x.1.exr", "/b/y.1.exr"),
+        _op(OperationType.RENAME, "/a/x.1.exr", "/a/y.1.exr"),
+    )
+
+
+def test_swap_through_temporary_name_is_left_alone():
+    plan = OperationPlan(
+        (
+            _op(OperationType.RENAME, "/a/x.exr", "/a/tmp.exr"),
+            _op(OperationType.RENAME, "/a/y.exr", "/a/x.exr"),
+            _op(OperationType.RENAME, "/a/tmp.exr", "/a/y.exr"),
+        )
+    )
+
+    assert plan.optimize() is plan
+
+
+def test_intermediate_collision_is_avoided(tmp_path):
+    """An external file at an intermediate name is never touched."""
+    seq = _make_sequence(tmp_path)
+    (tmp_path / "temp.1001.exr").write_text("external")
+
+    builder = (
+        SequenceBuilder(seq)
+        .rename(Components(prefix="temp"))
+        .rename(Components(prefix="final"))
+    )
+
+    plan = builder.build().plan
+    assert not plan.has_conflicts
+    assert tmp_path / "temp.1001.exr" not in plan.sources + plan.destinations
+    builder.execute()
+    assert (tmp_path / "temp.1001.exr").read_text() == "external"
+    assert (tmp_path / "final.1001.exr").read_text() == "1001"
+
+
+def _run(root, files, plan_ops, optimise):
+    """Execute plan_ops (relative paths) under root; return the files left."""
+    for directory in ("x", "y"):
+        (root / directory).mkdir(parents=True)
+    for name in files:
+        (root / name).write_text(name)
+    plan = OperationPlan(
+        tuple(
+            FileOperation(kind, root / src, root / dst if dst else None)
+            for kind, src, dst in plan_ops
+        )
+    )
+    if optimise:
+        plan = plan.optimize()
+    assert plan.execute(force=True).success
+    return {
+        str(p.relative_to(root)): p.read_text()
+        for p in root.rglob("*")
+        if p.is_file()
+    }
+
+
+def test_copy_back_onto_renamed_origin_is_kept(tmp_path):
+    ops = [
+        (OperationType.RENAME, "x/a.1", "x/c.1"),
+        (OperationType.COPY, "x/c.1", "x/a.1"),
+    ]
+
+    raw = _run(tmp_path / "raw", ["x/a.1"], ops, False)
+    assert _run(tmp_path / "opt", ["x/a.1"], ops, True) == raw
+    assert raw == {"x/a.1": "x/a.1", "x/c.1": "x/a.1"}
+
+
+def test_delete_after_copy_round_trip_is_kept(tmp_path):
+    ops = [
+        (OperationType.COPY, "x/a.1", "x/b.1"),
+        (OperationType.COPY, "x/b.1", "x/a.1"),
+        (OperationType.DELETE, "x/a.1", None),
+    ]
+
+    raw = _run(tmp_path / "raw", ["x/a.1"], ops, False)
+    assert _run(tmp_path / "opt", ["x/a.1"], ops, True) == raw
+    assert raw == {"x/b.1": "x/a.1"}
+
+
+def test_reading_a_removed_file_is_left_alone():
+    plan = OperationPlan(
+        (
+            _op(OperationType.DELETE, "/a/x.1.exr"),
+            _op(OperationType.RENAME, "/a/x.1.exr", "/a/y.1.exr"),
+        )
+    )
+
+    assert plan.optimize() is plan
+
+
+NAMES = [f"{d}/{n}.1" for d in ("x", "y") for n in "abcd"]
+
+
+def _random_plan(rng):
+    """Random operations over a few names that never clobber a file the
+    plan has not read (an unrelated file, which optimize() leaves alone)."""
+    files = sorted(rng.sample(NAMES, rng.randint(1, 4)))
+    existing, unread = set(files), set(files)
+    ops = []
+    for _ in range(rng.randint(1, 6)):
+        if not existing:
+            break
+        src = rng.choice(sorted(existing))
+        unread.discard(src)
+        kind = rng.choice(list(OperationType))
+        if kind == OperationType.DELETE:
+            ops.append((kind, src, None))
+            existing.discard(src)
+            continue
+        choices = [n for n in NAMES if n != src and n not in unread]
+        if kind == OperationType.RENAME:
+            choices = [n for n in choices if n[0] == src[0]]
+        elif kind == OperationType.MOVE:
+            choices = [n for n in choices if n[0] != src[0]]
+        if not choices:
+            break
+        dst = rng.choice(choices)
+        ops.append((kind, src, dst))
+        if kind != OperationType.COPY:
+            existing.discard(src)
+        existing.add(dst)
+    return files, ops
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_random_plans_match_raw_execution(tmp_path, seed):
+    files, ops = _random_plan(random.Random(seed))
+
+    raw = _run(tmp_path / "raw", files, ops, False)
+    assert _run(tmp_path / "opt", files, ops, True) == raw
@@ -0,0 +1,199 @@
+"""The lazy SequenceBuilder must match running each step for real."""
+
+import random
+
+import pytest
+
+from pysequitur import Components, FileSequence, Item, OperationPlan, SequenceBuilder
+from pysequitur.file_sequence import OperationType
+
+
+def _sequence(directory, frames, padding=4, prefix="plate"):
+    items = tuple(
+        Item(prefix, f"{f:0{padding}d}", "exr", ".", None, directory) for f in frames
+    )
+    return FileSequence(items)
+
+
+def _eager(sequence, steps):
+    """Apply steps with the real operations, one after another."""
+    operations = []
+    for name, args in steps:
+        if name == "delete":
+            operations.extend(sequence.delete().operations)
+            continue
+        sequence, plan = getattr(sequence, name)(*args)
+        operations.extend(plan.operations)
+    return sequence, OperationPlan(tuple(operations))
+
+
+def _lazy(sequence, steps):
+    builder = SequenceBuilder(sequence)
+    for name, args in steps:
+        getattr(builder, name)(*args)
+    return builder
+
+
+def _summary(plan):
+    return sorted(
+        (op.operation.name, str(op.source), str(op.destination))
+        for op in plan.operations
+    )
+
+
+STEPS = [
+    ("rename", (Components(prefix="shot"),)),
+    ("rename", (Components(delimiter="_", padding=6),)),
+    ("offset_frames", (7,)),
+    ("offset_frames", (-3,)),
+    ("offset_frames", (100, 2)),
+    ("with_padding", (5,)),
+    ("folderize", ("sub",)),
+    ("copy", (None, None)),
+    ("copy", (Components(prefix="bak"),)),
+]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_chains_match_eager_operations(tmp_path, seed):
+    rng = random.Random(seed)
+    sequence = _sequence(tmp_path, range(1, 12))
+    steps = []
+    for _ in range(rng.randint(1, 6)):
+        step = rng.choice(STEPS)
+        try:
+            _eager(sequence, steps + [step])
+        except ValueError:
+            continue  # e.g. an offset below frame 0
+        steps.append(step)
+    if rng.random() < 0.3:
+        steps.append(("delete", ()))
+    if rng.random() < 0.3:
+        steps.append(("move", (tmp_path / "elsewhere", True)))
+
+    expected_sequence, raw = _eager(sequence, steps)
+    builder = _lazy(sequence, steps)
+    result = builder.build()
+
+    assert _summary(builder.plan) == _summary(raw)
+    optimized = raw.optimize()
+    if optimized is raw and _summary(result.plan) != _summary(raw):
+        # The chain collides with itself, so optimize() refuses to compose
+        # it; the builder's plan must still report the collision.
+        assert result.plan.has_conflicts
+    else:
+        assert _summary(result.plan) == _summary(optimized)
+    assert result.sequence == expected_sequence
+    assert builder.current_sequence == expected_sequence
+
+
+def test_mixed_padding_sequence_matches_eager(tmp_path):
+    items = _sequence(tmp_path, range(1, 6)).items + (
+        Item("plate", "006", "exr", ".", None, tmp_path),
+        Item("plate", "00007", "exr", ".", None, tmp_path),
+    )
+    sequence = FileSequence(items)
+    steps = [
+        ("rename", (Components(prefix="x"),)),
+        ("copy", (Components(padding=3),)),
+        ("offset_frames", (10,)),
+    ]
+
+    expected_sequence, raw = _eager(sequence, steps)
+    result = _lazy(sequence, steps).build()
+
+    assert result.sequence == expected_sequence
+    assert _summary(result.plan) == _summary(raw.optimize())
+
+
+def test_steps_are_not_materialised(tmp_path, monkeypatch):
+    """Recording steps never calls the per-sequence operations."""
+    sequence = _sequence(tmp_path, range(1, 1001))
+
+    def fail(*_args, **_kwargs):
+        raise AssertionError("FileSequence operation called")
+
+    for name in ("rename", "move", "copy", "offset_frames", "with_padding"):
+        monkeypatch.setattr(FileSequence, name, fail)
+
+    builder = SequenceBuilder(sequence)
+    for i in range(10):
+        builder.rename(Components(prefix=f"step{i}")).offset_frames(1)
+    result = builder.build()
+
+    assert len(result.plan.operations) == 1000
+    assert {op.operation for op in result.plan.operations} == {OperationType.RENAME}
+    assert result.sequence.first_frame == 11
+    assert result.sequence.prefix == "step9"
+
+
+def test_invalid_offset_is_not_recorded(tmp_path):
+    builder = SequenceBuilder(_sequence(tmp_path, range(1, 4)))
+
+    with pytest.raises(ValueError):
+        builder.offset_frames(-5)
+
+    assert builder.build().plan.operations == ()
+
+
+def test_invalid_suffix_is_reported_by_the_step(tmp_path):
+    builder = SequenceBuilder(_sequence(tmp_path, range(1, 4)))
+
+    with pytest.raises(ValueError, match="digits"):
+        builder.rename(Components(suffix="v2"))
+    with pytest.raises(ValueError, match="digits"):
+        builder.copy(Components(suffix="v2"))
+
+    assert builder.build().plan.operations == ()
+
+
+def _run(directory, steps, lazy):
+    """Run steps on a fresh sequence on disk; return the files left."""
+    directory.mkdir()
+    for i in range(1, 5):
+        (directory / f"a.{i:04d}.exr").write_text(str(i))
+    sequence = _sequence(directory, range(1, 5), prefix="a")
+    if lazy:
+        plan = _lazy(sequence, steps).build().plan
+    else:
+        plan = _eager(sequence, steps)[1]
+    assert plan.execute(force=True).success
+    return {
+        str(p.relative_to(directory)): p.read_text()
+        for p in directory.rglob("*")
+        if p.is_file()
+    }
+
+
+def test_copy_onto_renamed_originals_keeps_them(tmp_path):
+    steps = [
+        ("rename", (Components(prefix="c"),)),
+        ("copy", (Components(prefix="a"),)),
+    ]
+
+    eager = _run(tmp_path / "eager", steps, lazy=False)
+
+    assert _run(tmp_path / "lazy", steps, lazy=True) == eager
+    assert sorted(eager) == [f"{p}.{i:04d}.exr" for p in "ac" for i in range(1, 5)]
+
+
+DISK_STEPS = [
+    ("rename", (Components(prefix="a"),)),
+    ("rename", (Components(prefix="c"),)),
+    ("offset_frames", (1,)),
+    ("with_padding", (5,)),
+    ("folderize", ("sub",)),
+    ("copy", ()),
+    ("copy", (Components(prefix="a"),)),
+    ("copy", (Components(prefix="c"),)),
+]
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_random_chains_match_eager_on_disk(tmp_path, seed):
+    rng = random.Random(seed)
+    steps = [rng.choice(DISK_STEPS) for _ in range(rng.randint(1, 5))]
+
+    eager = _run(tmp_path / "eager", steps, lazy=False)
+
+    assert _run(tmp_path / "lazy", steps, lazy=True) == eager
@@ -0,0 +1,145 @@
+"""Tests for the persistent SQLite sequence index, index.CrawlIndex."""
+
+import pytest
+
+from pysequitur import crawl
+from pysequitur.file_sequence import Problems
+from pysequitur.index import CrawlIndex, _decode_frames, _encode_frames
+
+
+def _frames(directory, prefix, frames, padding=4, size=10):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in frames:
+        (directory / f"{prefix}.{i:0{padding}d}.exr").write_bytes(b"x" * size)
+
+
+@pytest.fixture
+def show(tmp_path):
+    root = tmp_path / "show"
+    _frames(root / "sh010" / "comp", "comp", range(1001, 1011))
+    _frames(root / "sh010" / "plate", "plate", [1001, 1002, 1005])
+    _frames(root / "sh040" / "comp", "comp", range(1, 4), padding=3)
+    _frames(root / "sh040" / "comp", "matte", range(1, 4))
+    (root / "sh040" / "review.mov").write_bytes(b"m" * 7)
+    (root / "sh040" / "comp" / "odd.exr").write_bytes(b"")
+    return root
+
+
+@pytest.fixture
+def idx(tmp_path, show):
+    with CrawlIndex(tmp_path / "index.db") as idx:
+        idx.scan(show, sizes=True)
+        yield idx
+
+
+def _names(sequences):
+    return sorted(f"{s.directory.parent.name}/{s.sequence_string}" for s in sequences)
+
+
+def test_sequences_round_trip_from_crawl(idx, show):
+    crawled = [
+        seq for result in crawl.iter_scan(show) for seq in result.sequences
+    ]
+    indexed = list(idx.sequences())
+
+    key = lambda s: (str(s.directory), s.prefix)  # noqa: E731
+    assert sorted(indexed, key=key) == sorted(crawled, key=key)
+
+
+def test_query_by_prefix_and_extension(idx):
+    assert _names(idx.sequences(prefix="comp")) == [
+        "sh010/comp.####.exr",
+        "sh040/comp.###.exr",
+    ]
+    assert _names(idx.sequences(prefix="m*")) == ["sh040/matte.####.exr"]
+    assert idx.count(extension=".EXR") == 4
+    assert idx.count(extension="dpx") == 0
+
+
+def test_query_by_subtree(idx, show):
+    assert _names(idx.sequences(under=show / "sh040")) == [
+        "sh040/comp.###.exr",
+        "sh040/matte.####.exr",
+    ]
+    # A sibling sharing the prefix is not part of the subtree
+    assert idx.count(under=show / "sh04") == 0
+    assert list(idx.movies(under=show / "sh040")) == [show / "sh040" / "review.mov"]
+    assert list(idx.rogues()) == [show / "sh040" / "comp" / "odd.exr"]
+
+
+def test_query_by_frame_range(idx):
+    assert _names(idx.sequences(frames=(1, 2))) == [
+        "sh040/comp.###.exr",
+        "sh040/matte.####.exr",
+    ]
+    assert _names(idx.sequences(frames=(1010, 2000))) == ["sh010/comp.####.exr"]
+
+
+def test_query_by_problems(idx):
+    [gappy] = idx.sequences(problems=Problems.MISSING_FRAMES)
+    assert gappy.prefix == "plate"
+    assert gappy.missing_frames == [1003, 1004]
+    assert idx.count(problems=Problems.NONE) == 3
+    either = Problems.MISSING_FRAMES | Problems.INCONSISTENT_PADDING
+    assert idx.count(problems=either) == 1
+
+
+def test_sizes(idx, show):
+    assert idx.total_bytes(prefix="comp", under=show / "sh010") == 100
+    assert idx.total_bytes() == (10 + 3 + 3 + 3) * 10
+
+
+def test_rescan_replaces_changed_directories(idx, show):
+    for path in (show / "sh010" / "plate").iterdir():
+        path.unlink()
+    (show / "sh010" / "plate").rmdir()
+    _frames(show / "sh050" / "comp", "comp", range(1, 3))
+
+    idx.scan(show)
+
+    assert show / "sh010" / "plate" not in set(idx.directories())
+    assert idx.count(prefix="plate") == 0
+    assert idx.count(under=show / "sh050") == 1
+
+
+def test_remove_subtree(idx, show):
+    idx.remove(show / "sh010")
+    assert not any(d.is_relative_to(show / "sh010") for d in idx.directories())
+    assert idx.count() == 2
+
+
+def test_index_persists(tmp_path, show):
+    with CrawlIndex(tmp_path / "index.db") as idx:
+        idx.add(crawl.iter_scan(show))
+    with CrawlIndex(tmp_path / "index.db") as idx:
+        assert idx.count() == 4
+
+
+def test_sequences_are_lazy(idx):
+    sequences = idx.sequences()
+    first = next(sequences)
+    assert first.items
+    sequences.close()
+
+
+@pytest.mark.parametrize(
+    "frame_strings",
+    [
+        ["1001", "1002", "1003", "1007", "1009", "1010"],
+        ["-003", "-002", "-001", "0000", "0001"],
+        ["7"],
+        ["01", "002", "03"],
+    ],
+)
+def test_frame_encoding_round_trips(frame_strings):
+    class FakeItem:
+        def __init__(self, frame_string):
+            self.frame_string = frame_string
+
+    items = [FakeItem(f) for f in frame_strings]
+    numbers = [int(f) for f in frame_strings]
+    padding = max(set(map(len, frame_strings)), key=frame_strings.count)
+
+    encoded = _encode_frames(items, numbers, padding)
+
+    assert list(_decode_frames(encoded, padding)) == frame_strings
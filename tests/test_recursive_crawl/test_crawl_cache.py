@@ -0,0 +1,141 @@
+"""Tests for the persistent incremental crawl cache, crawl.CrawlCache."""
+
+import os
+import time
+
+import pytest
+
+from pysequitur import crawl
+
+
+def _build_tree(root):
+    for shot in ("sh010", "sh020"):
+        for layer in ("comp", "plate"):
+            d = root / shot / layer
+            d.mkdir(parents=True)
+            for i in range(1, 4):
+                (d / f"{layer}.{i:04d}.exr").touch()
+            (d / "odd.exr").touch()
+        (root / shot / "review.mov").touch()
+
+
+def _age(root, seconds=60):
+    """Backdate every directory's mtime so the cache trusts its listing."""
+    past = time.time_ns() - seconds * 10**9
+    for directory, _dirs, _files in os.walk(root):
+        os.utime(directory, ns=(past, past))
+
+
+def _summary(node):
+    return [
+        (
+            r.dir,
+            r.depth,
+            r.dirs,
+            r.sequences,
+            sorted(r.movs),
+            r.rogues,
+        )
+        for r in crawl.traverse_nodes(node)
+    ]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "show"
+    _build_tree(root)
+    _age(root)
+    return root
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with crawl.CrawlCache(tmp_path / "crawl.db") as cache:
+        yield cache
+
+
+def test_warm_scan_matches_cold_scan(tree, cache):
+    cold = crawl.recursive_scan(tree, cache=cache)
+    assert (cache.hits, cache.misses) == (0, 7)
+
+    warm = crawl.recursive_scan(tree, cache=cache)
+
+    assert (cache.hits, cache.misses) == (7, 7)
+    assert _summary(warm) == _summary(cold) == _summary(crawl.recursive_scan(tree))
+
+
+def test_cache_persists_between_sessions(tree, tmp_path):
+    with crawl.CrawlCache(tmp_path / "crawl.db") as cache:
+        crawl.recursive_scan(tree, cache=cache)
+
+    with crawl.CrawlCache(tmp_path / "crawl.db") as cache:
+        node = crawl.recursive_scan(tree, cache=cache, workers=4)
+        assert cache.hits == 7
+
+    assert _summary(node) == _summary(crawl.recursive_scan(tree))
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda d: (d / "comp.0004.exr").touch(),
+        lambda d: (d / "comp.0002.exr").unlink(),
+        lambda d: (d / "comp.0003.exr").rename(d / "comp.0005.exr"),
+        lambda d: (d / "extra").mkdir(),
+    ],
+    ids=["add", "remove", "rename", "subdirectory"],
+)
+def test_changes_invalidate_only_their_directory(tree, cache, change):
+    crawl.recursive_scan(tree, cache=cache)
+    changed = tree / "sh010" / "comp"
+    change(changed)
+    hits = cache.hits
+
+    node = crawl.recursive_scan(tree, cache=cache)
+
+    assert _summary(node) == _summary(crawl.recursive_scan(tree))
+    assert cache.hits - hits == 6
+
+
+def test_recently_modified_directories_are_not_trusted(tmp_path, cache):
+    root = tmp_path / "fresh"
+    _build_tree(root)
+
+    crawl.recursive_scan(root, cache=cache)
+    crawl.recursive_scan(root, cache=cache)
+
+    assert cache.hits == 0
+
+
+def test_different_extensions_miss(tree, cache):
+    crawl.recursive_scan(tree, cache=cache)
+
+    node = crawl.Node(tree, allowed_extensions={"exr"}, cache=cache)
+
+    assert cache.hits == 0
+    assert not node.nodes[0].movies
+
+
+def test_replaced_directory_is_relisted(tree, cache):
+    crawl.recursive_scan(tree, cache=cache)
+    plate = tree / "sh020" / "plate"
+    stat = os.stat(plate)
+    plate.rename(tree / "old_plate")
+    plate.mkdir()
+    (plate / "new.0001.exr").touch()
+    (plate / "new.0002.exr").touch()
+    os.utime(plate, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    node = crawl.recursive_scan(tree, cache=cache)
+
+    [result] = [r for r in crawl.traverse_nodes(node) if r.dir == plate]
+    assert [s.prefix for s in result.sequences] == ["new"]
+
+
+def test_clear(tree, cache):
+    crawl.recursive_scan(tree, cache=cache)
+    cache.clear()
+
+    crawl.recursive_scan(tree, cache=cache)
+
+    assert cache.hits == 0
@@ -0,0 +1,141 @@
+"""Tests for per-directory crawl instrumentation, crawl.CrawlStats."""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from pysequitur import crawl
+
+
+def _build_tree(root):
+    for shot, frames in (("sh010", 5), ("sh020", 50)):
+        d = root / shot / "comp"
+        d.mkdir(parents=True)
+        for i in range(1, frames + 1):
+            (d / f"comp.{i:04d}.exr").touch()
+        (d / "odd.exr").touch()
+        (root / shot / "notes.txt").touch()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "show"
+    _build_tree(root)
+    return root
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_records_every_directory(tree, workers):
+    stats = crawl.CrawlStats()
+    crawl.recursive_scan(tree, workers=workers, stats=stats)
+
+    by_path = {d.path: d for d in stats.directories}
+    assert set(by_path) == {
+        tree,
+        tree / "sh010",
+        tree / "sh020",
+        tree / "sh010" / "comp",
+        tree / "sh020" / "comp",
+    }
+    comp = by_path[tree / "sh020" / "comp"]
+    assert (comp.depth, comp.entries, comp.sequences, comp.rogues) == (2, 51, 1, 1)
+    assert by_path[tree / "sh010"].entries == 2
+    assert all(d.list_seconds >= 0 and d.parse_seconds >= 0 for d in stats.directories)
+    assert stats.elapsed > 0
+
+
+def test_errors_are_recorded(tmp_path):
+    stats = crawl.CrawlStats()
+    list(crawl.iter_scan(tmp_path / "missing", stats=stats))
+
+    [error] = stats.errors
+    assert error.path == tmp_path / "missing"
+    assert "No such file" in error.error
+
+
+def test_slowest_and_percentiles():
+    stats = crawl.CrawlStats()
+    stats.directories = [
+        crawl.DirectoryStats(Path(f"/d{i}"), 1, i / 1000, 0.0, i, 0, 0)
+        for i in range(1, 101)
+    ]
+
+    assert [d.path.name for d in stats.slowest(3)] == ["d100", "d99", "d98"]
+    assert [d.entries for d in stats.slowest(2, key="entries")] == [100, 99]
+    assert stats.percentiles() == {50: 0.05, 90: 0.09, 99: 0.099, 100: 0.1}
+    assert stats.histogram() == {
+        "<1ms": 0,
+        "1ms-10ms": 9,
+        "10ms-100ms": 90,
+        "100ms-1s": 1,
+        "1s-10s": 0,
+        ">=10s": 0,
+    }
+
+
+def test_empty_stats():
+    stats = crawl.CrawlStats()
+    assert stats.percentiles() == {}
+    assert stats.slowest() == []
+    assert stats.report().startswith("0 directories")
+
+
+def test_json_export(tree):
+    stats = crawl.CrawlStats()
+    crawl.recursive_scan(tree, stats=stats)
+
+    data = json.loads(stats.to_json(top=2))
+    assert data["directories"] == 5
+    assert data["entries"] == 2 + 2 + 2 + 6 + 51
+    assert len(data["slowest"]) == 2
+    assert sum(data["histogram"].values()) == 5
+    assert {d["path"] for d in data["per_directory"]} == {
+        str(d.path) for d in stats.directories
+    }
+    assert "per_directory" not in stats.to_dict(per_directory=False)
+
+
+def test_report_lists_slowest(tree):
+    stats = crawl.CrawlStats()
+    crawl.recursive_scan(tree, stats=stats)
+
+    report = stats.report(top=1)
+    assert report.startswith("5 directories, 63 entries")
+    assert "slowest 1:" in report
+    assert str(stats.slowest(1)[0].path) in report
+    assert str(stats) == stats.report()
+
+
+def test_cache_hits_are_marked(tree, tmp_path):
+    past = time.time_ns() - 60 * 10**9
+    for directory, _subdirs, _files in os.walk(tree):
+        os.utime(directory, ns=(past, past))
+    with crawl.CrawlCache(tmp_path / "crawl.db") as cache:
+        crawl.recursive_scan(tree, cache=cache)
+        stats = crawl.CrawlStats()
+        crawl.recursive_scan(tree, cache=cache, stats=stats)
+
+    assert all(d.cached for d in stats.directories)
+    comp = next(d for d in stats.directories if d.path == tree / "sh020" / "comp")
+    assert comp.entries == 51
+
+
+def test_process_crawl_keeps_timings(tree):
+    stats = crawl.CrawlStats()
+    crawl.recursive_scan(tree, workers=2, processes=True, stats=stats)
+
+    assert sum(d.entries for d in stats.directories) == 63
+
+
+def test_scan_async_records(tree):
+    stats = crawl.CrawlStats()
+
+    async def scan():
+        return [r async for r in crawl.scan_async(tree, stats=stats)]
+
+    asyncio.run(scan())
+    assert len(stats.directories) == 5
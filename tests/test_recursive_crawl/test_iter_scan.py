@@ -0,0 +1,87 @@
+"""Tests for the streaming crawl, crawl.iter_scan."""
+
+import os
+
+from pysequitur import crawl
+
+
+def _build_tree(root):
+    for shot in range(1, 4):
+        for layer in ("comp", "plate"):
+            d = root / f"sh{shot:03d}" / layer
+            d.mkdir(parents=True)
+            for i in range(1, 4):
+                (d / f"{layer}.{i:04d}.exr").touch()
+            (d / "notes.0001.exr").touch()
+        (root / f"sh{shot:03d}" / "review.mov").touch()
+
+
+def _summary(results):
+    return [
+        (
+            r.dir,
+            r.depth,
+            r.dirs,
+            [s.sequence_string for s in r.sequences],
+            sorted(r.movs),
+            r.rogues,
+        )
+        for r in results
+    ]
+
+
+def test_iter_scan_matches_traverse_nodes(tmp_path):
+    _build_tree(tmp_path)
+
+    expected = crawl.traverse_nodes(crawl.recursive_scan(tmp_path))
+
+    assert _summary(crawl.iter_scan(tmp_path)) == _summary(expected)
+
+
+def test_iter_scan_is_lazy(tmp_path, monkeypatch):
+    _build_tree(tmp_path)
+    listed = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        listed.append(path)
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    results = crawl.iter_scan(tmp_path)
+
+    assert listed == []
+    first = next(results)
+    assert first.dir == tmp_path
+    assert listed == [tmp_path]
+    results.close()
+
+
+def test_parallel_iter_scan_yields_parents_first(tmp_path):
+    _build_tree(tmp_path)
+
+    seen = set()
+    results = list(crawl.iter_scan(tmp_path, workers=4))
+    for result in results:
+        assert result.dir == tmp_path or result.dir.parent in seen
+        seen.add(result.dir)
+
+    expected = crawl.traverse_nodes(crawl.recursive_scan(tmp_path))
+    assert sorted(_summary(results)) == sorted(_summary(expected))
+
+
+def test_iter_scan_respects_max_depth(tmp_path):
+    _build_tree(tmp_path)
+
+    results = list(crawl.iter_scan(tmp_path, max_depth=1))
+
+    assert {r.depth for r in results} == {0, 1}
+    assert len(results) == 4
+
+
+def test_closing_parallel_scan_early(tmp_path):
+    _build_tree(tmp_path)
+
+    results = crawl.iter_scan(tmp_path, workers=4)
+    assert next(results).dir == tmp_path
+    results.close()
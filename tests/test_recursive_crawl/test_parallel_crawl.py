@@ -0,0 +1,72 @@
+"""Tests for recursive_scan(workers=N) and crawl error collection."""
+
+import os
+
+import pytest
+
+from pysequitur import crawl
+
+
+def _build_tree(root):
+    for shot in range(1, 6):
+        for layer in ("comp", "plate", "matte"):
+            d = root / f"sh{shot:03d}" / layer
+            d.mkdir(parents=True)
+            for i in range(1, 4):
+                (d / f"{layer}.{i:04d}.exr").touch()
+        (root / f"sh{shot:03d}" / "review.mov").touch()
+
+
+def _summary(results):
+    return [
+        (
+            r.dir,
+            r.depth,
+            [s.sequence_string for s in r.sequences],
+            sorted(r.movs),
+            r.rogues,
+        )
+        for r in results
+    ]
+
+
+@pytest.mark.parametrize("max_depth", [None, 0, 1])
+def test_parallel_crawl_matches_serial(tmp_path, max_depth):
+    _build_tree(tmp_path)
+
+    serial = crawl.traverse_nodes(crawl.recursive_scan(tmp_path, max_depth))
+    parallel = crawl.traverse_nodes(
+        crawl.recursive_scan(tmp_path, max_depth, workers=8)
+    )
+
+    assert _summary(parallel) == _summary(serial)
+    if max_depth is not None:
+        assert max(r.depth for r in parallel) == max_depth
+
+
+def test_workers_must_be_positive(tmp_path):
+    with pytest.raises(ValueError):
+        crawl.recursive_scan(tmp_path, workers=0)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_errors_are_collected_not_printed(tmp_path, monkeypatch, capsys, workers):
+    _build_tree(tmp_path)
+    broken = tmp_path / "sh002"
+    real_scandir = os.scandir
+
+    def scandir(path):
+        if path == broken:
+            raise PermissionError(13, "Permission denied", str(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+    node = crawl.recursive_scan(tmp_path, workers=workers)
+
+    assert capsys.readouterr().out == ""
+    [(path, error)] = node.errors
+    assert path == broken
+    assert isinstance(error, PermissionError)
+    results = crawl.traverse_nodes(node)
+    assert [r.dir for r in results if r.error is not None] == [broken]
+    assert len(results) == 1 + 4 * 4 + 1
@@ -0,0 +1,132 @@
+"""Tests for budgeted, resumable crawling with crawl.partial_scan."""
+
+import pickle
+import threading
+
+import pytest
+
+from pysequitur import crawl
+
+
+def _build_tree(root, shots=3, depth=3):
+    for shot in range(1, shots + 1):
+        d = root / f"sh{shot:03d}"
+        for level in range(depth):
+            d = d / f"level{level}"
+            d.mkdir(parents=True)
+            for i in range(1, 3):
+                (d / f"frame_{level}.{i:04d}.exr").touch()
+
+
+def _summary(results):
+    return sorted(
+        (r.dir, r.depth, [s.sequence_string for s in r.sequences]) for r in results
+    )
+
+
+@pytest.fixture
+def tree(tmp_path):
+    _build_tree(tmp_path)
+    return tmp_path
+
+
+def test_unlimited_budget_crawls_everything(tree):
+    scan = crawl.partial_scan(tree, budget=None)
+
+    assert scan.complete
+    assert _summary(scan.results) == _summary(crawl.iter_scan(tree))
+
+
+def test_breadth_first_order(tree):
+    scan = crawl.partial_scan(tree, budget=None)
+
+    depths = [r.depth for r in scan.results]
+    assert depths == sorted(depths)
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_directory_budget_and_resume(tree, workers):
+    scan = crawl.partial_scan(tree, budget=None, max_directories=4, workers=workers)
+
+    assert len(scan.results) == 4
+    assert not scan.complete
+    # The root and all three shots, before anything deeper
+    assert sorted(r.depth for r in scan.results) == [0, 1, 1, 1]
+    assert {depth for _d, depth, _rules in scan.continuation.frontier} == {2}
+
+    results = list(scan.results)
+    while not scan.complete:
+        scan = crawl.partial_scan(
+            tree,
+            budget=None,
+            max_directories=2,
+            continuation=scan.continuation,
+            workers=workers,
+        )
+        assert len(scan.results) <= 2
+        results += scan.results
+
+    assert _summary(results) == _summary(crawl.iter_scan(tree))
+
+
+def test_time_budget(tree):
+    scan = crawl.partial_scan(tree, budget=0)
+
+    assert scan.results == []
+    assert scan.continuation.frontier == ((tree, 0, None),)
+
+
+def test_slow_listing_is_abandoned_at_the_deadline(tree, monkeypatch):
+    release = threading.Event()
+    real_list = crawl._list_directory
+
+    def list_directory(path, *args):
+        if path.name == "sh002":
+            release.wait(5)
+        return real_list(path, *args)
+
+    monkeypatch.setattr(crawl, "_list_directory", list_directory)
+    try:
+        scan = crawl.partial_scan(tree, budget=0.3, workers=4)
+    finally:
+        release.set()
+
+    assert tree / "sh002" not in {r.dir for r in scan.results}
+    assert tree / "sh002" in {d for d, _depth, _rules in scan.continuation.frontier}
+
+
+def test_priority(tree):
+    def sh003_first(directory, depth):
+        return (0 if "sh003" in directory.parts else 1, depth)
+
+    scan = crawl.partial_scan(
+        tree, budget=None, max_directories=5, priority=sh003_first
+    )
+
+    assert [r.dir.relative_to(tree).as_posix() for r in scan.results] == [
+        ".",
+        "sh003",
+        "sh003/level0",
+        "sh003/level0/level1",
+        "sh003/level0/level1/level2",
+    ]
+
+
+def test_continuation_keeps_rules_and_visited(tree):
+    (tree / "sh001" / "again").symlink_to(tree / "sh002")
+    rules = crawl.PruneRules(exclude=("level2/",))
+
+    scan = crawl.partial_scan(tree, budget=None, max_directories=2, prune=rules)
+    continuation = pickle.loads(pickle.dumps(scan.continuation))
+    results = list(scan.results)
+    while continuation is not None:
+        scan = crawl.partial_scan(
+            tree, budget=None, max_directories=2, continuation=continuation
+        )
+        results += scan.results
+        continuation = scan.continuation
+
+    dirs = [r.dir for r in results]
+    assert len(dirs) == len(set(dirs))
+    assert not any(d.name == "level2" for d in dirs)
+    assert sum(len(r.aliases) for r in results) == 1
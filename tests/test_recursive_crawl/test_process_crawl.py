@@ -0,0 +1,75 @@
+"""Tests for crawling with worker processes (recursive_scan(processes=True))."""
+
+import pickle
+
+import pytest
+
+from pysequitur import crawl
+
+
+def _build_tree(root):
+    for shot in range(1, 4):
+        for layer in ("comp", "plate"):
+            d = root / f"sh{shot:03d}" / layer
+            d.mkdir(parents=True)
+            for i in range(1, 4):
+                (d / f"{layer}.{i:04d}.exr").touch()
+            (d / f"{layer}_v2.0001.exr").touch()
+        (root / f"sh{shot:03d}" / "review.mov").touch()
+    (root / "sh001" / "latest").symlink_to("comp")
+
+
+def _summary(results):
+    return [
+        (
+            r.dir,
+            r.depth,
+            r.dirs,
+            r.sequences,
+            sorted(r.movs),
+            r.rogues,
+            r.skipped,
+            r.aliases,
+        )
+        for r in results
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_process_crawl_matches_serial(tmp_path, workers):
+    _build_tree(tmp_path)
+    rules = crawl.PruneRules(exclude=("plate/",))
+
+    serial = crawl.traverse_nodes(crawl.recursive_scan(tmp_path, prune=rules))
+    sharded = crawl.traverse_nodes(
+        crawl.recursive_scan(tmp_path, workers=workers, processes=True, prune=rules)
+    )
+
+    assert _summary(sharded) == _summary(serial)
+
+
+def test_packed_listing_round_trips(tmp_path):
+    _build_tree(tmp_path)
+    directory = tmp_path / "sh001" / "comp"
+    listing = crawl._list_directory(directory, set(), {"exr"})
+
+    packed = crawl._list_directory_packed(directory, set(), {"exr"}, None, True)
+    data, error = pickle.loads(pickle.dumps(packed))
+
+    assert error is None
+    unpacked = crawl._unpack(directory, data)
+    assert unpacked._replace(timing=None) == listing._replace(timing=None)
+    assert unpacked.timing.entries == listing.timing.entries == 4
+
+
+def test_process_crawl_reports_errors(tmp_path):
+    results = list(crawl.iter_scan(tmp_path / "missing", workers=2, processes=True))
+
+    [result] = results
+    assert isinstance(result.error, FileNotFoundError)
+
+
+def test_processes_cannot_share_a_cache(tmp_path):
+    with crawl.CrawlCache(tmp_path / "crawl.db") as cache:
+        with pytest.raises(ValueError):
+            crawl.recursive_scan(tmp_path, workers=2, cache=cache, processes=True)
@@ -0,0 +1,184 @@
+"""Tests for crawl pruning rules (crawl.PruneRules) and ignore files."""
+
+import asyncio
+import os
+import re
+import time
+
+import pytest
+
+from pysequitur import crawl
+from pysequitur.crawl import PruneRules
+
+
+def _frames(directory, prefix, count=3):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(1, count + 1):
+        (directory / f"{prefix}.{i:04d}.exr").touch()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "show"
+    _frames(root / "sh010" / "comp", "comp")
+    _frames(root / "sh010" / "comp" / "tmp", "scratch")
+    _frames(root / "sh010" / "nuke_autosave", "comp")
+    _frames(root / ".git" / "objects", "blob")
+    _frames(root / "sh020" / "plate", "plate")
+    _frames(root / "sh020" / "plate", "plate_autosave")
+    (root / "sh020" / "review.mov").touch()
+    return root
+
+
+def _dirs(node):
+    return sorted(
+        r.dir.relative_to(node.path).as_posix() for r in crawl.traverse_nodes(node)
+    )
+
+
+def _prefixes(node):
+    return sorted(
+        seq.prefix for r in crawl.traverse_nodes(node) for seq in r.sequences
+    )
+
+
+def test_no_rules_crawls_everything(tree):
+    root = crawl.recursive_scan(tree)
+    assert ".git/objects" in _dirs(root)
+    assert root.total_skipped == 0
+
+
+def test_glob_excludes(tree):
+    rules = PruneRules(exclude=(".git/", "tmp/", "*_autosave*"))
+    root = crawl.recursive_scan(tree, prune=rules)
+
+    assert _dirs(root) == [
+        ".",
+        "sh010",
+        "sh010/comp",
+        "sh020",
+        "sh020/plate",
+    ]
+    assert _prefixes(root) == ["comp", "plate"]
+    # .git, tmp, nuke_autosave and three plate_autosave frames
+    assert root.total_skipped == 6
+    assert root.skipped == 1
+
+
+def test_directory_only_pattern_keeps_files(tmp_path):
+    _frames(tmp_path / "plate", "plate")
+    _frames(tmp_path, "plate")
+
+    root = crawl.recursive_scan(tmp_path, prune=PruneRules(exclude=("plate/",)))
+
+    assert root.nodes == []
+    assert [seq.prefix for seq in root.sequences] == ["plate"]
+    assert root.skipped == 1
+
+
+def test_regex_excludes_match_full_path(tree):
+    rules = PruneRules(exclude_regex=(r"sh010/comp/tmp$", r"\.git"))
+    root = crawl.recursive_scan(tree, prune=rules)
+
+    assert "sh010/comp/tmp" not in _dirs(root)
+    assert ".git" not in _dirs(root)
+    assert "sh010/nuke_autosave" in _dirs(root)
+
+
+def test_pruned_directories_are_never_listed(tree, monkeypatch):
+    listed = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        listed.append(os.fspath(path))
+        return real_scandir(path)
+
+    monkeypatch.setattr(crawl.os, "scandir", scandir)
+    crawl.recursive_scan(tree, prune=PruneRules(exclude=(".git/",)))
+
+    assert not any(".git" in path for path in listed)
+
+
+def test_ignore_file_applies_below_its_directory(tree):
+    (tree / "sh010" / crawl.IGNORE_FILE_NAME).write_text(
+        "# scratch space\n\ntmp/\n*_autosave\n"
+    )
+    root = crawl.recursive_scan(tree, prune=PruneRules())
+
+    assert "sh010/comp/tmp" not in _dirs(root)
+    assert "sh010/nuke_autosave" not in _dirs(root)
+    # Only sh010 and below are affected
+    assert ".git/objects" in _dirs(root)
+    assert "plate_autosave" in _prefixes(root)
+    assert root.total_skipped == 2
+
+
+def test_ignore_file_can_be_disabled(tree):
+    (tree / crawl.IGNORE_FILE_NAME).write_text("sh010/\n")
+    root = crawl.recursive_scan(tree, prune=PruneRules(ignore_file=None))
+    assert "sh010" in _dirs(root)
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_iter_scan_reports_skipped(tree, workers):
+    (tree / crawl.IGNORE_FILE_NAME).write_text("sh020/\n")
+    rules = PruneRules(exclude=(".git/",))
+    results = {
+        r.dir: r.skipped for r in crawl.iter_scan(tree, prune=rules, workers=workers)
+    }
+
+    assert results[tree] == 2
+    assert tree / "sh020" not in results
+    assert sum(results.values()) == 2
+
+
+def test_scan_async_applies_rules(tree):
+    (tree / "sh010" / crawl.IGNORE_FILE_NAME).write_text("tmp/\n")
+
+    async def scan():
+        rules = PruneRules(exclude=(".git/",))
+        return [r async for r in crawl.scan_async(tree, prune=rules)]
+
+    results = asyncio.run(scan())
+    dirs = {r.dir for r in results}
+    assert tree / ".git" not in dirs
+    assert tree / "sh010" / "comp" / "tmp" not in dirs
+    assert sum(r.skipped for r in results) == 2
+
+
+def test_cache_relists_when_ignore_file_changes(tree, tmp_path):
+    ignore_file = tree / "sh010" / crawl.IGNORE_FILE_NAME
+    ignore_file.write_text("tmp/\n")
+    past = time.time_ns() - 60 * 10**9
+    for directory, _subdirs, _files in os.walk(tree):
+        os.utime(directory, ns=(past, past))
+    os.utime(ignore_file, ns=(past, past))
+    rules = PruneRules()
+
+    with crawl.CrawlCache(tmp_path / "crawl.db") as cache:
+        cold = crawl.recursive_scan(tree, cache=cache, prune=rules)
+        warm = crawl.recursive_scan(tree, cache=cache, prune=rules)
+        assert _dirs(warm) == _dirs(cold)
+        assert warm.total_skipped == cold.total_skipped == 1
+        assert cache.hits == len(_dirs(cold))
+
+        # Editing the file in place does not touch the directory's mtime
+        ignore_file.write_text("tmp/\n*_autosave\n")
+        os.utime(ignore_file, ns=(past + 10**9, past + 10**9))
+        edited = crawl.recursive_scan(tree, cache=cache, prune=rules)
+        assert "sh010/nuke_autosave" not in _dirs(edited)
+
+        # Different rules never reuse a listing
+        unpruned = crawl.recursive_scan(tree, cache=cache)
+        assert "sh010/comp/tmp" in _dirs(unpruned)
+
+
+def test_rules_validate_regexes():
+    with pytest.raises(re.error):
+        PruneRules(exclude_regex=("(",))
+
+
+def test_visualize_tree_reports_pruned(tree, capsys):
+    root = crawl.recursive_scan(tree, prune=PruneRules(exclude=("tmp/",)))
+    crawl.visualize_tree(root)
+    assert "1 entries pruned" in capsys.readouterr().out
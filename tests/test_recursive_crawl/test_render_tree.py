@@ -0,0 +1,113 @@
+"""Tests for the streaming tree renderer (crawl.render_tree)."""
+
+import io
+import json
+
+import pytest
+
+from pysequitur import crawl
+
+
+def _frames(directory, prefix, count=3):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(1, count + 1):
+        (directory / f"{prefix}.{i:04d}.exr").write_bytes(b"x" * 10)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "show"
+    _frames(root / "sh010" / "comp", "comp")
+    _frames(root / "sh010" / "comp" / "v001", "comp_v001")
+    _frames(root / "sh010" / "plate", "plate")
+    (root / "sh010" / "review.mov").write_bytes(b"x" * 5)
+    (root / "sh010" / "notes.exr").write_bytes(b"x" * 5)
+    _frames(root / "sh020" / "empty" / "deeper", "deep")
+    (root / "sh020" / "latest").symlink_to("empty")
+    _frames(root / "sh020" / "tmp", "scratch")
+    return root
+
+
+@pytest.mark.parametrize(
+    "options, render_options",
+    [
+        ({}, {}),
+        ({"sizes": True}, {}),
+        ({"follow_symlinks": False}, {}),
+        ({"prune": crawl.PruneRules(exclude=("tmp/",))}, {}),
+        ({}, {"max_level": 1}),
+        ({"max_depth": 1}, {}),
+    ],
+)
+def test_text_matches_visualize_tree(tree, capsys, options, render_options):
+    root = crawl.recursive_scan(tree, **options)
+    expected_counts = crawl.visualize_tree(root, **render_options)
+    expected = capsys.readouterr().out
+
+    out = io.StringIO()
+    results = crawl.iter_scan(tree, **options)
+    counts = crawl.render_tree(results, out, **render_options)
+
+    assert out.getvalue() == expected
+    assert counts == expected_counts
+
+
+def test_output_starts_before_the_crawl_ends(tree, monkeypatch):
+    monkeypatch.setattr(crawl, "_RENDER_FLUSH_SECONDS", 0)
+    out = io.StringIO()
+    seen = []
+
+    def results():
+        for result in crawl.iter_scan(tree):
+            seen.append(out.getvalue())
+            yield result
+
+    crawl.render_tree(results(), out)
+
+    assert seen[0] == ""
+    assert seen[1] == f"{tree}\n"
+    assert seen[2].startswith(f"{tree}\n    ├── sh0")
+
+
+def test_text_needs_tree_order(tree):
+    results = list(crawl.iter_scan(tree))
+    with pytest.raises(ValueError, match="tree order"):
+        crawl.render_tree([results[0], results[-1], results[1]], io.StringIO())
+
+
+def test_jsonl(tree):
+    out = io.StringIO()
+    results = crawl.iter_scan(tree, workers=4, sizes=True)
+
+    counts = crawl.render_tree(results, out, mode="jsonl")
+
+    *records, summary = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert summary == {"summary": counts}
+    assert counts["bytes"] == 160
+    sh010 = next(r for r in records if r["dir"] == str(tree / "sh010"))
+    assert sh010["movies"] == ["review.mov"]
+    assert sh010["rogues"] == ["notes.exr"]
+    assert sh010["bytes"] == 10
+    [comp] = next(r for r in records if r["dir"].endswith("comp"))["sequences"]
+    assert comp == {
+        "pattern": "comp.####.exr",
+        "first_frame": 1,
+        "last_frame": 3,
+        "files": 3,
+        "missing": 0,
+        "bytes": 30,
+    }
+
+
+def test_summary_only(tree):
+    out = io.StringIO()
+    crawl.render_tree(crawl.iter_scan(tree, workers=4), out, mode="summary")
+
+    assert out.getvalue() == (
+        "8 directories, 7 files\n  5 sequences, 1 movies, 1 rogues\n"
+    )
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        crawl.render_tree([], io.StringIO(), mode="html")
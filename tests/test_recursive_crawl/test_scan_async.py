@@ -0,0 +1,48 @@
+"""Tests for crawl.scan_async."""
+
+import asyncio
+
+from pysequitur import crawl
+
+
+def _build_tree(root):
+    for shot in ("sh010", "sh020"):
+        for layer in ("comp", "plate"):
+            d = root / shot / layer
+            d.mkdir(parents=True)
+            for i in range(1, 4):
+                (d / f"{layer}.{i:04d}.exr").touch()
+    (root / "sh010" / "review.mov").touch()
+
+
+async def _collect(path, **kwargs):
+    return [r async for r in crawl.scan_async(path, **kwargs)]
+
+
+def test_scan_async_matches_traverse_nodes(tmp_path):
+    _build_tree(tmp_path)
+
+    expected = crawl.traverse_nodes(crawl.recursive_scan(tmp_path))
+    results = asyncio.run(_collect(tmp_path, concurrency=4))
+
+    def summary(rs):
+        return sorted(
+            (
+                str(r.dir),
+                r.depth,
+                tuple(sorted(map(str, r.sequences))),
+                tuple(sorted(map(str, r.movs))),
+            )
+            for r in rs
+        )
+
+    assert summary(results) == summary(expected)
+
+
+def test_scan_async_respects_max_depth(tmp_path):
+    _build_tree(tmp_path)
+
+    results = asyncio.run(_collect(tmp_path, max_depth=1))
+
+    assert {r.depth for r in results} == {0, 1}
+    assert not any(r.sequences for r in results)
@@ -0,0 +1,77 @@
+"""Tests for the iterative, os.scandir-based crawl behind crawl.Node."""
+
+import os
+import sys
+
+from pysequitur import crawl
+
+
+def test_deep_tree_does_not_recurse(tmp_path):
+    depth = 300
+    directory = tmp_path
+    for _ in range(depth):
+        directory = directory / "d"
+        directory.mkdir()
+    for i in range(1, 4):
+        (directory / f"deep.{i:04d}.exr").touch()
+
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(200)
+    try:
+        results = crawl.traverse_nodes(crawl.recursive_scan(tmp_path))
+    finally:
+        sys.setrecursionlimit(limit)
+
+    assert len(results) == depth + 1
+    assert results[-1].depth == depth
+    assert [s.sequence_string for s in results[-1].sequences] == ["deep.####.exr"]
+
+
+def test_results_are_in_tree_order(tmp_path):
+    for d in ("a/x", "a/y", "b"):
+        (tmp_path / d).mkdir(parents=True)
+
+    node = crawl.recursive_scan(tmp_path)
+    results = crawl.traverse_nodes(node)
+
+    expected = [(node.path, 0)]
+    for child in node.nodes:
+        expected.append((child.path, 1))
+        expected.extend((grandchild.path, 2) for grandchild in child.nodes)
+    assert [(r.dir, r.depth) for r in results] == expected
+
+
+def test_classification(tmp_path):
+    for name in (
+        "plate.0001.EXR",
+        "plate.0002.EXR",
+        "review.MOV",
+        ".plate.0003.exr",
+        "README",
+        "notes.txt",
+    ):
+        (tmp_path / name).touch()
+    (tmp_path / "sub.0001.exr").mkdir()
+
+    node = crawl.Node(tmp_path, allowed_extensions={".exr", "MOV"})
+
+    assert [s.sequence_string for s in node.sequences] == ["plate.####.EXR"]
+    assert node.movies == {tmp_path / "review.MOV"}
+    assert node.dirs == [tmp_path / "sub.0001.exr"]
+
+
+def test_files_are_not_stat_ed(tmp_path, monkeypatch):
+    for i in range(1, 20):
+        (tmp_path / f"plate.{i:04d}.exr").touch()
+    calls = []
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        calls.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat)
+    node = crawl.recursive_scan(tmp_path)
+
+    assert len(node.sequences) == 1
+    assert not any(str(c).endswith(".exr") for c in calls)
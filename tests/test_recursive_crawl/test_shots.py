@@ -0,0 +1,120 @@
+"""Tests for tagging crawl results with shot numbers (crawl.ShotRollups)."""
+
+import asyncio
+
+import pytest
+
+from pysequitur import crawl
+from pysequitur.shot_extractor import ShotExtractor, extract_shot_from_single_path
+
+
+def _frames(directory, prefix, count=3, size=10):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(1, count + 1):
+        (directory / f"{prefix}.{i:04d}.exr").write_bytes(b"x" * size)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    # Directories without a shot of their own are in s999
+    root = tmp_path / "s999" / "show"
+    _frames(root / "shot_020" / "comp", "comp")
+    _frames(root / "shot_020" / "plate", "plate", count=5)
+    _frames(root / "shot_030" / "comp", "comp", size=100)
+    # The file name's shot_040 takes precedence over s999
+    _frames(root / "misc", "shot040_ref")
+    return root
+
+
+def _sequence_shots(results):
+    return {
+        (r.dir.relative_to(r.dir.parents[1]).as_posix(), seq.prefix): shot
+        for r in results
+        for seq, shot in zip(r.sequences, r.sequence_shots, strict=True)
+    }
+
+
+def test_results_are_tagged_as_single_paths(tree):
+    results = list(crawl.iter_scan(tree, shots=crawl.ShotRollups()))
+
+    for r in results:
+        expected, _ = extract_shot_from_single_path(f"{r.dir}/")
+        assert r.shot == expected
+        for seq, shot in zip(r.sequences, r.sequence_shots, strict=True):
+            assert (shot, seq.prefix) == (
+                extract_shot_from_single_path(f"{r.dir}/{seq.sequence_string}")[0],
+                seq.prefix,
+            )
+    assert _sequence_shots(results) == {
+        ("shot_020/comp", "comp"): "020",
+        ("shot_020/plate", "plate"): "020",
+        ("shot_030/comp", "comp"): "030",
+        ("show/misc", "shot040_ref"): "040",
+    }
+
+
+def test_untagged_by_default(tree):
+    assert all(
+        r.shot is None and r.sequence_shots is None for r in crawl.iter_scan(tree)
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_rollups(tree, workers):
+    shots = crawl.ShotRollups()
+    crawl.recursive_scan(tree, workers=workers, sizes=True, shots=shots)
+
+    assert [r.shot for r in shots] == ["020", "030", "040", "999"]
+    assert shots["999"].directories == 2
+    assert shots["999"].sequences == 0
+    assert shots["020"].to_dict() == {
+        "shot": "020",
+        "directories": 3,
+        "sequences": 2,
+        "frames": 8,
+        "bytes": 80,
+    }
+    assert shots["030"].bytes == 300
+    assert shots["040"].directories == 0
+    assert shots["040"].frames == 3
+
+
+def test_rollups_without_sizes(tree):
+    shots = crawl.ShotRollups()
+    list(crawl.iter_scan(tree, shots=shots))
+
+    assert shots["020"].bytes is None
+    assert len(shots) == 4
+
+
+def test_files_below_a_classified_directory_cost_nothing(tree):
+    extractor = ShotExtractor()
+    shots = crawl.ShotRollups(extractor)
+    list(crawl.iter_scan(tree / "shot_020", shots=shots))
+
+    # Only directory segments were analysed ("", the parts of tree after
+    # "/", then shot_020, comp and plate), never a sequence's file name
+    assert extractor.cache_info().misses == len(tree.parts) + 3
+
+
+def test_nodes_keep_shots(tree):
+    root = crawl.recursive_scan(tree, shots=crawl.ShotRollups())
+
+    shot_020 = next(n for n in root.nodes if n.path.name == "shot_020")
+    assert shot_020.shot == "020"
+    shots = _sequence_shots(crawl.traverse_nodes(root))
+    assert shots[("show/misc", "shot040_ref")] == "040"
+
+
+def test_scan_async_and_partial_scan_tag_results(tree):
+    async def scan(shots):
+        return [r async for r in crawl.scan_async(tree, shots=shots)]
+
+    async_shots = crawl.ShotRollups()
+    asyncio.run(scan(async_shots))
+    partial_shots = crawl.ShotRollups()
+    scan = crawl.partial_scan(tree, budget=None, shots=partial_shots)
+
+    assert scan.complete
+    assert async_shots.to_dict() == partial_shots.to_dict()
+    assert partial_shots["030"].frames == 3
@@ -0,0 +1,138 @@
+"""Tests for gathering file sizes during a crawl (sizes=True)."""
+
+import os
+import time
+
+import pytest
+
+from pysequitur import crawl
+from pysequitur.file_sequence import SequenceFactory
+
+
+def _frames(directory, prefix, size, count=3):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(1, count + 1):
+        (directory / f"{prefix}.{i:04d}.exr").write_bytes(b"x" * size)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    _frames(tmp_path / "sh010", "comp", 100)
+    _frames(tmp_path / "sh010", "plate", 10)
+    _frames(tmp_path / "sh020", "comp", 1000)
+    (tmp_path / "sh020" / "review.mov").write_bytes(b"x" * 5)
+    (tmp_path / "sh020" / "notes.exr").write_bytes(b"x" * 7)
+    return tmp_path
+
+
+def _sequence_bytes(results):
+    return {
+        (r.dir.name, seq.prefix): r.sequence_bytes(seq)
+        for r in results
+        for seq in r.sequences
+    }
+
+
+EXPECTED = {
+    ("sh010", "comp"): 300,
+    ("sh010", "plate"): 30,
+    ("sh020", "comp"): 3000,
+}
+
+
+@pytest.mark.parametrize(
+    "options", [{}, {"workers": 3}, {"workers": 2, "processes": True}]
+)
+def test_sizes_are_gathered_per_sequence(tree, options):
+    results = list(crawl.iter_scan(tree, sizes=True, **options))
+
+    assert _sequence_bytes(results) == EXPECTED
+    sh020 = next(r for r in results if r.dir.name == "sh020")
+    assert sh020.sizes["review.mov"] == 5
+    assert sh020.total_bytes == 3012
+
+
+def test_sizes_are_off_by_default(tree):
+    results = list(crawl.iter_scan(tree))
+
+    assert all(r.sizes is None and r.total_bytes is None for r in results)
+    assert all(r.sequence_bytes(seq) is None for r in results for seq in r.sequences)
+
+
+def test_listing_stats_each_file_once(tree, monkeypatch):
+    calls = []
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        calls.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat)
+    crawl.recursive_scan(tree / "sh010", sizes=True, follow_symlinks=False)
+
+    # DirEntry.stat() is used instead of a second stat by path
+    assert calls == []
+
+
+def test_pruned_files_have_no_size(tree):
+    rules = crawl.PruneRules(exclude=("plate.*",))
+    root = crawl.recursive_scan(tree, sizes=True, prune=rules)
+
+    assert root.total_bytes == 300 + 3012
+    assert not any(name.startswith("plate") for name in root.nodes[0].sizes)
+
+
+def test_cached_directories_are_statted_again(tree, tmp_path):
+    past = time.time_ns() - 60 * 10**9
+    os.utime(tree / "sh010", ns=(past, past))
+
+    with crawl.CrawlCache(tmp_path / "crawl.db") as cache:
+        crawl.recursive_scan(tree / "sh010", cache=cache, sizes=True)
+        # Rewriting a frame in place leaves the directory's mtime alone
+        (tree / "sh010" / "comp.0001.exr").write_bytes(b"x" * 1100)
+        os.utime(tree / "sh010", ns=(past, past))
+        warm = crawl.recursive_scan(tree / "sh010", cache=cache, sizes=True)
+
+        assert cache.hits == 1
+        assert warm.sizes["comp.0001.exr"] == 1100
+        assert crawl.recursive_scan(tree / "sh010", cache=cache).sizes is None
+
+
+def test_measure_fills_in_missing_sizes(tree):
+    measured = list(crawl.measure(crawl.iter_scan(tree), workers=2))
+
+    assert _sequence_bytes(measured) == EXPECTED
+    assert [r.dir for r in measured] == [r.dir for r in crawl.iter_scan(tree)]
+
+
+def test_largest_sequences(tree):
+    largest = crawl.largest_sequences(crawl.iter_scan(tree, sizes=True), n=2)
+
+    assert [(size, seq.directory.name) for size, seq in largest] == [
+        (3000, "sh020"),
+        (300, "sh010"),
+    ]
+
+
+def test_traverse_nodes_keeps_sizes(tree):
+    root = crawl.recursive_scan(tree, sizes=True)
+
+    assert _sequence_bytes(crawl.traverse_nodes(root)) == EXPECTED
+    assert root.total_bytes == 3342
+
+
+def test_visualize_tree_shows_sizes(tree, capsys):
+    crawl.visualize_tree(crawl.recursive_scan(tree, sizes=True))
+
+    out = capsys.readouterr().out
+    assert "comp.####.exr 1-3 (2.9 KiB)" in out
+    assert "[MOV] review.mov (5 B)" in out
+    assert "3.3 KiB on disk" in out
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_file_sequence_disk_usage(tree, workers):
+    [sequence] = SequenceFactory.from_directory(tree / "sh020")
+    (tree / "sh020" / "comp.0002.exr").unlink()
+
+    assert sequence.disk_usage(workers=workers) == 2000
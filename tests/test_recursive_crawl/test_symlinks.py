@@ -0,0 +1,134 @@
+"""Tests for symlink handling in the crawl: loops, duplicates and aliases."""
+
+import asyncio
+import os
+
+import pytest
+
+from pysequitur import crawl
+
+
+def _frames(directory, prefix, count=3):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(1, count + 1):
+        (directory / f"{prefix}.{i:04d}.exr").touch()
+
+
+@pytest.fixture
+def tree(tmp_path):
+    """sh010 with versions, a `latest` link and a link to a plate library."""
+    root = tmp_path / "show"
+    _frames(root / "library" / "plates", "bg_plate")
+    _frames(root / "sh010" / "v011", "comp_v011")
+    _frames(root / "sh010" / "v012", "comp_v012")
+    (root / "sh010" / "latest").symlink_to("v012")
+    (root / "sh010" / "plates").symlink_to(root / "library" / "plates")
+    return root
+
+
+def _prefixes(results):
+    return sorted(seq.prefix for r in results for seq in r.sequences)
+
+
+def _aliases(results):
+    return {
+        link.relative_to(r.dir).as_posix(): target.name
+        for r in results
+        for link, target in r.aliases.items()
+    }
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_each_physical_directory_is_crawled_once(tree, workers):
+    results = list(crawl.iter_scan(tree, workers=workers))
+
+    assert _prefixes(results) == ["bg_plate", "comp_v011", "comp_v012"]
+    # Whichever path was reached first is crawled; the other is an alias
+    aliases = _aliases(results)
+    assert len(aliases) == 2
+    assert aliases.get("latest", "v012") == "v012"
+    assert aliases.get("v012", "latest") == "latest"
+
+
+def test_cycles_terminate(tmp_path):
+    _frames(tmp_path / "a" / "b", "frame")
+    (tmp_path / "a" / "b" / "up").symlink_to(tmp_path / "a")
+    (tmp_path / "a" / "self").symlink_to(".")
+
+    root = crawl.recursive_scan(tmp_path)
+
+    a = root.nodes[0]
+    assert a.aliases == {tmp_path / "a" / "self": tmp_path / "a"}
+    [b] = a.nodes
+    assert b.aliases == {tmp_path / "a" / "b" / "up": tmp_path / "a"}
+    assert b.nodes == []
+
+
+def test_link_to_the_root_is_an_alias(tmp_path):
+    (tmp_path / "root").mkdir()
+    (tmp_path / "root" / "again").symlink_to(tmp_path / "root")
+
+    root = crawl.recursive_scan(tmp_path / "root")
+
+    assert root.nodes == []
+    assert root.aliases == {tmp_path / "root" / "again": tmp_path / "root"}
+
+
+def test_not_following_symlinks(tree):
+    root = crawl.recursive_scan(tree / "sh010", follow_symlinks=False)
+
+    assert sorted(node.path.name for node in root.nodes) == ["v011", "v012"]
+    assert root.aliases == {
+        tree / "sh010" / "latest": (tree / "sh010" / "v012").resolve(),
+        tree / "sh010" / "plates": (tree / "library" / "plates").resolve(),
+    }
+
+
+def test_not_following_symlinks_does_not_stat_directories(tree, monkeypatch):
+    calls = []
+    real_stat = os.stat
+
+    def stat(path, *args, **kwargs):
+        calls.append(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, "stat", stat)
+    crawl.recursive_scan(tree / "sh010" / "v011", follow_symlinks=False)
+
+    assert calls == []
+
+
+def test_scan_async_suppresses_duplicates(tree):
+    async def scan():
+        return [r async for r in crawl.scan_async(tree, concurrency=4)]
+
+    results = asyncio.run(scan())
+
+    assert _prefixes(results) == ["bg_plate", "comp_v011", "comp_v012"]
+    assert len(_aliases(results)) == 2
+
+
+def test_cached_scan_keeps_aliases(tree, tmp_path):
+    with crawl.CrawlCache(tmp_path / "crawl.db", mtime_slack=0) as cache:
+        cold = list(crawl.iter_scan(tree, cache=cache))
+        warm = list(crawl.iter_scan(tree, cache=cache))
+        assert cache.hits > 0
+        unfollowed = list(
+            crawl.iter_scan(tree, cache=cache, follow_symlinks=False)
+        )
+
+    assert _aliases(warm) == _aliases(cold)
+    assert _prefixes(warm) == _prefixes(cold)
+    assert _prefixes(unfollowed) == _prefixes(cold)
+    assert set(_aliases(unfollowed)) == {"latest", "plates"}
+
+
+def test_visualize_tree_shows_aliases(tmp_path, capsys):
+    _frames(tmp_path / "v001", "comp")
+    (tmp_path / "latest").symlink_to("v001")
+
+    crawl.visualize_tree(crawl.recursive_scan(tmp_path, follow_symlinks=False))
+
+    assert f"[LNK] latest/ -> {(tmp_path / 'v001').resolve()}" in (
+        capsys.readouterr().out
+    )
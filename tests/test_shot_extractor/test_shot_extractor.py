@@ -0,0 +1,201 @@
+"""Tests for ShotExtractor against the previous per-call regex implementation."""
+
+import random
+import re
+
+import pytest
+
+from pysequitur import shot_extractor
+from pysequitur.shot_extractor import ShotExtractor
+
+
+def _legacy_single(file_path):
+    file_path = file_path.replace("\\", "/")
+    patterns = [
+        r"(?:^|/)(?:shot|sq|sequence)[-_]?(\d+)",
+        r"(?:^|/)s(\d+)",
+        r"(?:^|/)(\d+)(?:_[^v]|/)",
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, file_path, re.IGNORECASE)
+        if match:
+            return match.group(1).zfill(3), file_path
+    numbers = [
+        m.group()
+        for m in re.finditer(r"\d+", file_path)
+        if not (m.start() > 0 and file_path[m.start() - 1].lower() == "v")
+    ]
+    if numbers:
+        return numbers[0].zfill(3), file_path
+    return "000", file_path
+
+
+def _legacy_project(file_paths):
+    if not file_paths:
+        return []
+    path_parts = [path.replace("\\", "/").split("/") for path in file_paths]
+    min_length = min(len(parts) for parts in path_parts)
+    number_positions = []
+    for i in range(min_length):
+        count = sum(1 for parts in path_parts if re.search(r"\d+", parts[i]))
+        if count:
+            number_positions.append((i, count))
+    number_positions.sort(key=lambda x: x[1], reverse=True)
+
+    results = []
+    for path in file_paths:
+        parts = path.replace("\\", "/").split("/")
+        shot_num = None
+        for pos, _ in number_positions:
+            if pos < len(parts):
+                numbers = re.findall(r"(?<!v)\d+", parts[pos])
+                if numbers:
+                    shot_num = numbers[0]
+                    break
+        if not shot_num:
+            shot_num, _ = _legacy_single(path)
+        results.append((shot_num.zfill(3), path))
+    return results
+
+
+def _legacy_mixed(file_paths):
+    if not file_paths:
+        return []
+
+    def get_path_signature(path):
+        parts = path.replace("\\", "/").split("/")
+        return "_".join(str(bool(re.search(r"\d+", part))) for part in parts)
+
+    path_groups = {}
+    for path in file_paths:
+        path_groups.setdefault(get_path_signature(path), []).append(path)
+    results = []
+    for group in path_groups.values():
+        if len(group) > 1:
+            results.extend(_legacy_project(group))
+        else:
+            results.extend([_legacy_single(path) for path in group])
+    results.sort(key=lambda x: (x[0], x[1]))
+    return results
+
+
+PATHS = [
+    "/path/to/images/shot_020/render_020_main_v123.mov",
+    "/path/to/images/shot_020/render_020_main_v123.####.exr",
+    "/shows/project/sq_015/comp/v002/",
+    "/shows/project/s010/lighting/",
+    "/show/seq/render_v25/final.exr",
+    "/show/020_v/x.exr",
+    "/show/020_/x.exr",
+    "/show/020_",
+    "/show/020",
+    "/show/020/",
+    "020_comp/a.exr",
+    "S030\\comp\\V004\\img.1001.exr",
+    "SEQUENCE-7/plate.exr",
+    "relative.exr",
+    "",
+    "/",
+    "v1/v2/v3",
+]
+
+SEGMENTS = [
+    "shot_020",
+    "SQ15",
+    "sequence-3",
+    "s010",
+    "S9",
+    "020_comp",
+    "020_v1",
+    "020_",
+    "020",
+    "v002",
+    "V3",
+    "comp",
+    "render_v25",
+    "img.1001.exr",
+    "a1b2",
+    "",
+    "x_12_y",
+    "1_Vx",
+    "shows",
+    "a\\b2",
+]
+
+
+def _random_paths(count, seed=0):
+    rng = random.Random(seed)
+    paths = []
+    for _ in range(count):
+        parts = rng.choices(SEGMENTS, k=rng.randint(1, 6))
+        path = "/".join(parts)
+        if rng.random() < 0.3:
+            path = "/" + path
+        if rng.random() < 0.2:
+            path += "/"
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_single_path_matches_previous_implementation(path):
+    assert ShotExtractor().extract(path) == _legacy_single(path)
+    assert shot_extractor.extract_shot_from_single_path(path) == _legacy_single(path)
+
+
+@pytest.mark.parametrize("cache_size", [None, 0, 4])
+def test_extract_many_matches_previous_implementation(cache_size):
+    paths = _random_paths(3000)
+    extractor = ShotExtractor(cache_size=cache_size)
+
+    assert extractor.extract_many(paths) == [_legacy_single(p) for p in paths]
+    assert extractor.extract_many(paths, project=True) == _legacy_project(paths)
+
+
+def test_project_paths_match_previous_implementation():
+    for seed in range(20):
+        paths = _random_paths(50, seed)
+        assert shot_extractor.extract_shots_from_project_paths(
+            paths
+        ) == _legacy_project(paths)
+    assert shot_extractor.extract_shots_from_project_paths(PATHS) == (
+        _legacy_project(PATHS)
+    )
+
+
+def test_segments_are_analysed_once():
+    extractor = ShotExtractor()
+    paths = [
+        f"/shows/abc/sh{shot:03d}/comp/img.{f:04d}.exr"
+        for shot in range(3)
+        for f in range(100)
+    ]
+
+    extractor.extract_many(paths)
+
+    # shows, abc, three shots, comp and 100 file names (and the leading "")
+    assert extractor.cache_info().misses == 1 + 2 + 3 + 1 + 100
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_mixed_paths_match_previous_implementation(seed):
+    paths = _random_paths(500, seed) + PATHS
+
+    assert shot_extractor.extract_shots_from_mixed_paths(paths) == _legacy_mixed(
+        paths
+    )
+
+
+def test_mixed_paths_share_directory_analysis():
+    extractor = ShotExtractor()
+    paths = [
+        f"/shows/abc/sh{shot:03d}/comp/v{v:03d}/img.{f:04d}.exr"
+        for shot in range(3)
+        for v in range(2)
+        for f in range(100)
+    ]
+
+    assert extractor.extract_mixed(paths) == _legacy_mixed(paths)
+    assert extractor.extract_mixed([]) == []
+    # "", shows, abc, three shots, comp, two versions and 100 file names
+    assert extractor.cache_info().misses == 1 + 2 + 3 + 1 + 2 + 100
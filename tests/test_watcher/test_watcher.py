@@ -0,0 +1,165 @@
+"""Tests for the live sequence index and its watchers."""
+
+import os
+import shutil
+
+import pytest
+
+from pysequitur import watcher
+from pysequitur.watcher import EventType, SequenceIndex
+
+ADDED = EventType.FRAMES_ADDED
+CREATED = EventType.SEQUENCE_CREATED
+FILLED = EventType.GAP_FILLED
+REMOVED = EventType.FRAMES_REMOVED
+GONE = EventType.SEQUENCE_REMOVED
+
+
+def _summary(events):
+    return [(e.type, e.sequence.prefix, e.frames) for e in events]
+
+
+def test_index_events(tmp_path):
+    index = SequenceIndex()
+
+    assert index.add(tmp_path / "r.0001.exr") == []
+    assert _summary(index.add(tmp_path / "r.0003.exr")) == [(CREATED, "r", (1, 3))]
+    assert _summary(index.add(tmp_path / "r.0002.exr")) == [
+        (ADDED, "r", (2,)),
+        (FILLED, "r", (2,)),
+    ]
+    assert _summary(index.add(tmp_path / "r.0004.exr")) == [(ADDED, "r", (4,))]
+    assert index.add(tmp_path / "r.0004.exr") == []
+    assert _summary(index.remove(tmp_path / "r.0001.exr")) == [(REMOVED, "r", (1,))]
+    index.remove(tmp_path / "r.0002.exr")
+    assert _summary(index.remove(tmp_path / "r.0003.exr")) == [(GONE, "r", (3, 4))]
+    assert index.sequences() == []
+
+
+def test_index_ignores_other_files(tmp_path):
+    index = SequenceIndex()
+    for name in ("notes.txt", ".r.0001.exr", ".r.0002.exr", "clip.mov"):
+        assert index.add(tmp_path / name) == []
+
+
+def test_index_sync_diffs_a_listing(tmp_path):
+    index = SequenceIndex()
+    index.sync(tmp_path, ["a.0001.exr", "a.0002.exr", "b.0001.exr", "b.0002.exr"])
+
+    events = index.sync(tmp_path, ["a.0001.exr", "a.0002.exr", "a.0003.exr"])
+
+    assert sorted(_summary(events), key=str) == [
+        (ADDED, "a", (3,)),
+        (GONE, "b", (1, 2)),
+    ]
+    assert [s.prefix for s in index.sequences(tmp_path)] == ["a"]
+
+
+def test_remove_directory_drops_subtree(tmp_path):
+    index = SequenceIndex()
+    index.sync(tmp_path / "x", ["a.0001.exr", "a.0002.exr"])
+    index.sync(tmp_path / "x" / "y", ["b.0001.exr", "b.0002.exr"])
+    index.sync(tmp_path / "z", ["c.0001.exr", "c.0002.exr"])
+
+    events = index.remove_directory(tmp_path / "x")
+
+    assert sorted(e.sequence.prefix for e in events) == ["a", "b"]
+    assert [s.prefix for s in index.sequences()] == ["c"]
+
+
+def _exercise(w, root, next_events):
+    """Apply a series of changes under root, checking the watcher's events."""
+    shot = root / "sh010"
+    assert [s.prefix for s in w.index.sequences()] == ["plate"]
+
+    (shot / "plate.0003.exr").touch()
+    assert (ADDED, "plate", (3,)) in _summary(next_events())
+    assert (FILLED, "plate", (3,)) in _summary(next_events.last)
+
+    new = root / "sh020" / "comp"
+    new.mkdir(parents=True)
+    (new / "comp.0001.exr").touch()
+    (new / "comp.0002.exr").touch()
+    assert (CREATED, "comp", (1, 2)) in _summary(next_events())
+
+    (shot / "plate.0004.exr").rename(shot / "plate.0009.exr")
+    summary = _summary(next_events())
+    assert (REMOVED, "plate", (4,)) in summary
+    assert (ADDED, "plate", (9,)) in summary
+
+    shutil.rmtree(root / "sh020")
+    assert (GONE, "comp", (1, 2)) in _summary(next_events())
+    assert [s.prefix for s in w.index.sequences()] == ["plate"]
+
+
+@pytest.fixture
+def tree(tmp_path):
+    shot = tmp_path / "sh010"
+    shot.mkdir()
+    for i in (1, 2, 4):
+        (shot / f"plate.{i:04d}.exr").touch()
+    return tmp_path
+
+
+def test_polling_watcher(tree):
+    w = watcher.watch(tree, polling=True, interval=0)
+
+    def next_events():
+        next_events.last = w.check()
+        return next_events.last
+
+    assert isinstance(w, watcher.PollingWatcher)
+    _exercise(w, tree, next_events)
+
+
+def test_inotify_watcher(tree):
+    if watcher._inotify() is None:
+        pytest.skip("inotify not available")
+    with watcher.InotifyWatcher(tree) as w:
+
+        def next_events():
+            events = []
+            while batch := w.poll(timeout=0.2):
+                events += batch
+            next_events.last = events
+            return events
+
+        _exercise(w, tree, next_events)
+
+
+def test_inotify_reports_frames_once_written(tree):
+    if watcher._inotify() is None:
+        pytest.skip("inotify not available")
+    with watcher.InotifyWatcher(tree) as w:
+        with open(tree / "sh010" / "plate.0003.exr", "wb") as f:
+            f.write(b"partial")
+            f.flush()
+            assert w.poll(timeout=0.2) == []
+            f.write(b" and the rest")
+
+        events = w.poll(timeout=1)
+
+        assert (ADDED, "plate", (3,)) in _summary(events)
+
+
+def test_inotify_overflow_resyncs_the_whole_tree(tree):
+    if watcher._inotify() is None:
+        pytest.skip("inotify not available")
+    with watcher.InotifyWatcher(tree) as w:
+        new = tree / "sh020" / "comp"
+        new.mkdir(parents=True)
+        (new / "comp.0001.exr").touch()
+        (new / "comp.0002.exr").touch()
+        shutil.rmtree(tree / "sh010")
+        # Drop whatever the kernel queued, as an overflow would
+        with pytest.raises(BlockingIOError):
+            while True:
+                os.read(w._fd, 256 * 1024)
+
+        events = w._handle(-1, watcher._IN_Q_OVERFLOW, "")
+
+        assert (CREATED, "comp", (1, 2)) in _summary(events)
+        assert (GONE, "plate", (1, 2, 4)) in _summary(events)
+        assert new in w._watches
+        assert tree / "sh010" not in w._watches
+        assert [s.prefix for s in w.index.sequences()] == ["comp"]